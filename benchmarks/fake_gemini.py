@@ -0,0 +1,92 @@
+"""
+Fake with the slice of the genai.Client interface the curator uses, for offline benchmarks.
+
+models.generate_content and aio.models.generate_content sleep `latency` seconds per model
+round trip and answer from the prompt itself:
+- with a response_schema of list[Model], `parsed` holds one Model per "post_number" in the prompt;
+- with callable tools, each tool is called once (automatic function calling), which costs a
+  second round trip and adds the tool output to the prompt tokens;
+- otherwise `text` is a short brief sized by `output_tokens`.
+Token counts are estimated at four characters per token.
+"""
+import asyncio
+import json
+import re
+import threading
+import time
+import typing
+from types import SimpleNamespace
+from typing import Any, Dict
+
+POST_NUMBER_PATTERN = re.compile(r'"post_number": (\d+)')
+
+
+class FakeGeminiClient:
+    def __init__(self, latency: float = 0.0, output_tokens: int = 400):
+        self.latency = latency
+        self.output_tokens = output_tokens
+        self.calls = 0
+        self.prompt_tokens = 0
+        self._lock = threading.Lock()
+        self.models = _FakeModels(self)
+        self.aio = SimpleNamespace(models=_FakeAsyncModels(self))
+
+    def _round_trips(self, config) -> int:
+        tools = getattr(config, "tools", None) or []
+        return 2 if any(callable(tool) for tool in tools) else 1
+
+    def _respond(self, contents: Any, config) -> SimpleNamespace:
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+
+        for tool in getattr(config, "tools", None) or []:
+            if callable(tool):
+                prompt += json.dumps(tool(), default=str)
+
+        parsed = None
+        schema = getattr(config, "response_schema", None)
+        if schema is not None and typing.get_origin(schema) is list:
+            item_type = typing.get_args(schema)[0]
+            parsed = [
+                item_type(post_number=int(number), statement=f"Post {number} draws mixed but engaged discussion.")
+                for number in dict.fromkeys(POST_NUMBER_PATTERN.findall(prompt))
+            ]
+            text = json.dumps([item.model_dump() for item in parsed])
+        else:
+            text = ("Synthetic brief. " * self.output_tokens)[: self.output_tokens * 4]
+
+        prompt_tokens = len(prompt) // 4
+        output_tokens = len(text) // 4
+        with self._lock:
+            self.calls += 1
+            self.prompt_tokens += prompt_tokens
+
+        return SimpleNamespace(
+            text=text,
+            parsed=parsed,
+            usage_metadata=SimpleNamespace(
+                prompt_token_count=prompt_tokens,
+                candidates_token_count=output_tokens,
+                total_token_count=prompt_tokens + output_tokens,
+            ),
+        )
+
+    def usage(self) -> Dict[str, int]:
+        return {"gemini_calls": self.calls, "gemini_prompt_tokens": self.prompt_tokens}
+
+
+class _FakeModels:
+    def __init__(self, client: FakeGeminiClient):
+        self._client = client
+
+    def generate_content(self, model: str, contents: Any, config=None) -> SimpleNamespace:
+        time.sleep(self._client.latency * self._client._round_trips(config))
+        return self._client._respond(contents, config)
+
+
+class _FakeAsyncModels:
+    def __init__(self, client: FakeGeminiClient):
+        self._client = client
+
+    async def generate_content(self, model: str, contents: Any, config=None) -> SimpleNamespace:
+        await asyncio.sleep(self._client.latency * self._client._round_trips(config))
+        return self._client._respond(contents, config)
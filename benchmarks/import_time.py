@@ -0,0 +1,94 @@
+"""
+Import-time budget check for the entry points.
+
+Imports each module in a fresh interpreter with `python -X importtime`, without DATABASE_URL
+or any API key set, and fails (exit code 1) when its cumulative import time exceeds the budget
+or when it pulls in a heavy dependency that should only load on first use. The slowest
+imports are listed for every module over budget.
+
+    python -m benchmarks.import_time
+    python -m benchmarks.import_time --budget-ms 100 --repeat 5
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+# Entry points and the dependencies they must not import before they run.
+ENTRY_POINTS: Dict[str, Tuple[str, ...]] = {
+    "engines.ingest_engine": ("praw", "nltk", "google.genai", "sqlalchemy"),
+    "engines.curator_engine": ("praw", "nltk", "google.genai", "sqlalchemy"),
+    "engines.scheduler_engine": ("praw", "nltk", "google.genai", "sqlalchemy"),
+    "engines.notion_export_engine": ("notion_client", "httpx", "sqlalchemy"),
+    "engines.api_engine": ("flask", "sqlalchemy"),
+}
+ENVIRONMENT_KEYS = (
+    "DATABASE_URL", "GEMINI_API_KEY", "REDDIT_CLIENT_ID", "REDDIT_CLIENT_SECRET", "REDDIT_USER_AGENT",
+    "NOTION_API_KEY", "NOTION_DB_ID",
+)
+REPOSITORY_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def profile_import(module: str, heavy: Tuple[str, ...]) -> Tuple[float, List[Tuple[float, str]], List[str]]:
+    """
+    Returns the cumulative import time of `module` in ms, the (self ms, name) of every
+    module it imported, and which of `heavy` ended up loaded.
+    """
+    environment = {key: value for key, value in os.environ.items() if key not in ENVIRONMENT_KEYS}
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [REPOSITORY_ROOT, environment.get("PYTHONPATH")]))
+    check = f"import sys, json, {module}; print(json.dumps([name for name in {list(heavy)!r} if name in sys.modules]))"
+
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=REPOSITORY_ROOT,
+        env=environment,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode:
+        raise SystemExit(f"Importing {module} failed:\n{completed.stderr[-2000:]}")
+
+    # Lines look like "import time:  self [us] | cumulative | imported package".
+    imports = []
+    cumulative_us = 0
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:"):].split("|")
+        imports.append((int(self_us) / 1000, name.strip()))
+        if name.strip() == module:
+            cumulative_us = int(cumulative)
+
+    return cumulative_us / 1000, imports, json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Cumulative import time allowed per entry point.")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per module; the fastest one is compared.")
+    parser.add_argument("--top", type=int, default=10, help="Slowest imports listed for a module over budget.")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'module':<28} {'import ms':>10} {'budget ms':>10}  heavy imports")
+
+    for module, heavy in ENTRY_POINTS.items():
+        runs = [profile_import(module, heavy) for _ in range(args.repeat)]
+        elapsed, imports, loaded = min(runs, key=lambda run: run[0])
+        over_budget = elapsed > args.budget_ms
+
+        print(f"{module:<28} {elapsed:>10.1f} {args.budget_ms:>10.1f}  {', '.join(loaded) or '-'}")
+
+        if over_budget:
+            for self_ms, name in sorted(imports, reverse=True)[:args.top]:
+                print(f"    {self_ms:>8.1f} ms  {name}")
+        failures += over_budget or bool(loaded)
+
+    if failures:
+        raise SystemExit(f"{failures} entry point(s) over the import budget or importing heavy dependencies eagerly.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""
+Benchmark the Notion export against the local stub server, fully offline.
+
+Seeds --briefs processed briefs with --statements post statements each into the outbox of a
+scratch SQLite database, then runs NotionExportService.export_pending() once per
+--concurrency value against benchmarks.notion_stub_server. Reports wall time, Notion requests,
+429s and retries, and checks that every page received all of its blocks in order.
+
+    python -m benchmarks.notion_export --briefs 20 --statements 150 --latency 0.2 --concurrency 1 3
+    python -m benchmarks.notion_export --rate-limit-every 10 --retry-after 0.5
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+WORK_DIRECTORY = tempfile.mkdtemp(prefix="notion-export-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIRECTORY, 'export.db')}"
+os.environ.setdefault("NOTION_API_KEY", "stub-key")
+os.environ.setdefault("NOTION_DB_ID", "stub-database")
+
+from config import settings
+from database.base import Base
+from database.engine import get_engine
+from database.init_db import init_db
+from database.models import NotionOutbox, ProcessedBriefs
+from database.session import session_scope
+from benchmarks.notion_stub_server import NotionStubServer
+from services.notion_export_service import NotionExportService
+from utils.logger import logger
+
+
+def seed_outbox(exporter: NotionExportService, briefs: int, statements: int) -> None:
+    Base.metadata.drop_all(bind=get_engine())
+    init_db()
+
+    post_records = [
+        {"post_number": number, "subreddit": f"sub{number % 5}", "title": f"Post {number}"}
+        for number in range(1, statements + 1)
+    ]
+    post_statements = {number: f"Statement for post {number}. " * 20 for number in range(1, statements + 1)}
+
+    with session_scope() as session:
+        for number in range(briefs):
+            content = "\n\n".join(f"Section {section} of brief {number}. " * 30 for section in range(10))
+            brief = ProcessedBriefs(curated_content=content)
+            session.add(brief)
+            exporter.enqueue(session, brief, exporter.build_payload(content, post_records, post_statements))
+
+
+def first_payload():
+    with session_scope() as session:
+        return session.query(NotionOutbox.payload).order_by(NotionOutbox.id).first()[0]
+
+
+def verify_pages(server: NotionStubServer, expected_blocks: int) -> int:
+    """
+    Number of pages whose blocks are incomplete or out of order.
+    """
+    incomplete = 0
+    for children in server.children.values():
+        headings = [
+            block["heading_3"]["rich_text"][0]["text"]["content"] for block in children if block["type"] == "heading_3"
+        ]
+        if len(children) != expected_blocks or headings != sorted(headings, key=lambda text: int(text.rsplit(" ", 1)[1])):
+            incomplete += 1
+    return incomplete
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--briefs", type=int, default=20)
+    parser.add_argument("--statements", type=int, default=150, help="Post statements per brief.")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 3])
+    parser.add_argument("--rpm", type=int, default=settings.NOTION_REQUESTS_PER_MINUTE, help="Client-side request budget.")
+    parser.add_argument("--latency", type=float, default=0.2, help="Stub response latency in seconds.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Stub answers every Nth request with 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    args = parser.parse_args()
+
+    logger.setLevel(logging.WARNING)
+    settings.NOTION_REQUESTS_PER_MINUTE = args.rpm
+    settings.NOTION_BACKOFF_INITIAL = 0.1
+    exporter = NotionExportService()
+
+    print(f"{'concurrency':>11} {'seconds':>8} {'sent':>5} {'failed':>6} {'requests':>8} {'429s':>5} "
+          f"{'retries':>7} {'in flight':>9} {'incomplete':>10}")
+
+    for concurrency in args.concurrency:
+        seed_outbox(exporter, args.briefs, args.statements)
+        expected_blocks = len(exporter.build_blocks(first_payload()))
+
+        server = NotionStubServer(0, args.latency, args.rate_limit_every, args.retry_after).start()
+        settings.NOTION_BASE_URL = server.base_url
+        settings.NOTION_MAX_CONCURRENCY = concurrency
+
+        started_at = time.perf_counter()
+        counts = exporter.export_pending()
+        seconds = time.perf_counter() - started_at
+        server.stop()
+
+        print(f"{concurrency:>11} {seconds:>8.2f} {counts['sent']:>5} {counts['failed'] + counts['pending']:>6} "
+              f"{counts['requests']:>8} {server.rate_limited:>5} {counts['retries']:>7} {server.max_in_flight:>9} "
+              f"{verify_pages(server, expected_blocks):>10}")
+
+
+if __name__ == "__main__":
+    main()
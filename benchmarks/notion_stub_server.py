@@ -0,0 +1,138 @@
+"""
+Local stand-in for the two Notion endpoints the export uses, for tests and benchmarks.
+
+    POST  /v1/pages                    -> {"object": "page", "id": ...}
+    PATCH /v1/blocks/{id}/children     -> {"object": "list", "results": [...]}
+
+Every response is delayed by --latency seconds, and every --rate-limit-every-th request is
+answered with 429 and a Retry-After header, as Notion does when an integration exceeds its
+rate limit. Point the exporter at it with NOTION_BASE_URL=http://127.0.0.1:<port>.
+
+    python -m benchmarks.notion_stub_server --port 8787 --latency 0.2 --rate-limit-every 25
+"""
+import argparse
+import json
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+
+class NotionStubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port: int = 0, latency: float = 0.0, rate_limit_every: int = 0, retry_after: float = 1.0):
+        super().__init__(("127.0.0.1", port), _NotionStubHandler)
+        self.latency = latency
+        self.rate_limit_every = rate_limit_every
+        self.retry_after = retry_after
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.pages: Dict[str, Dict] = {}
+        self.children: Dict[str, List[Dict]] = {}
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+    def start(self) -> "NotionStubServer":
+        threading.Thread(target=self.serve_forever, name="notion-stub", daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class _NotionStubHandler(BaseHTTPRequestHandler):
+    server: NotionStubServer
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _respond(self, status: int, body: Dict, headers: Dict[str, str] | None = None) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _handle(self) -> None:
+        server = self.server
+        body = json.loads(self.rfile.read(int(self.headers.get("Content-Length") or 0)) or b"{}")
+
+        with server.lock:
+            server.requests += 1
+            server.in_flight += 1
+            server.max_in_flight = max(server.max_in_flight, server.in_flight)
+            rate_limited = bool(server.rate_limit_every) and server.requests % server.rate_limit_every == 0
+            if rate_limited:
+                server.rate_limited += 1
+
+        try:
+            time.sleep(server.latency)
+
+            if rate_limited:
+                self._respond(
+                    429,
+                    {"object": "error", "status": 429, "code": "rate_limited", "message": "Rate limited."},
+                    {"Retry-After": str(server.retry_after)},
+                )
+                return
+
+            path = self.path.rstrip("/")
+            if self.command == "POST" and path == "/v1/pages":
+                page_id = str(uuid.uuid4())
+                with server.lock:
+                    server.pages[page_id] = body
+                    server.children[page_id] = list(body.get("children", []))
+                self._respond(200, {"object": "page", "id": page_id})
+
+            elif self.command == "PATCH" and path.startswith("/v1/blocks/") and path.endswith("/children"):
+                block_id = path[len("/v1/blocks/"):-len("/children")]
+                children = body.get("children", [])
+                if len(children) > 100 or block_id not in server.children:
+                    self._respond(400, {"object": "error", "status": 400, "code": "validation_error", "message": "Invalid request."})
+                    return
+                with server.lock:
+                    server.children[block_id].extend(children)
+                self._respond(200, {"object": "list", "results": children})
+
+            else:
+                self._respond(404, {"object": "error", "status": 404, "code": "object_not_found", "message": "Not found."})
+
+        finally:
+            with server.lock:
+                server.in_flight -= 1
+
+    do_POST = _handle
+    do_PATCH = _handle
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response.")
+    parser.add_argument("--rate-limit-every", type=int, default=0, help="Answer every Nth request with 429 (0 disables).")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with a 429.")
+    args = parser.parse_args()
+
+    server = NotionStubServer(args.port, args.latency, args.rate_limit_every, args.retry_after)
+    print(f"Notion stub listening on {server.base_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,265 @@
+"""
+End-to-end pipeline benchmark on seeded synthetic data, fully offline.
+
+For each scale (hot-listing posts per subreddit) a fresh SQLite database is created and the
+real services run against injected fakes: benchmarks.synthetic.FakeReddit behind
+get_reddit_client() and benchmarks.fake_gemini.FakeGeminiClient behind initialize_gemini().
+Scenarios, in pipeline order:
+
+    scrape     fetch posts and comment trees through ScraperService
+    store      upsert the scraped posts and comments through StorageService
+    sentiment  SentimentService.process_posts_in_pages over the stored posts
+    curate     CuratorService.execute_curator_agent in each --curator-modes mode (cache off);
+               incremental mode also runs a second, warm pass
+
+Results go to a JSON file (one entry per scenario and scale, plus the run parameters and git
+revision) so runs can be compared with --compare.
+
+    python -m benchmarks.pipeline_suite --scales 10 50 200 --reddit-latency 0.05 --output results.json
+    python -m benchmarks.pipeline_suite --compare baseline.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List
+
+# The suite drops and recreates every table, so it always gets a scratch database of its own.
+WORK_DIRECTORY = tempfile.mkdtemp(prefix="pipeline-suite-")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(WORK_DIRECTORY, 'suite.db')}"
+
+from config import settings
+from clients.gemini_client import set_gemini_client
+from clients.reddit_client import set_reddit_client
+from database.base import Base
+from database.engine import get_engine
+from database.init_db import init_db
+from benchmarks.fake_gemini import FakeGeminiClient
+from benchmarks.synthetic import FakeReddit, SyntheticDataset
+from utils.logger import logger
+
+SCENARIOS = ("scrape", "store", "sentiment", "curate")
+CURATOR_MODES = ("single", "map_reduce", "incremental")
+
+
+def git_revision() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def measure(scenario: str, scale: int, run: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Time `run`, which returns its row count under "rows" plus any scenario-specific counters.
+    """
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    counters = run()
+    seconds = time.perf_counter() - wall_start
+    cpu_seconds = time.process_time() - cpu_start
+
+    rows = counters.pop("rows", 0)
+    result = {
+        "scenario": scenario,
+        "scale": scale,
+        "seconds": round(seconds, 4),
+        "cpu_seconds": round(cpu_seconds, 4),
+        "rows": rows,
+        "rows_per_second": round(rows / seconds, 1) if seconds else None,
+        **counters,
+    }
+    print(
+        f"{scenario:<24} {scale:>6} {result['seconds']:>9.3f} {result['cpu_seconds']:>9.3f} "
+        f"{rows:>9} {result['rows_per_second'] or 0:>11.1f}",
+        flush=True,
+    )
+    return result
+
+
+def run_scale(args, scale: int, reddit: FakeReddit, gemini: FakeGeminiClient) -> List[Dict[str, Any]]:
+    # Imported here so the fakes are injected before any service grabs its client.
+    from services.curator_service import CuratorService
+    from services.scraper_service import ScraperService
+    from services.sentiment_service import SentimentService
+    from services.storage_service import StorageService
+
+    Base.metadata.drop_all(bind=get_engine())
+    init_db()
+
+    results = []
+    reddit_data: Dict[str, Any] = {"posts": [], "submission_ids": [], "comments": []}
+
+    def scrape():
+        scraper = ScraperService()
+        scraper.post_limit = scale
+        scraper.incremental = False
+        requests_before = reddit.request_count
+
+        reddit_data["posts"] = scraper.fetch_reddit_posts()
+        reddit_data["submission_ids"] = scraper.fetch_post_ids()
+        reddit_data["comments"] = scraper.fetch_reddit_comments()
+        return {
+            "rows": len(reddit_data["posts"]) + len(reddit_data["comments"]),
+            "posts": len(reddit_data["posts"]),
+            "comments": len(reddit_data["comments"]),
+            "reddit_requests": reddit.request_count - requests_before,
+        }
+
+    def store():
+        storage = StorageService()
+        posts = storage.store_posts(reddit_data) or {}
+        comments = storage.store_comments(reddit_data) or {}
+        return {"rows": len(reddit_data["posts"]) + len(reddit_data["comments"]), **posts, **comments}
+
+    def sentiment():
+        return {"rows": SentimentService().process_posts_in_pages(), "comments": len(reddit_data["comments"])}
+
+    def curate(mode: str):
+        def run():
+            settings.CURATOR_MODE = mode
+            calls_before, tokens_before = gemini.calls, gemini.prompt_tokens
+
+            curator = CuratorService()
+            posts = len(curator.query_posts_with_sentiments())
+            brief = curator.execute_curator_agent()
+            return {
+                "rows": posts,
+                "brief_chars": len(brief) if isinstance(brief, str) else 0,
+                "gemini_calls": gemini.calls - calls_before,
+                "gemini_prompt_tokens": gemini.prompt_tokens - tokens_before,
+            }
+        return run
+
+    if "scrape" in args.scenarios:
+        results.append(measure("scrape", scale, scrape))
+    if "store" in args.scenarios:
+        results.append(measure("store", scale, store))
+    if "sentiment" in args.scenarios:
+        results.append(measure("sentiment", scale, sentiment))
+    if "curate" in args.scenarios:
+        for mode in args.curator_modes:
+            results.append(measure(f"curate_{mode}", scale, curate(mode)))
+            if mode == "incremental":
+                results.append(measure("curate_incremental_warm", scale, curate(mode)))
+
+    return results
+
+
+def compare(results: List[Dict[str, Any]], baseline_path: str) -> None:
+    with open(baseline_path) as baseline_file:
+        baseline = {
+            (result["scenario"], result["scale"]): result for result in json.load(baseline_file)["results"]
+        }
+
+    print(f"\nCompared with {baseline_path} (speedup > 1 is faster now):")
+    print(f"{'scenario':<24} {'scale':>6} {'before s':>9} {'after s':>9} {'speedup':>8}")
+    for result in results:
+        before = baseline.get((result["scenario"], result["scale"]))
+        if not before:
+            continue
+        speedup = before["seconds"] / result["seconds"] if result["seconds"] else float("inf")
+        print(
+            f"{result['scenario']:<24} {result['scale']:>6} {before['seconds']:>9.3f} "
+            f"{result['seconds']:>9.3f} {speedup:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[10, 50, 200], help="Hot-listing posts per subreddit.")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+    parser.add_argument("--curator-modes", nargs="+", choices=CURATOR_MODES, default=list(CURATOR_MODES))
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--median-comments", type=int, default=120)
+    parser.add_argument("--reddit-latency", type=float, default=0.0, help="Seconds per simulated Reddit request.")
+    parser.add_argument("--reddit-jitter", type=float, default=0.0, help="Extra random seconds per Reddit request.")
+    parser.add_argument(
+        "--reddit-rpm", type=int, default=1_000_000,
+        help="Rate limiter budget; lower it to include client-side throttling in the scrape timings."
+    )
+    parser.add_argument("--gemini-latency", type=float, default=0.0, help="Seconds per simulated model round trip.")
+    parser.add_argument("--instrument", action="store_true", help="Keep pipeline stage spans on (logged, not stored).")
+    parser.add_argument("--verbose", action="store_true", help="Keep the pipeline's info logging.")
+    parser.add_argument("--output", default=None, help="JSON results file (default: pipeline-suite-<UTC time>.json).")
+    parser.add_argument("--compare", default=None, help="Earlier results file to compare against.")
+    args = parser.parse_args()
+
+    if not args.verbose:
+        logger.setLevel(logging.WARNING)
+
+    settings.INSTRUMENTATION_ENABLED = args.instrument
+    settings.METRICS_STORE_ENABLED = False
+    settings.CURATOR_CACHE_ENABLED = False
+    settings.REDDIT_REQUESTS_PER_MINUTE = args.reddit_rpm
+    settings.REDDIT_RATE_LIMIT_BURST = max(settings.REDDIT_RATE_LIMIT_BURST, args.reddit_rpm // 60)
+
+    gemini = FakeGeminiClient(latency=args.gemini_latency)
+    set_gemini_client(gemini)
+
+    started_at = datetime.now(timezone.utc)
+    results: List[Dict[str, Any]] = []
+
+    print(f"{'scenario':<24} {'scale':>6} {'seconds':>9} {'cpu s':>9} {'rows':>9} {'rows/s':>11}")
+
+    try:
+        for scale in args.scales:
+            dataset = SyntheticDataset(
+                seed=args.seed,
+                subreddits=settings.DEFAULT_SUBREDDITS,
+                posts_per_subreddit=scale,
+                median_comments=args.median_comments,
+            )
+            reddit = FakeReddit(dataset, latency=args.reddit_latency, jitter=args.reddit_jitter)
+            set_reddit_client(reddit)
+            results.extend(run_scale(args, scale, reddit, gemini))
+
+    finally:
+        get_engine().dispose()
+        shutil.rmtree(WORK_DIRECTORY, ignore_errors=True)
+
+    report = {
+        "started_at": started_at.isoformat(),
+        "git_revision": git_revision(),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "parameters": {
+            "seed": args.seed,
+            "subreddits": settings.DEFAULT_SUBREDDITS,
+            "median_comments": args.median_comments,
+            "reddit_latency": args.reddit_latency,
+            "reddit_jitter": args.reddit_jitter,
+            "reddit_rpm": args.reddit_rpm,
+            "gemini_latency": args.gemini_latency,
+            "scraper_max_workers": settings.SCRAPER_MAX_WORKERS,
+            "comment_fetch_workers": settings.COMMENT_FETCH_WORKERS,
+            "sentiment_workers": settings.SENTIMENT_WORKERS,
+            "gemini_max_concurrency": settings.GEMINI_MAX_CONCURRENCY,
+        },
+        "results": results,
+    }
+
+    output = args.output or f"pipeline-suite-{started_at.strftime('%Y%m%dT%H%M%SZ')}.json"
+    with open(output, "w") as output_file:
+        json.dump(report, output_file, indent=2)
+    print(f"\nResults written to {output}")
+
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""
+Benchmark the hot query paths before and after the secondary indexes.
+
+Seeds a SQLite database without the secondary indexes, prints the EXPLAIN QUERY PLAN
+and best-of-N latency of each hot query, then runs database.init_db.migrate_schema to
+create the indexes and measures the same queries again.
+
+    python -m benchmarks.query_plans --posts 10000 --comments 1000000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, insert, or_, select, text
+from database.base import Base
+from database.init_db import migrate_schema
+from database.models import Post, Comment, Sentiment
+
+
+def seed_database(engine, post_count: int, comment_count: int) -> None:
+    posts = [
+        {
+            "submission_id": f"p{index}",
+            "subreddit": f"sub{index % 20}",
+            "title": f"Post {index}",
+            "body": "Body text",
+            "upvote_ratio": 0.9,
+            "score": 100,
+            "number_of_comments": comment_count // post_count,
+            "post_url": "https://example.invalid",
+            "is_processed": index % 10 != 0,
+        }
+        for index in range(post_count)
+    ]
+    sentiments = [
+        {"post_id": f"p{index}", "sentiment_results": {"dominant_sentiment": "Neutral"}}
+        for index in range(0, post_count, 2)
+    ]
+
+    with engine.begin() as connection:
+        connection.execute(insert(Post.__table__), posts)
+        connection.execute(insert(Sentiment.__table__), sentiments)
+
+        # Interleave comments across posts so they are not physically clustered by post.
+        batch = []
+        for comment_index in range(comment_count):
+            post_index = comment_index % post_count
+            batch.append({
+                "comment_id": f"c{comment_index}" if comment_index % 4 else None,
+                "submission_id": f"p{post_index}",
+                "subreddit": f"sub{post_index % 20}",
+                "title": f"Post {post_index}",
+                "author": f"user{comment_index % 5000}",
+                "body": f"Comment {comment_index} on post {post_index}",
+                "score": comment_index % 100,
+            })
+            if len(batch) == 50000:
+                connection.execute(insert(Comment.__table__), batch)
+                batch = []
+
+        if batch:
+            connection.execute(insert(Comment.__table__), batch)
+
+
+def drop_secondary_indexes(engine) -> None:
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                connection.execute(text(f"DROP INDEX IF EXISTS {index.name}"))
+
+
+def hot_queries(post_count: int, comment_count: int):
+    post_ids = [f"p{index}" for index in range(0, post_count, max(1, post_count // 500))][:500]
+    comment_ids = [f"c{index}" for index in range(1, comment_count, max(1, comment_count // 500))][:500]
+
+    return {
+        "comments for posts": (
+            select(Comment.id, Comment.submission_id, Comment.body, Comment.author, Comment.score)
+            .where(Comment.submission_id.in_(post_ids))
+            .order_by(Comment.submission_id, Comment.id)
+        ),
+        "legacy comments": (
+            select(Comment.id, Comment.submission_id, Comment.author, Comment.body)
+            .where(Comment.submission_id.in_(post_ids[:50]), Comment.comment_id.is_(None))
+        ),
+        "comments by reddit id": select(Comment.comment_id).where(Comment.comment_id.in_(comment_ids)),
+        "sentiments for posts": select(Sentiment.id, Sentiment.post_id).where(Sentiment.post_id.in_(post_ids)),
+        "curator join": (
+            select(Post.id, Sentiment.sentiment_results)
+            .join(Sentiment, Sentiment.post_id == Post.submission_id)
+            .order_by(Post.id)
+        ),
+        "unprocessed posts": select(Post.id).where(or_(Post.is_processed.is_(False), Post.is_processed.is_(None))),
+        "posts by subreddit": select(Post.id).where(Post.subreddit == "sub3"),
+    }
+
+
+def measure(engine, statement, repeat: int):
+    sql = str(statement.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True}))
+
+    with engine.connect() as connection:
+        plan = [row[-1] for row in connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {sql}")]
+
+        best = None
+        for _ in range(repeat):
+            started_at = time.perf_counter()
+            rows = connection.exec_driver_sql(sql).fetchall()
+            elapsed = time.perf_counter() - started_at
+            best = elapsed if best is None else min(best, elapsed)
+
+    return plan, sorted(rows, key=repr), best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=10000)
+    parser.add_argument("--comments", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", future=True)
+        Base.metadata.create_all(bind=engine)
+        drop_secondary_indexes(engine)
+
+        started_at = time.perf_counter()
+        seed_database(engine, args.posts, args.comments)
+        print(f"Seeded {args.posts} posts and {args.comments} comments in {time.perf_counter() - started_at:.1f}s.")
+
+        queries = hot_queries(args.posts, args.comments)
+        before = {name: measure(engine, statement, args.repeat) for name, statement in queries.items()}
+
+        started_at = time.perf_counter()
+        migrate_schema(engine)
+        print(f"Created the indexes in {time.perf_counter() - started_at:.1f}s.\n")
+
+        after = {name: measure(engine, statement, args.repeat) for name, statement in queries.items()}
+
+        print(f"{'query':<22} {'before s':>9} {'after s':>9} {'speedup':>8}")
+        for name in queries:
+            before_plan, before_rows, before_seconds = before[name]
+            after_plan, after_rows, after_seconds = after[name]
+            if before_rows != after_rows:
+                raise SystemExit(f"'{name}' returned different rows once indexed.")
+            print(f"{name:<22} {before_seconds:>9.4f} {after_seconds:>9.4f} {before_seconds / after_seconds:>7.1f}x")
+
+        print()
+        for name in queries:
+            print(f"{name}:")
+            print(f"  before: {' | '.join(before[name][0])}")
+            print(f"  after:  {' | '.join(after[name][0])}")
+
+        engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
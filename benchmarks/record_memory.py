@@ -0,0 +1,170 @@
+"""
+Measure peak memory of per-row dicts versus the slotted records in utils.records.
+
+Replays the three places a comment is materialized on a synthetic run: the scraped
+comment payload, the comment read back for sentiment analysis, and its score.
+Inputs are built before tracing starts, so only the per-row containers are measured.
+
+    python -m benchmarks.record_memory --comments 500000 --comments-per-post 100
+"""
+import argparse
+import os
+import random
+import tracemalloc
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from services.sentiment_columns import LABELS, SentimentColumns
+from utils.records import CommentRecord, CommentScore, PostRecord
+
+
+def build_inputs(comment_count: int, comments_per_post: int):
+    post_count = max(1, comment_count // comments_per_post)
+    submissions = [
+        SimpleNamespace(id=f"p{index}", title=f"Post {index}", subreddit=SimpleNamespace(display_name=f"sub{index % 20}"))
+        for index in range(post_count)
+    ]
+    comments = [
+        (
+            submissions[index % post_count],
+            SimpleNamespace(id=f"c{index}", author=f"user{index % 5000}", body=f"Comment {index} body text", score=index % 100),
+        )
+        for index in range(comment_count)
+    ]
+    # (comment_id, submission_id, body, author, score) as returned by get_comments_for_posts' query.
+    rows = [
+        (comment.id, submission.id, comment.body, comment.author, comment.score)
+        for submission, comment in comments
+    ]
+    compounds = [random.uniform(-1, 1) for _ in range(comment_count)]
+    return submissions, comments, rows, compounds
+
+
+def scraped_dicts(comments):
+    return [
+        {
+            "comment_id": comment.id,
+            "submission_id": submission.id,
+            "title": submission.title,
+            "subreddit": submission.subreddit.display_name,
+            "author": comment.author,
+            "body": comment.body,
+            "score": comment.score,
+        }
+        for submission, comment in comments
+    ]
+
+
+def scraped_records(comments):
+    return [
+        CommentRecord(
+            comment_id=comment.id,
+            submission_id=submission.id,
+            title=submission.title,
+            subreddit=submission.subreddit.display_name,
+            author=comment.author,
+            body=comment.body,
+            score=comment.score,
+        )
+        for submission, comment in comments
+    ]
+
+
+def read_dicts(submissions, rows):
+    comments_by_post = {submission.id: [] for submission in submissions}
+    for comment_id, submission_id, body, author, score in rows:
+        comments_by_post[submission_id].append(
+            {"comment_id": comment_id, "post_key": submission_id, "body": body, "author": author, "score": score}
+        )
+    return [
+        {
+            "post_key": submission.id,
+            "subreddit": submission.subreddit.display_name,
+            "title": submission.title,
+            "comments": comments_by_post[submission.id],
+        }
+        for submission in submissions
+    ]
+
+
+def read_records(submissions, rows):
+    comments_by_post = {submission.id: [] for submission in submissions}
+    for comment_id, submission_id, body, author, score in rows:
+        comments_by_post[submission_id].append(
+            CommentRecord(comment_id=comment_id, submission_id=submission_id, body=body, author=author, score=score)
+        )
+    return [
+        PostRecord(
+            submission_id=submission.id,
+            subreddit=submission.subreddit.display_name,
+            title=submission.title,
+            body="",
+            comments=comments_by_post[submission.id],
+        )
+        for submission in submissions
+    ]
+
+
+def label(compound: float) -> str:
+    return LABELS[0] if compound > 0.05 else LABELS[1] if compound < -0.05 else LABELS[2]
+
+
+def score_dicts(rows, compounds):
+    return [
+        {"post_key": row[1], "compound": compound, "label": label(compound)}
+        for row, compound in zip(rows, compounds)
+    ]
+
+
+def score_records(rows, compounds):
+    return [CommentScore(row[1], compound, label(compound)) for row, compound in zip(rows, compounds)]
+
+
+def score_columns(submissions, comments_per_post, compounds):
+    # Rows are interleaved across posts, but only the column layout matters for memory.
+    return SentimentColumns.from_scores(
+        [submission.id for submission in submissions], [comments_per_post] * len(submissions), compounds
+    )
+
+
+def peak_memory(build) -> int:
+    tracemalloc.start()
+    result = build()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--comments", type=int, default=500000)
+    parser.add_argument("--comments-per-post", type=int, default=100)
+    args = parser.parse_args()
+
+    submissions, comments, rows, compounds = build_inputs(args.comments, args.comments_per_post)
+
+    stages = [
+        ("scraped comments", lambda: scraped_dicts(comments), lambda: scraped_records(comments)),
+        ("comments read back", lambda: read_dicts(submissions, rows), lambda: read_records(submissions, rows)),
+        ("comment scores", lambda: score_dicts(rows, compounds), lambda: score_records(rows, compounds)),
+        (
+            "comment scores (columns)",
+            lambda: score_dicts(rows, compounds),
+            lambda: score_columns(submissions, args.comments_per_post, compounds),
+        ),
+    ]
+
+    print(f"{args.comments} comments over {len(submissions)} posts, peak traced memory:")
+    print(f"{'stage':<26} {'dicts MB':>9} {'records MB':>11} {'saved':>7}")
+
+    for name, before, after in stages:
+        before_peak = peak_memory(before)
+        after_peak = peak_memory(after)
+        saved = 1 - after_peak / before_peak
+        print(f"{name:<26} {before_peak / 2**20:>9.1f} {after_peak / 2**20:>11.1f} {saved:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
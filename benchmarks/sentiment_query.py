@@ -0,0 +1,124 @@
+"""
+Benchmark the post/comment query behind SentimentService.query_posts_with_comments.
+
+Compares the original per-post lookup (one SELECT per post) with the keyed bulk fetch
+on a seeded SQLite database, reporting query count and latency per scale.
+
+    python -m benchmarks.sentiment_query --scales 1000 10000 100000 --legacy-max 10000
+"""
+import argparse
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.orm import sessionmaker
+from database.base import Base
+from database.models import Post, Comment
+from utils.helpers import get_comments_for_posts, serialize_comment, serialize_post
+
+
+def seed_database(engine, post_count: int, comments_per_post: int) -> None:
+    posts = [
+        {
+            "submission_id": f"p{index}",
+            "subreddit": f"sub{index % 20}",
+            "title": f"Post {index}",
+            "body": "Body text",
+            "upvote_ratio": 0.9,
+            "score": 100,
+            "number_of_comments": comments_per_post,
+            "post_url": "https://example.invalid",
+        }
+        for index in range(post_count)
+    ]
+
+    # Interleave comments across posts so they are not physically clustered by post.
+    comments = [
+        {
+            "submission_id": f"p{post_index}",
+            "subreddit": f"sub{post_index % 20}",
+            "title": f"Post {post_index}",
+            "author": f"user{comment_index}",
+            "body": f"Comment {comment_index} on post {post_index}",
+            "score": comment_index,
+        }
+        for comment_index in range(comments_per_post)
+        for post_index in range(post_count)
+    ]
+
+    with engine.begin() as connection:
+        connection.execute(insert(Post.__table__), posts)
+        connection.execute(insert(Comment.__table__), comments)
+
+
+def query_per_post(session):
+    post_records = []
+    for post in session.query(Post).all():
+        comments = session.query(Comment).filter(Comment.submission_id == post.submission_id).all()
+        post_records.append(serialize_post(post, [serialize_comment(comment) for comment in comments]))
+    return post_records
+
+
+def query_bulk(session):
+    posts = session.query(Post).all()
+    comments_by_post = get_comments_for_posts(session, [post.submission_id for post in posts])
+    return [serialize_post(post, comments_by_post[post.submission_id]) for post in posts]
+
+
+def measure(engine, strategy):
+    query_count = 0
+
+    def count_query(*args):
+        nonlocal query_count
+        query_count += 1
+
+    event.listen(engine, "before_cursor_execute", count_query)
+    session = sessionmaker(bind=engine)()
+
+    try:
+        started_at = time.perf_counter()
+        records = strategy(session)
+        elapsed = time.perf_counter() - started_at
+    finally:
+        session.close()
+        event.remove(engine, "before_cursor_execute", count_query)
+
+    return records, query_count, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--comments-per-post", type=int, default=5)
+    parser.add_argument(
+        "--legacy-max", type=int, default=10000,
+        help="Skip the per-post strategy above this many posts (it grows quadratically without indexes)."
+    )
+    args = parser.parse_args()
+
+    print(f"{'posts':>8} {'strategy':>9} {'queries':>8} {'seconds':>9}")
+
+    for post_count in args.scales:
+        with tempfile.TemporaryDirectory() as directory:
+            engine = create_engine(f"sqlite:///{os.path.join(directory, 'bench.db')}", future=True)
+            Base.metadata.create_all(bind=engine)
+            seed_database(engine, post_count, args.comments_per_post)
+
+            bulk_records, bulk_queries, bulk_seconds = measure(engine, query_bulk)
+            print(f"{post_count:>8} {'bulk':>9} {bulk_queries:>8} {bulk_seconds:>9.3f}")
+
+            if post_count <= args.legacy_max:
+                legacy_records, legacy_queries, legacy_seconds = measure(engine, query_per_post)
+                print(f"{post_count:>8} {'per-post':>9} {legacy_queries:>8} {legacy_seconds:>9.3f}")
+
+                if legacy_records != bulk_records:
+                    raise SystemExit("Bulk fetch returned different records than the per-post lookup.")
+
+            engine.dispose()
+
+
+if __name__ == "__main__":
+    main()
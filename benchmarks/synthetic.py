@@ -0,0 +1,286 @@
+"""
+Seeded synthetic Reddit data and a PRAW-compatible fake client serving it.
+
+Every submission and its comment tree are derived from (seed, submission ID) alone, so the
+same seed yields the same dataset whatever order or thread the pipeline fetches it in, and
+comment trees are only built when a submission's comments are requested.
+
+Sizes follow the long-tailed shape of real threads: most comments are a sentence or two with
+a few long ones, most replies sit near the top of the tree, and a share of the listing does
+not pass the scraper's score / ratio / comment-count filters.
+"""
+import random
+import threading
+import time
+from collections import deque
+from typing import Dict, Iterator, List
+
+from config import settings
+
+NEUTRAL_WORDS = (
+    "the a to and of in for is it that on with this you my but have be are was not at as or "
+    "business idea market customer price product service start money time year month team plan "
+    "sell buy client shop online local store work job hire cost revenue profit loan bank tax "
+    "website app marketing ads supplier order delivery rent office partner contract invoice "
+    "accra lagos city town people friend family week day experience question advice anyone "
+    "think know need want try make get take find use help build launch grow scale"
+).split()
+POSITIVE_WORDS = (
+    "good great love excellent amazing awesome helpful happy best success win profitable "
+    "recommend easy thanks nice solid useful strong growing"
+).split()
+NEGATIVE_WORDS = (
+    "bad terrible hate awful worst fail scam problem expensive hard difficult broke loss "
+    "risky slow angry frustrating useless poor struggling"
+).split()
+REMOVED_BODIES = ("[deleted]", "[removed]")
+
+
+def _base36(number: int) -> str:
+    digits = "0123456789abcdefghijklmnopqrstuvwxyz"
+    encoded = ""
+    while True:
+        number, remainder = divmod(number, 36)
+        encoded = digits[remainder] + encoded
+        if not number:
+            return encoded
+
+
+def _text(rng: random.Random, median_words: float, sigma: float, max_words: int) -> str:
+    word_count = max(1, min(max_words, int(rng.lognormvariate(0, sigma) * median_words)))
+    words = []
+    for _ in range(word_count):
+        roll = rng.random()
+        if roll < 0.06:
+            words.append(rng.choice(POSITIVE_WORDS))
+        elif roll < 0.11:
+            words.append(rng.choice(NEGATIVE_WORDS))
+        else:
+            words.append(rng.choice(NEUTRAL_WORDS))
+    return " ".join(words).capitalize() + rng.choice((".", ".", "!", "?"))
+
+
+class FakeAuthor:
+    __slots__ = ("name",)
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __str__(self) -> str:
+        return self.name
+
+
+class FakeComment:
+    __slots__ = ("id", "body", "author", "score", "created_utc", "replies")
+
+    def __init__(self, comment_id: str, body: str, author: FakeAuthor | None, score: int, created_utc: float):
+        self.id = comment_id
+        self.body = body
+        self.author = author
+        self.score = score
+        self.created_utc = created_utc
+        self.replies: List["FakeComment"] = []
+
+
+class FakeCommentForest:
+    """
+    Top-level comments of a submission with PRAW's replace_more() / list() interface.
+    """
+
+    def __init__(self, top_level: List[FakeComment]):
+        self._top_level = top_level
+
+    def replace_more(self, limit: int | None = 32) -> list:
+        # The synthetic tree has no "load more comments" stubs left to expand.
+        return []
+
+    def list(self) -> List[FakeComment]:
+        # Breadth-first, like praw.models.comment_forest.CommentForest.list().
+        flattened = []
+        queue = deque(self._top_level)
+        while queue:
+            comment = queue.popleft()
+            flattened.append(comment)
+            queue.extend(comment.replies)
+        return flattened
+
+    def __len__(self) -> int:
+        return len(self._top_level)
+
+
+class FakeSubredditRef:
+    __slots__ = ("display_name",)
+
+    def __init__(self, display_name: str):
+        self.display_name = display_name
+
+
+class SyntheticSubmission:
+    """
+    Listing attributes of one submission. The comment tree is generated on first access
+    to `comments`, which costs one simulated request like PRAW's lazy fetch.
+    """
+
+    def __init__(self, dataset: "SyntheticDataset", subreddit: str, index: int):
+        self._dataset = dataset
+        self._comments: FakeCommentForest | None = None
+        self.id = dataset.submission_id(subreddit, index)
+        self.subreddit = FakeSubredditRef(subreddit)
+
+        rng = random.Random(f"{dataset.seed}:{self.id}")
+        self.title = _text(rng, median_words=9, sigma=0.4, max_words=40)
+        self.selftext = "" if rng.random() < 0.1 else _text(rng, median_words=80, sigma=1.0, max_words=1500)
+        self.url = f"https://www.reddit.com/r/{subreddit}/comments/{self.id}/"
+        self.created_utc = dataset.epoch - index * 900.0
+        self.stickied = index < 2 and rng.random() < 0.5
+
+        if rng.random() < dataset.qualifying_ratio:
+            self.score = settings.MIN_SCORE + int(rng.lognormvariate(4.0, 1.2))
+            self.upvote_ratio = round(rng.uniform(settings.MIN_UPVOTE_RATIO, 0.99), 2)
+            self.num_comments = max(
+                settings.MIN_COMMENTS,
+                min(dataset.max_comments, int(rng.lognormvariate(0, 0.6) * dataset.median_comments)),
+            )
+        else:
+            self.score = rng.randint(0, max(0, settings.MIN_SCORE - 1))
+            self.upvote_ratio = round(rng.uniform(0.4, 0.99), 2)
+            self.num_comments = rng.randint(0, dataset.max_comments)
+
+    @property
+    def comments(self) -> FakeCommentForest:
+        if self._comments is None:
+            self._dataset.client_request()
+            self._comments = FakeCommentForest(self._dataset.comment_tree(self))
+        return self._comments
+
+
+class SyntheticDataset:
+    """
+    `posts_per_subreddit` hot-listing submissions in each of `subreddits`, roughly
+    `qualifying_ratio` of which pass the scraper's filters with `median_comments` comments.
+    """
+
+    def __init__(
+        self,
+        seed: int = 0,
+        subreddits: List[str] | None = None,
+        posts_per_subreddit: int = 50,
+        qualifying_ratio: float = 0.8,
+        median_comments: int = 120,
+        max_comments: int = 1500,
+    ):
+        self.seed = seed
+        self.subreddits = list(subreddits or settings.DEFAULT_SUBREDDITS)
+        self.posts_per_subreddit = posts_per_subreddit
+        self.qualifying_ratio = qualifying_ratio
+        self.median_comments = median_comments
+        self.max_comments = max_comments
+        self.epoch = 1_700_000_000.0
+        self.client_request = lambda: None
+
+    def submission_id(self, subreddit: str, index: int) -> str:
+        subreddit_index = self.subreddits.index(subreddit)
+        return _base36((self.seed * len(self.subreddits) + subreddit_index) * 10_000_000 + index)
+
+    def listing(self, subreddit: str) -> Iterator[SyntheticSubmission]:
+        for index in range(self.posts_per_subreddit):
+            yield SyntheticSubmission(self, subreddit, index)
+
+    def submission(self, submission_id: str) -> SyntheticSubmission:
+        number = int(submission_id, 36)
+        scope, index = divmod(number, 10_000_000)
+        subreddit_index = scope - self.seed * len(self.subreddits)
+        if not 0 <= subreddit_index < len(self.subreddits) or index >= self.posts_per_subreddit:
+            raise KeyError(f"Unknown submission {submission_id}")
+        return SyntheticSubmission(self, self.subreddits[subreddit_index], index)
+
+    def comment_tree(self, submission: SyntheticSubmission) -> List[FakeComment]:
+        """
+        Build `num_comments` comments: about 40% top-level, the rest replies to a random
+        earlier comment at most 8 levels deep, a few deleted or removed.
+        """
+        rng = random.Random(f"{self.seed}:{submission.id}:comments")
+        top_level: List[FakeComment] = []
+        placed: List[tuple] = []
+        created_utc = submission.created_utc
+
+        for number in range(submission.num_comments):
+            created_utc += rng.expovariate(1 / 120)
+            if rng.random() < 0.03:
+                body, author = rng.choice(REMOVED_BODIES), None
+            else:
+                body = _text(rng, median_words=22, sigma=0.9, max_words=600)
+                author = FakeAuthor(f"user_{rng.randrange(50_000)}")
+
+            comment = FakeComment(
+                comment_id=f"{submission.id}_{_base36(number)}",
+                body=body,
+                author=author,
+                score=int(rng.lognormvariate(1.0, 1.3)) - 1,
+                created_utc=created_utc,
+            )
+
+            parent = rng.choice(placed) if placed and rng.random() > 0.4 else None
+            if parent is None or parent[1] >= 8:
+                top_level.append(comment)
+                placed.append((comment, 0))
+            else:
+                parent[0].replies.append(comment)
+                placed.append((comment, parent[1] + 1))
+
+        return top_level
+
+
+class FakeListing:
+    def __init__(self, reddit: "FakeReddit", subreddit: str):
+        self._reddit = reddit
+        self.display_name = subreddit
+
+    def hot(self, limit: int | None = 100) -> Iterator[SyntheticSubmission]:
+        """
+        Lazily yield the listing, paying one request per page like PRAW's ListingGenerator.
+        """
+        for position, submission in enumerate(self._reddit.dataset.listing(self.display_name)):
+            if limit is not None and position >= limit:
+                return
+            if position % self._reddit.page_size == 0:
+                self._reddit.request()
+            yield submission
+
+
+class FakeAuth:
+    def __init__(self):
+        self.limits: Dict[str, float | None] = {"remaining": None, "reset_timestamp": None, "used": 0}
+
+
+class FakeReddit:
+    """
+    Serves a SyntheticDataset through the subset of praw.Reddit the scraper uses.
+    Every request sleeps `latency` seconds (plus up to `jitter`) and is counted.
+    """
+
+    def __init__(self, dataset: SyntheticDataset, latency: float = 0.0, jitter: float = 0.0, page_size: int = 100):
+        self.dataset = dataset
+        self.latency = latency
+        self.jitter = jitter
+        self.page_size = page_size
+        self.auth = FakeAuth()
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._jitter_rng = random.Random(dataset.seed)
+        dataset.client_request = self.request
+
+    def request(self) -> None:
+        with self._lock:
+            self.request_count += 1
+            self.auth.limits["used"] = self.request_count
+            delay = self.latency + (self._jitter_rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+        if delay:
+            time.sleep(delay)
+
+    def subreddit(self, display_name: str) -> FakeListing:
+        return FakeListing(self, display_name)
+
+    def submission(self, id: str) -> SyntheticSubmission:
+        return self.dataset.submission(id)
@@ -0,0 +1,80 @@
+"""
+Benchmark building the VADER analyzer from the stock lexicon versus the pickled snapshot.
+
+"stock" is what SentimentService did before: SentimentIntensityAnalyzer() (read and parse
+vader_lexicon.zip) plus lexicon_version() for the score cache. "snapshot" is
+services.vader_snapshot.load_analyzer() from a current snapshot. Both are best of --repeat.
+The snapshot is validated against the stock analyzer first, and compound scores of a
+synthetic comment corpus are compared on both.
+
+    python -m benchmarks.vader_snapshot --repeat 50 --comments 20000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from nltk.sentiment import SentimentIntensityAnalyzer
+from services.score_cache import lexicon_version
+from services.vader_snapshot import build_snapshot, load_analyzer, validate_snapshot
+
+
+def best_of(repeat: int, build) -> float:
+    timings = []
+    for _ in range(repeat):
+        started_at = time.perf_counter()
+        build()
+        timings.append(time.perf_counter() - started_at)
+    return min(timings)
+
+
+def stock_analyzer():
+    analyzer = SentimentIntensityAnalyzer()
+    return analyzer, lexicon_version(analyzer.lexicon)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--comments", type=int, default=20000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "vader_lexicon.pickle")
+
+        started_at = time.perf_counter()
+        build_snapshot(path)
+        print(f"snapshot built and validated in {time.perf_counter() - started_at:.3f}s ({os.path.getsize(path)} bytes)")
+
+        stock, stock_version = stock_analyzer()
+        snapshot, snapshot_version = load_analyzer(path)
+        validate_snapshot(stock, snapshot)
+        if snapshot_version != stock_version:
+            raise SystemExit(f"Snapshot version {snapshot_version} differs from stock version {stock_version}.")
+
+        words = list(stock.lexicon) + ["the", "business", "price", "customer", "not", "very", "but", "!"]
+        rng = random.Random(0)
+        comments = [" ".join(rng.choices(words, k=rng.randint(3, 40))) for _ in range(args.comments)]
+        mismatches = sum(
+            stock.polarity_scores(comment)["compound"] != snapshot.polarity_scores(comment)["compound"]
+            for comment in comments
+        )
+
+        stock_seconds = best_of(args.repeat, stock_analyzer)
+        snapshot_seconds = best_of(args.repeat, lambda: load_analyzer(path))
+
+    print(f"{'analyzer':<10} {'ms':>8}")
+    print(f"{'stock':<10} {stock_seconds * 1000:>8.2f}")
+    print(f"{'snapshot':<10} {snapshot_seconds * 1000:>8.2f}")
+    print(f"speedup {stock_seconds / snapshot_seconds:.1f}x, lexicon {stock_version}, "
+          f"{mismatches} of {len(comments)} comment score(s) differ")
+
+    if mismatches:
+        raise SystemExit("Snapshot scores differ from the stock analyzer.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+import asyncio
+import time
+from typing import Any, Dict, List, Sequence, Tuple
+from google import genai
+from google.genai import errors, types
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from config import settings
+from utils.instrumentation import record_api_calls
+from utils.logger import logger
+
+
+def is_retryable_gemini_error(error: BaseException) -> bool:
+    """
+    Server errors and quota exhaustion (429 / RESOURCE_EXHAUSTED) are transient and worth retrying.
+    """
+    if isinstance(error, errors.ServerError):
+        return True
+
+    if isinstance(error, errors.ClientError):
+        return error.code == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+    return False
+
+
+def _log_retry(retry_state) -> None:
+    error = retry_state.outcome.exception()
+    logger.warning(
+        f"Gemini call failed (attempt {retry_state.attempt_number}): {error}. "
+        f"Retrying in {retry_state.next_action.sleep:.1f}s..."
+    )
+
+
+class AsyncGeminiCaller:
+    """
+    asyncio layer over genai.Client.aio with a semaphore-bounded concurrency limit,
+    exponential backoff with jitter on retryable errors, and per-call latency/token metrics.
+    """
+
+    def __init__(self, client: genai.Client):
+        self.client = client
+        self.max_concurrency = settings.GEMINI_MAX_CONCURRENCY
+        self.max_attempts = settings.GEMINI_MAX_ATTEMPTS
+        self.backoff_initial = settings.GEMINI_BACKOFF_INITIAL
+        self.backoff_max = settings.GEMINI_BACKOFF_MAX
+        self.call_metrics: List[Dict[str, Any]] = []
+
+    async def generate(
+        self,
+        label: str,
+        contents: str,
+        semaphore: asyncio.Semaphore,
+        config: types.GenerateContentConfig | None = None,
+    ) -> types.GenerateContentResponse:
+        """
+        Run one generate_content call under `semaphore`, retrying transient failures.
+        Each attempt holds a concurrency slot only while it is in flight, not while backing off.
+        """
+        attempts = 0
+        started_at = time.perf_counter()
+
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=wait_random_exponential(multiplier=self.backoff_initial, max=self.backoff_max),
+            retry=retry_if_exception(is_retryable_gemini_error),
+            before_sleep=_log_retry,
+            reraise=True,
+        )
+
+        async for attempt in retrying:
+            with attempt:
+                attempts += 1
+                record_api_calls("gemini")
+                async with semaphore:
+                    response = await self.client.aio.models.generate_content(
+                        model=settings.AGENT_MODEL,
+                        contents=contents,
+                        config=config,
+                    )
+
+        self._record_metrics(label, response, time.perf_counter() - started_at, attempts)
+        return response
+
+    def _record_metrics(self, label: str, response, latency: float, attempts: int) -> None:
+        usage = getattr(response, "usage_metadata", None)
+        metrics = {
+            "label": label,
+            "latency": latency,
+            "attempts": attempts,
+            "prompt_tokens": getattr(usage, "prompt_token_count", None),
+            "output_tokens": getattr(usage, "candidates_token_count", None),
+            "total_tokens": getattr(usage, "total_token_count", None),
+        }
+        self.call_metrics.append(metrics)
+
+        logger.info(
+            f"[{label}] {latency:.2f}s over {attempts} attempt(s), "
+            f"prompt tokens: {metrics['prompt_tokens']}, output tokens: {metrics['output_tokens']}"
+        )
+
+    async def _generate_all(
+        self, requests: Sequence[Tuple[str, str]], config: types.GenerateContentConfig | None
+    ) -> List[Any]:
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        return await asyncio.gather(
+            *(self.generate(label, contents, semaphore, config) for label, contents in requests),
+            return_exceptions=True,
+        )
+
+    def generate_all(
+        self, requests: Sequence[Tuple[str, str]], config: types.GenerateContentConfig | None = None
+    ) -> List[Any]:
+        """
+        Run (label, contents) requests concurrently from synchronous code.
+        Returns responses in request order; a request that failed for good yields its exception.
+        """
+        return asyncio.run(self._generate_all(requests, config))
+
+    def generate_one(
+        self, label: str, contents: str, config: types.GenerateContentConfig | None = None
+    ) -> types.GenerateContentResponse:
+        """
+        Run a single request from synchronous code, raising its final error.
+        """
+        result = self.generate_all([(label, contents)], config)[0]
+        if isinstance(result, BaseException):
+            raise result
+        return result
+
+    def log_summary(self) -> None:
+        if not self.call_metrics:
+            return
+
+        total_latency = sum(metrics["latency"] for metrics in self.call_metrics)
+        total_tokens = sum(metrics["total_tokens"] or 0 for metrics in self.call_metrics)
+        retries = sum(metrics["attempts"] - 1 for metrics in self.call_metrics)
+        logger.info(
+            f"Gemini usage: {len(self.call_metrics)} call(s), {retries} retry(ies), "
+            f"{total_tokens} total tokens, {total_latency:.2f}s cumulative latency."
+        )
@@ -3,20 +3,30 @@ from utils.logger import logger
 from google import genai
 from google.genai import types
 
+_injected_client = None
+
 
 def initialize_gemini() -> genai.Client:
     """
     Initialize Gemini client using API key from environment variables.
     Returns a genai.Client instance if successful, otherwise exits.
+    An injected client (see set_gemini_client) is returned as is.
     """
+    if _injected_client is not None:
+        return _injected_client
 
     api_key = settings.GEMINI_API_KEY
     if not api_key:
         logger.error("GEMINI_API_KEY not found in environment variables.")
         raise SystemExit("Startup failed: Please set your GEMINI_API_KEY to initialize the agent.")
 
+    http_options = None
+    if settings.GEMINI_BASE_URL:
+        logger.info(f"Using Gemini endpoint override: {settings.GEMINI_BASE_URL}")
+        http_options = types.HttpOptions(base_url=settings.GEMINI_BASE_URL)
+
     try:
-        client = genai.Client(api_key = api_key)
+        client = genai.Client(api_key = api_key, http_options = http_options)
         logger.info("Gemini client initialized successfully. Agent is ready.")
         return client
     
@@ -24,6 +34,16 @@ def initialize_gemini() -> genai.Client:
         logger.exception(f"Failed to initialize Gemini client: {e}")
         raise SystemExit("Gemini initialization failed. Check your API key and SDK setup.") 
 
+
+def set_gemini_client(client) -> None:
+    """
+    Make initialize_gemini() return `client`, e.g. a fake with the genai.Client interface for benchmarks.
+    """
+    global _injected_client
+
+    logger.info(f"Using injected Gemini client: {type(client).__name__}.")
+    _injected_client = client
+
     
 def provide_agent_tools(tools) -> types.GenerateContentConfig | None:
     """
@@ -0,0 +1,152 @@
+import asyncio
+import time
+from typing import Any, Dict, List
+import httpx
+from notion_client import AsyncClient
+from notion_client.errors import HTTPResponseError, RequestTimeoutError
+from tenacity import AsyncRetrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+from config import settings
+from utils.instrumentation import record_api_calls
+from utils.logger import logger
+from utils.rate_limiter import TokenBucket
+
+_notion_rate_limiter = None
+
+
+def is_retryable_notion_error(error: BaseException) -> bool:
+    """
+    Rate limiting (429), server errors and timeouts are transient and worth retrying.
+    """
+    if isinstance(error, HTTPResponseError):
+        return error.status == 429 or error.status >= 500
+
+    return isinstance(error, (RequestTimeoutError, httpx.TransportError))
+
+
+def retry_after_seconds(error: BaseException | None) -> float | None:
+    if not isinstance(error, HTTPResponseError) or error.status != 429:
+        return None
+
+    try:
+        return float(error.headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+def get_notion_rate_limiter() -> TokenBucket:
+    """
+    Singleton accessor for the token bucket shared by every Notion writer. Notion limits
+    requests per integration, so successive export batches and concurrent exporters in this
+    process draw from one budget.
+    """
+    global _notion_rate_limiter
+
+    if _notion_rate_limiter is None:
+        logger.info(f"Creating Notion rate limiter ({settings.NOTION_REQUESTS_PER_MINUTE} requests/minute).")
+        _notion_rate_limiter = TokenBucket(
+            rate_per_minute=settings.NOTION_REQUESTS_PER_MINUTE,
+            capacity=settings.NOTION_RATE_LIMIT_BURST,
+        )
+
+    return _notion_rate_limiter
+
+
+class AsyncNotionWriter:
+    """
+    asyncio layer over notion_client.AsyncClient: a semaphore bounds the requests in flight,
+    the process-wide token bucket keeps the average rate under Notion's limit, and 429 / 5xx /
+    timeouts are retried with exponential backoff, honouring Retry-After on 429.
+    Use as `async with AsyncNotionWriter() as writer:` so the HTTP client is closed.
+    """
+
+    def __init__(self):
+        self.database_id = settings.NOTION_DB_ID
+        self.max_concurrency = settings.NOTION_MAX_CONCURRENCY
+        self.max_attempts = settings.NOTION_MAX_ATTEMPTS
+        self.backoff_initial = settings.NOTION_BACKOFF_INITIAL
+        self.backoff_max = settings.NOTION_BACKOFF_MAX
+        self.block_batch_size = settings.NOTION_BLOCK_BATCH_SIZE
+        self.rate_limiter = get_notion_rate_limiter()
+        self.client: AsyncClient | None = None
+        self.semaphore: asyncio.Semaphore | None = None
+        self.requests = 0
+        self.retries = 0
+
+    async def __aenter__(self) -> "AsyncNotionWriter":
+        options: Dict[str, Any] = {"auth": settings.NOTION_API_KEY, "timeout_ms": settings.NOTION_TIMEOUT_MS}
+        if settings.NOTION_BASE_URL:
+            logger.info(f"Using Notion endpoint override: {settings.NOTION_BASE_URL}")
+            options["base_url"] = settings.NOTION_BASE_URL
+
+        self.client = AsyncClient(**options)
+        self.semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.client.aclose()
+
+    def _wait(self, retry_state) -> float:
+        retry_after = retry_after_seconds(retry_state.outcome.exception())
+        if retry_after is not None:
+            # Pause every request sharing the bucket, not just this one.
+            self.rate_limiter.apply_quota(0, retry_after)
+            return retry_after
+
+        return wait_random_exponential(multiplier=self.backoff_initial, max=self.backoff_max)(retry_state)
+
+    def _log_retry(self, retry_state) -> None:
+        self.retries += 1
+        logger.warning(
+            f"Notion request failed (attempt {retry_state.attempt_number}): {retry_state.outcome.exception()}. "
+            f"Retrying in {retry_state.next_action.sleep:.1f}s..."
+        )
+
+    async def _call(self, method, **kwargs) -> Dict[str, Any]:
+        retrying = AsyncRetrying(
+            stop=stop_after_attempt(self.max_attempts),
+            wait=self._wait,
+            retry=retry_if_exception(is_retryable_notion_error),
+            before_sleep=self._log_retry,
+            reraise=True,
+        )
+
+        async for attempt in retrying:
+            with attempt:
+                # The bucket blocks, so wait for a token off the event loop.
+                await asyncio.to_thread(self.rate_limiter.acquire)
+                self.requests += 1
+                record_api_calls("notion")
+                async with self.semaphore:
+                    return await method(**kwargs)
+
+    async def create_page(self, title: str, children: List[Dict]) -> str:
+        """
+        Create a page in the configured database with up to one batch of child blocks.
+        Returns the page ID.
+        """
+        page = await self._call(
+            self.client.pages.create,
+            parent={"database_id": self.database_id},
+            properties={settings.NOTION_TITLE_PROPERTY: {"title": [{"text": {"content": title[:2000]}}]}},
+            children=children[:self.block_batch_size],
+        )
+        return page["id"]
+
+    async def append_blocks(self, page_id: str, blocks: List[Dict], progress: Dict[str, int]) -> None:
+        """
+        Append `blocks` to a page in batches of NOTION_BLOCK_BATCH_SIZE, in order.
+        `progress["blocks_appended"]` is advanced after every batch, so a failed export can resume.
+        """
+        if not blocks:
+            return
+
+        started_at = time.perf_counter()
+        for start in range(0, len(blocks), self.block_batch_size):
+            await self._call(
+                self.client.blocks.children.append,
+                block_id=page_id,
+                children=blocks[start:start + self.block_batch_size],
+            )
+            progress["blocks_appended"] += len(blocks[start:start + self.block_batch_size])
+
+        logger.info(f"Appended {len(blocks)} block(s) to Notion page {page_id} in {time.perf_counter() - started_at:.2f}s.")
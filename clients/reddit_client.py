@@ -1,9 +1,11 @@
 import praw
-from dotenv import load_dotenv
 from config import settings
 from utils.logger import logger
+from utils.rate_limiter import TokenBucket
 
 _reddit_instance = None
+_injected_client = None
+_reddit_rate_limiter = None
 
 def _validate_reddit_secrets(reddit_secrets: dict) -> bool:
     """
@@ -35,7 +37,7 @@ def _create_reddit_client() -> praw.Reddit | None:
     """
     Create a new Reddit client using PRAW and environment variables.
     """
-    load_dotenv()
+    settings.load_settings()
 
     client_id = settings.REDDIT_CLIENT_ID
     client_secret = settings.REDDIT_CLIENT_SECRET
@@ -79,3 +81,45 @@ def get_reddit_client() -> praw.Reddit | None:
         logger.info("Returning existing Reddit client instance.")
 
     return _reddit_instance
+
+
+def set_reddit_client(client) -> None:
+    """
+    Replace the shared Reddit client, e.g. with a PRAW-compatible fake for benchmarks.
+    Must be called before the services that use it are created.
+    """
+    global _reddit_instance, _injected_client
+
+    logger.info(f"Using injected Reddit client: {type(client).__name__}.")
+    _reddit_instance = client
+    _injected_client = client
+
+
+def create_worker_reddit_client() -> praw.Reddit | None:
+    """
+    New Reddit client for one worker thread. PRAW does not document its client as thread-safe
+    (the requestor session, token refresh and auth.limits are shared per instance), so
+    concurrent fetches each use a client of their own. An injected client is returned as is.
+    """
+    if _injected_client is not None:
+        return _injected_client
+
+    logger.info("Creating Reddit client for a worker thread.")
+    return _create_reddit_client()
+
+
+def get_reddit_rate_limiter() -> TokenBucket:
+    """
+    Singleton accessor for the token bucket shared by every caller of the Reddit client.
+    All worker threads draw from this one budget so concurrency never exceeds the quota.
+    """
+    global _reddit_rate_limiter
+
+    if _reddit_rate_limiter is None:
+        logger.info(f"Creating Reddit rate limiter ({settings.REDDIT_REQUESTS_PER_MINUTE} requests/minute).")
+        _reddit_rate_limiter = TokenBucket(
+            rate_per_minute=settings.REDDIT_REQUESTS_PER_MINUTE,
+            capacity=settings.REDDIT_RATE_LIMIT_BURST,
+        )
+
+    return _reddit_rate_limiter
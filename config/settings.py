@@ -1,34 +1,85 @@
 import os
-from dotenv import load_dotenv
-from typing import List
+from typing import Any, Callable, Dict, List, Tuple
+
+# Settings read from the environment, by name: (default, conversion). load_settings() reads
+# them again once .env is loaded, so importing this module never touches the filesystem.
+_ENVIRONMENT_SETTINGS: Dict[str, Tuple[Any, Callable[[str], Any]]] = {}
+_dotenv_loaded = False
+
+
+def _env(name: str, default: Any = None, convert: Callable[[str], Any] = str) -> Any:
+    _ENVIRONMENT_SETTINGS[name] = (default, convert)
+    value = os.getenv(name)
+    return convert(value) if value is not None else default
+
+
+def load_settings() -> None:
+    """
+    Load .env into the environment (variables already set win) and refresh every setting read
+    from it. Entry points call this before creating any client or service; later calls are no-ops.
+    """
+    global _dotenv_loaded, NOTION_EXPORT_ENABLED
+
+    if _dotenv_loaded:
+        return
+
+    from dotenv import load_dotenv
+
+    load_dotenv()
+    _dotenv_loaded = True
+
+    for name, (default, convert) in _ENVIRONMENT_SETTINGS.items():
+        globals()[name] = _env(name, default, convert)
+    NOTION_EXPORT_ENABLED = bool(NOTION_API_KEY and NOTION_DB_ID)
 
-load_dotenv()
 
 # =====================================================
 # REDDIT CONFIGURATION
 # =====================================================
-REDDIT_CLIENT_ID = os.getenv("REDDIT_CLIENT_ID")
-REDDIT_CLIENT_SECRET = os.getenv("REDDIT_CLIENT_SECRET")
-REDDIT_USER_AGENT = os.getenv("REDDIT_USER_AGENT")
+REDDIT_CLIENT_ID = _env("REDDIT_CLIENT_ID")
+REDDIT_CLIENT_SECRET = _env("REDDIT_CLIENT_SECRET")
+REDDIT_USER_AGENT = _env("REDDIT_USER_AGENT")
 
 
 # =====================================================
 # NOTION CONFIGURATION
 # =====================================================
-NOTION_API_KEY = os.getenv("NOTION_API_KEY")
-NOTION_DB_ID = os.getenv("NOTION_DB_ID")
+NOTION_API_KEY = _env("NOTION_API_KEY")
+NOTION_DB_ID = _env("NOTION_DB_ID")
+NOTION_BASE_URL = _env("NOTION_BASE_URL")  # Optional override, e.g. a local stub server
 
 
 # =====================================================
 # AGENT CONFIGURATION
 # =====================================================
-GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
+GEMINI_API_KEY = _env("GEMINI_API_KEY")
+GEMINI_BASE_URL = _env("GEMINI_BASE_URL")  # optional override, e.g. a local fake model server
+GEMINI_MAX_CONCURRENCY: int = 4
+GEMINI_MAX_ATTEMPTS: int = 5
+GEMINI_BACKOFF_INITIAL: float = 1.0
+GEMINI_BACKOFF_MAX: float = 30.0
 
 
 # =====================================================
 # DATABASE CONFIGURATION
 # =====================================================
-DATABASE_URL = os.getenv("DATABASE_URL")
+DATABASE_URL = _env("DATABASE_URL")
+DB_POOL_SIZE: int = _env("DB_POOL_SIZE", 5, int)
+DB_MAX_OVERFLOW: int = _env("DB_MAX_OVERFLOW", 10, int)
+DB_POOL_TIMEOUT: int = 30
+DB_POOL_RECYCLE: int = 1800  # seconds; keeps MySQL from dropping idle connections
+DB_POOL_PRE_PING: bool = True
+SQLITE_JOURNAL_MODE: str = "WAL"
+SQLITE_SYNCHRONOUS: str = "NORMAL"
+SQLITE_BUSY_TIMEOUT_MS: int = 5000
+DB_READ_PAGE_SIZE: int = 1000  # rows per keyset page when streaming large tables
+
+
+# =====================================================
+# PIPELINE INSTRUMENTATION
+# =====================================================
+INSTRUMENTATION_ENABLED: bool = True
+METRICS_STORE_ENABLED: bool = True  # per-run stage summary in pipeline_stage_metrics
 
 
 # =====================================================
@@ -44,6 +95,25 @@ DEFAULT_POST_LIMIT: int = 200
 DEFAULT_COMMENT_LIMIT: int = 150
 
 
+# =====================================================
+# REDDIT FETCH CONCURRENCY AND RATE LIMITING
+# =====================================================
+CONCURRENT_FETCH: bool = True
+SCRAPER_MAX_WORKERS: int = 4
+COMMENT_FETCH_WORKERS: int = 8
+REDDIT_REQUESTS_PER_MINUTE: int = 100  # Reddit's OAuth quota per client
+REDDIT_RATE_LIMIT_BURST: int = 10
+REDDIT_LISTING_PAGE_SIZE: int = 100
+
+
+# =====================================================
+# REDDIT STORAGE SETTINGS
+# =====================================================
+STREAMING_INGEST: bool = True
+INCREMENTAL_SCRAPING: bool = True
+STORAGE_CHUNK_SIZE: int = 500
+
+
 # =====================================================
 # REDDIT DATA FILTERING REQUIREMENTS
 # =====================================================
@@ -52,6 +122,70 @@ MIN_SCORE = 75
 MIN_UPVOTE_RATIO = 0.8
 
 
+# =====================================================
+# SENTIMENT ANALYSIS SETTINGS
+# =====================================================
+SENTIMENT_INCREMENTAL: bool = True
+SENTIMENT_WORKERS: int = os.cpu_count() or 1
+SENTIMENT_CHUNK_SIZE: int = 2000
+SENTIMENT_PARALLEL_MIN_COMMENTS: int = 10000
+SENTIMENT_SCORE_CACHE: bool = True
+SENTIMENT_CACHE_MEMORY_SIZE: int = 100000
+SENTIMENT_SUMMARY_EXTENDED_STATS: bool = False
+SENTIMENT_SUMMARY_PERCENTILES = (25, 50, 75)
+SENTIMENT_LEXICON_SNAPSHOT: bool = True  # Load VADER from a validated pickle instead of parsing vader_lexicon.zip
+SENTIMENT_LEXICON_SNAPSHOT_PATH: str = _env(
+    "SENTIMENT_LEXICON_SNAPSHOT_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".cache", "vader_lexicon.pickle"),
+)
+
+
+# =====================================================
+# NOTION EXPORT
+# =====================================================
+NOTION_EXPORT_ENABLED: bool = bool(NOTION_API_KEY and NOTION_DB_ID)
+NOTION_TITLE_PROPERTY: str = "Name"  # Title property of the target database
+NOTION_MAX_CONCURRENCY: int = 3  # Pages exported at once
+NOTION_REQUESTS_PER_MINUTE: int = 180  # Notion allows an average of 3 requests/second per integration
+NOTION_RATE_LIMIT_BURST: int = 3
+NOTION_MAX_ATTEMPTS: int = 5  # Per request, on 429 / 5xx / timeouts
+NOTION_BACKOFF_INITIAL: float = 1.0
+NOTION_BACKOFF_MAX: float = 30.0
+NOTION_TIMEOUT_MS: int = 30000
+NOTION_BLOCK_BATCH_SIZE: int = 100  # Notion accepts at most 100 children per request
+NOTION_OUTBOX_BATCH_SIZE: int = 20  # Outbox entries claimed per export run
+NOTION_OUTBOX_MAX_ATTEMPTS: int = 8  # Export runs before an entry is marked failed
+NOTION_OUTBOX_RETRY_SECONDS: int = 60  # Doubled after every failed export run
+NOTION_OUTBOX_RETRY_MAX_SECONDS: int = 60 * 60
+# How long a claimed entry stays in_progress before another export run may take it over.
+# Must outlast the slowest export of a batch: every request of a page retried NOTION_MAX_ATTEMPTS
+# times, each waiting up to NOTION_TIMEOUT_MS and NOTION_BACKOFF_MAX.
+NOTION_OUTBOX_LEASE_SECONDS: int = 30 * 60
+
+
+# =====================================================
+# SCHEDULER DAEMON (engines/scheduler_engine.py)
+# =====================================================
+SCHEDULER_DEFAULT_INTERVAL_SECONDS: int = 30 * 60
+SCHEDULER_SUBREDDIT_INTERVALS: Dict[str, int] = {
+    "ghana": 60 * 60,
+}  # Per-subreddit override of the scrape interval, in seconds
+SCHEDULER_QUEUE_SIZE: int = 4  # Ingested batches waiting for sentiment before scraping pauses
+SCHEDULER_CURATE_ENABLED: bool = True
+SCHEDULER_CURATE_INTERVAL_SECONDS: int = 6 * 60 * 60  # Minimum time between two curator runs
+
+
+# =====================================================
+# READ API (engines/api_engine.py)
+# =====================================================
+READ_API_HOST: str = _env("READ_API_HOST", "127.0.0.1")
+READ_API_PORT: int = _env("READ_API_PORT", 8000, int)
+READ_API_CACHE_TTL_SECONDS: float = 30.0  # How long a cached response is served before its data version is rechecked
+READ_API_CACHE_SIZE: int = 1024  # Cached responses kept in memory
+READ_API_PAGE_SIZE: int = 100  # Default posts per page of /posts/sentiment
+READ_API_MAX_PAGE_SIZE: int = 1000
+
+
 # =====================================================
 # AGENT SETTINGS AND OBJECTIVES
 # =====================================================
@@ -87,4 +221,74 @@ Your new workflow:
 Output:
 - Log which posts were analyzed.
 - Return the XYZ problem statements and their sentiment statements.
-"""
\ No newline at end of file
+"""
+
+# =====================================================
+# CURATOR MAP-REDUCE SETTINGS
+# =====================================================
+CURATOR_MODE: str = "single"  # "single", "map_reduce" or "incremental"
+CURATOR_BATCH_TOKEN_BUDGET: int = 24000
+CURATOR_CHARS_PER_TOKEN: int = 4
+
+CURATOR_POST_OBJECTIVE = """
+You are a market scout agent analyzing one batch of Reddit posts.
+
+The posts below are JSON records from the same subreddit. Each record includes:
+- Post Number
+- Title
+- Body
+- Subreddit
+- Sentiment Score (counts, average compound, dominant sentiment)
+
+For each post:
+   - Interpret the sentiment data to understand audience tone and emotional intensity.
+   - Identify whether the discussion highlights a common or critical market problem.
+   - Write an XYZ-style problem statement:
+     "X people face Y problem so build Z solution for W results."
+   - Follow it with a sentiment statement:
+     "Sentiment statement: Sentiment towards [X: Entity/Topic] is predominantly [Y: Sentiment Label], with users [Z: Key themes, opinions, or concerns drawn from the discussion]."
+
+Return one item per post with its post_number and both statements as the statement text.
+"""
+
+CURATOR_CACHE_ENABLED: bool = True
+CURATOR_CACHE_TTL_SECONDS: int = 24 * 60 * 60
+CURATOR_CACHE_MAX_ENTRIES: int = 50
+CURATOR_CACHE_MAX_BYTES: int = 10 * 1024 * 1024
+
+CURATOR_MAP_OBJECTIVE = """
+You are a market scout agent analyzing one batch of Reddit posts.
+
+The posts below are JSON records from the same subreddit. Each record includes:
+- Post Number
+- Title
+- Body
+- Subreddit
+- Sentiment Score (counts, average compound, dominant sentiment)
+
+For each post:
+   - Interpret the sentiment data to understand audience tone and emotional intensity.
+   - Identify whether the discussion highlights a common or critical market problem.
+   - Return an XYZ-style problem statement:
+     "X people face Y problem so build Z solution for W results."
+   - Accompany it with a sentiment statement:
+     "Sentiment statement: Sentiment towards [X: Entity/Topic] is predominantly [Y: Sentiment Label], with users [Z: Key themes, opinions, or concerns drawn from the discussion]."
+
+Reference every statement by its Post Number.
+"""
+
+CURATOR_REDUCE_OBJECTIVE = """
+You are a market scout agent merging partial briefs.
+
+Each partial brief below was produced from one batch of posts and contains XYZ-style
+problem statements with their sentiment statements, referenced by Post Number.
+
+Combine them into one brief:
+1. Group the statements by subreddit.
+2. Merge statements that describe the same market problem, keeping every Post Number.
+3. Keep the XYZ problem statement and sentiment statement format unchanged.
+
+Output:
+- Log which posts were analyzed.
+- Return the XYZ problem statements and their sentiment statements.
+"""
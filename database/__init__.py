@@ -1,5 +1,12 @@
-from database.engine import database_engine, SessionLocal
 from database.base import Base
 from database import models
 
 __all__ = ["database_engine", "SessionLocal", "Base", "models"]
+
+
+def __getattr__(name: str):
+    # The engine is created on first use, see database.engine.get_engine.
+    if name in ("database_engine", "SessionLocal"):
+        from database import engine
+        return getattr(engine, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
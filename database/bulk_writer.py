@@ -0,0 +1,158 @@
+from typing import Any, Dict, List, Sequence, Tuple
+from sqlalchemy import insert, tuple_
+from sqlalchemy.orm import Session
+from utils.logger import logger
+
+# Stay well below SQLite's bound-parameter limit when looking up existing keys.
+KEY_LOOKUP_CHUNK_SIZE = 500
+
+
+def _dialect_insert(session: Session, table):
+    """
+    Return the dialect-specific insert() construct for the session's bind,
+    or None when the dialect has no native upsert support.
+    """
+    dialect = session.get_bind().dialect.name
+
+    if dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+        return sqlite_insert(table)
+
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+        return postgresql_insert(table)
+
+    if dialect in ("mysql", "mariadb"):
+        from sqlalchemy.dialects.mysql import insert as mysql_insert
+        return mysql_insert(table)
+
+    return None
+
+
+def _row_key(row: Dict[str, Any], key_columns: Sequence[str]) -> Tuple:
+    return tuple(row.get(column) for column in key_columns)
+
+
+def _dedupe_rows(rows: List[Dict[str, Any]], key_columns: Sequence[str]) -> Tuple[Dict[Tuple, Dict], int]:
+    """
+    Key rows by `key_columns`, keeping the last occurrence of each key.
+    Returns the keyed rows and the number of rows dropped (missing key or duplicate).
+    """
+    keyed_rows: Dict[Tuple, Dict] = {}
+    skipped = 0
+
+    for row in rows:
+        key = _row_key(row, key_columns)
+        if any(value is None for value in key):
+            skipped += 1
+            continue
+        if key in keyed_rows:
+            skipped += 1
+        keyed_rows[key] = row
+
+    return keyed_rows, skipped
+
+
+def _existing_keys(session: Session, model, key_columns: Sequence[str], keys: List[Tuple]) -> set:
+    """
+    Return the subset of `keys` already present in the model's table.
+    """
+    columns = [getattr(model, column) for column in key_columns]
+    existing = set()
+
+    for start in range(0, len(keys), KEY_LOOKUP_CHUNK_SIZE):
+        chunk = keys[start:start + KEY_LOOKUP_CHUNK_SIZE]
+
+        if len(columns) == 1:
+            condition = columns[0].in_([key[0] for key in chunk])
+        else:
+            condition = tuple_(*columns).in_(chunk)
+
+        for record in session.query(*columns).filter(condition):
+            existing.add(tuple(record))
+
+    return existing
+
+
+def bulk_upsert(
+    session: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    conflict_columns: Sequence[str],
+    update_columns: Sequence[str] | None = None,
+    inserted_rows: List[Dict[str, Any]] | None = None,
+) -> Dict[str, int]:
+    """
+    Insert `rows` in one executemany statement, resolving conflicts on `conflict_columns`
+    (which must carry a unique constraint) with the dialect's native upsert:
+    ON CONFLICT for SQLite/PostgreSQL and ON DUPLICATE KEY UPDATE for MySQL.
+    Existing rows get `update_columns` overwritten, or are left untouched when it is empty.
+    New rows are appended to `inserted_rows` when a list is passed.
+    The caller owns the transaction. Returns inserted, updated and skipped counts.
+    """
+    stmt = _dialect_insert(session, model.__table__)
+    if stmt is None:
+        logger.warning("No native upsert for this dialect. Inserting new rows only.")
+        return bulk_insert_missing(session, model, rows, conflict_columns, inserted_rows)
+
+    keyed_rows, skipped = _dedupe_rows(rows, conflict_columns)
+    if not keyed_rows:
+        return {"inserted": 0, "updated": 0, "skipped": skipped}
+
+    existing = _existing_keys(session, model, conflict_columns, list(keyed_rows.keys()))
+    inserted = len(keyed_rows) - len(existing)
+
+    if inserted_rows is not None:
+        inserted_rows.extend(row for key, row in keyed_rows.items() if key not in existing)
+
+    if update_columns:
+        updated = len(existing)
+    else:
+        updated = 0
+        skipped += len(existing)
+
+    if session.get_bind().dialect.name in ("mysql", "mariadb"):
+        if update_columns:
+            stmt = stmt.on_duplicate_key_update({column: stmt.inserted[column] for column in update_columns})
+        else:
+            stmt = stmt.prefix_with("IGNORE")
+    else:
+        if update_columns:
+            stmt = stmt.on_conflict_do_update(
+                index_elements=list(conflict_columns),
+                set_={column: stmt.excluded[column] for column in update_columns},
+            )
+        else:
+            stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_columns))
+
+    session.execute(stmt, list(keyed_rows.values()))
+    return {"inserted": inserted, "updated": updated, "skipped": skipped}
+
+
+def bulk_insert_missing(
+    session: Session,
+    model,
+    rows: List[Dict[str, Any]],
+    key_columns: Sequence[str],
+    inserted_rows: List[Dict[str, Any]] | None = None,
+) -> Dict[str, int]:
+    """
+    Insert only the rows whose `key_columns` combination is not stored yet, in one
+    executemany statement. Used for tables without a unique constraint to conflict on.
+    New rows are appended to `inserted_rows` when a list is passed.
+    The caller owns the transaction. Returns inserted, updated and skipped counts.
+    """
+    keyed_rows, skipped = _dedupe_rows(rows, key_columns)
+    if not keyed_rows:
+        return {"inserted": 0, "updated": 0, "skipped": skipped}
+
+    existing = _existing_keys(session, model, key_columns, list(keyed_rows.keys()))
+    new_rows = [row for key, row in keyed_rows.items() if key not in existing]
+
+    if new_rows:
+        session.execute(insert(model.__table__), new_rows)
+
+    if inserted_rows is not None:
+        inserted_rows.extend(new_rows)
+
+    return {"inserted": len(new_rows), "updated": 0, "skipped": skipped + len(existing)}
@@ -1,9 +1,120 @@
-from sqlalchemy import create_engine
+import threading
+from sqlalchemy import Engine, create_engine, event
+from sqlalchemy.engine import make_url
 from sqlalchemy.orm import sessionmaker
 from config import settings
 
-DATABASE_URL = settings.DATABASE_URL
 
-database_engine = create_engine(DATABASE_URL, echo=False, future=True)
+def _engine_options(url) -> dict:
+    """
+    Pool configuration for the configured database. In-memory SQLite uses a
+    per-thread singleton pool that takes no size or overflow limits.
+    """
+    options = {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
 
-SessionLocal = sessionmaker(bind=database_engine, autocommit=False, autoflush=False)
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return options
+
+    options.update(
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+    )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, file_database: bool) -> None:
+    cursor = dbapi_connection.cursor()
+    if file_database:
+        cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+# =====================================================
+# POOL CHECKOUT METRICS
+# =====================================================
+pool_metrics = {
+    "connections_opened": 0,
+    "checkouts": 0,
+    "checkins": 0,
+    "checked_out": 0,
+    "peak_checked_out": 0,
+}
+_pool_metrics_lock = threading.Lock()
+
+
+def _count_connect(dbapi_connection, connection_record):
+    with _pool_metrics_lock:
+        pool_metrics["connections_opened"] += 1
+
+
+def _count_checkout(dbapi_connection, connection_record, connection_proxy):
+    with _pool_metrics_lock:
+        pool_metrics["checkouts"] += 1
+        pool_metrics["checked_out"] += 1
+        pool_metrics["peak_checked_out"] = max(pool_metrics["peak_checked_out"], pool_metrics["checked_out"])
+
+
+def _count_checkin(dbapi_connection, connection_record):
+    with _pool_metrics_lock:
+        pool_metrics["checkins"] += 1
+        pool_metrics["checked_out"] = max(0, pool_metrics["checked_out"] - 1)
+
+
+# =====================================================
+# LAZY ENGINE AND SESSION FACTORY
+# =====================================================
+# Created on first use rather than at import, so entry points and tools that never touch
+# the database (or run without DATABASE_URL) import quickly.
+_engine = None
+_session_factory = None
+_engine_lock = threading.Lock()
+
+
+def get_engine() -> Engine:
+    """
+    Singleton accessor for the pooled engine of the configured database.
+    """
+    global _engine, _session_factory
+
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                url = make_url(settings.DATABASE_URL)
+                engine = create_engine(url, echo=False, future=True, **_engine_options(url))
+
+                if url.get_backend_name() == "sqlite":
+                    file_database = url.database not in (None, "", ":memory:")
+                    event.listen(
+                        engine,
+                        "connect",
+                        lambda dbapi_connection, connection_record: _apply_sqlite_pragmas(dbapi_connection, file_database),
+                    )
+                event.listen(engine, "connect", _count_connect)
+                event.listen(engine, "checkout", _count_checkout)
+                event.listen(engine, "checkin", _count_checkin)
+
+                _session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+                _engine = engine
+
+    return _engine
+
+
+def get_session_factory() -> sessionmaker:
+    get_engine()
+    return _session_factory
+
+
+def __getattr__(name: str):
+    # Backwards compatible module attributes for code importing them directly.
+    if name == "database_engine":
+        return get_engine()
+    if name == "SessionLocal":
+        return get_session_factory()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,14 +1,62 @@
+from sqlalchemy import inspect, text
+from config import settings
 from database.base import Base
-from database.engine import database_engine
+from database.engine import get_engine
 from utils.logger import logger
 
+
+def migrate_schema(engine=None) -> None:
+    """
+    Bring tables created by an older version of the models up to date.
+    create_all() never alters an existing table, so nullable columns and indexes added
+    to the models since are created here, and planner statistics of the indexed tables are
+    refreshed. Anything else still needs a manual migration.
+    """
+    engine = engine or get_engine()
+    inspector = inspect(engine)
+    existing_tables = set(inspector.get_table_names())
+    quote = engine.dialect.identifier_preparer.quote
+    analyze = "ANALYZE TABLE" if engine.dialect.name in ("mysql", "mariadb") else "ANALYZE"
+
+    with engine.begin() as connection:
+        for table in Base.metadata.sorted_tables:
+            if table.name not in existing_tables:
+                continue
+
+            existing_columns = {column["name"] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+
+                if not column.nullable:
+                    logger.warning(f"Cannot add NOT NULL column {table.name}.{column.name} automatically. Skipping.")
+                    continue
+
+                column_type = column.type.compile(dialect=engine.dialect)
+                connection.execute(
+                    text(f"ALTER TABLE {quote(table.name)} ADD COLUMN {quote(column.name)} {column_type}")
+                )
+                logger.info(f"Added column {table.name}.{column.name}.")
+
+            existing_indexes = {index["name"] for index in inspector.get_indexes(table.name)}
+            missing_indexes = [index for index in table.indexes if index.name not in existing_indexes]
+            for index in missing_indexes:
+                index.create(connection)
+                logger.info(f"Created index {index.name} on {table.name}.")
+
+            if missing_indexes:
+                connection.execute(text(f"{analyze} {quote(table.name)}"))
+
+
 def init_db():
     try:
-        Base.metadata.create_all(bind=database_engine)
+        Base.metadata.create_all(bind=get_engine())
+        migrate_schema(get_engine())
         logger.info("Database initialized successfully (new tables created if missing).")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
 
 if __name__ == "__main__":
+    settings.load_settings()
     init_db()
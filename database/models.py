@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Boolean, JSON
+from sqlalchemy import Column, Integer, String, Float, Text, ForeignKey, Boolean, JSON, DateTime
 from sqlalchemy.orm import relationship
 from database.base import Base
 
@@ -8,14 +8,14 @@ class Post(Base):
 
     id = Column(Integer, primary_key=True, autoincrement=True)
     submission_id = Column(String(20), unique=True, nullable=False)
-    subreddit = Column(String(100), nullable=False)
+    subreddit = Column(String(100), nullable=False, index=True)
     title = Column(Text, nullable=False)
     body = Column(Text)
     upvote_ratio = Column(Float)
     score = Column(Integer)
     number_of_comments = Column(Integer)
     post_url = Column(Text)
-    is_processed = Column(Boolean, default=False)
+    is_processed = Column(Boolean, default=False, index=True)
 
     comments = relationship("Comment", back_populates="post", cascade="all, delete-orphan")
     sentiments = relationship("Sentiment", back_populates="post", cascade="all, delete-orphan")
@@ -25,7 +25,8 @@ class Comment(Base):
     __tablename__ = "comments"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    submission_id = Column(String(20), ForeignKey("posts.submission_id"), nullable=False)
+    comment_id = Column(String(20), unique=True, index=True)  # Reddit comment ID; NULL for rows stored before it was captured
+    submission_id = Column(String(20), ForeignKey("posts.submission_id"), nullable=False, index=True)
     subreddit = Column(String(100), nullable=False)
     title = Column(Text, nullable=False)
     author = Column(String(255))
@@ -39,7 +40,7 @@ class Sentiment(Base):
     __tablename__ = "sentiments"
 
     id =  Column(Integer, primary_key=True, autoincrement=True)
-    post_id = Column(String(20), ForeignKey("posts.submission_id"), nullable=False)
+    post_id = Column(String(20), ForeignKey("posts.submission_id"), nullable=False, index=True)
     sentiment_results =  Column(JSON, nullable=False)
 
     post = relationship("Post", back_populates="sentiments")
@@ -49,4 +50,107 @@ class ProcessedBriefs(Base):
     __tablename__ = "processed_briefs"
 
     id = Column(Integer, primary_key=True, autoincrement=True)
-    curated_content = Column(Text, nullable=False)
\ No newline at end of file
+    curated_content = Column(Text, nullable=False)
+    created_at = Column(DateTime)  # NULL for briefs stored before it was captured
+
+
+class PostBrief(Base):
+    __tablename__ = "post_briefs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(String(20), ForeignKey("posts.submission_id"), unique=True, nullable=False)
+    sentiment_version = Column(String(16), nullable=False)
+    prompt_version = Column(String(16), nullable=False)
+    model = Column(String(100), nullable=False)
+    statement = Column(Text, nullable=False)
+    updated_at = Column(DateTime, nullable=False)
+
+
+class CuratorResponseCache(Base):
+    __tablename__ = "curator_response_cache"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), unique=True, nullable=False)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    size_bytes = Column(Integer, nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    last_accessed_at = Column(DateTime, nullable=False)
+
+
+class ScrapeState(Base):
+    __tablename__ = "scrape_state"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    submission_id = Column(String(20), unique=True, nullable=False)
+    subreddit = Column(String(100), nullable=False, index=True)
+    num_comments = Column(Integer, nullable=False, default=0)
+    last_comment_utc = Column(Float, nullable=False, default=0.0)
+    last_seen_at = Column(DateTime)
+
+
+class CommentScoreCache(Base):
+    __tablename__ = "comment_score_cache"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    cache_key = Column(String(64), unique=True, nullable=False)
+    lexicon_version = Column(String(16), nullable=False)
+    compound = Column(Float, nullable=False)
+
+
+class PipelineStageMetric(Base):
+    __tablename__ = "pipeline_stage_metrics"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String(32), nullable=False, index=True)
+    pipeline = Column(String(100), nullable=False)
+    run_started_at = Column(DateTime, nullable=False, index=True)
+    stage = Column(String(255), nullable=False)
+    calls = Column(Integer, nullable=False)
+    wall_seconds = Column(Float, nullable=False)
+    cpu_seconds = Column(Float, nullable=False)
+    rows_in = Column(Integer, nullable=False)
+    rows_out = Column(Integer, nullable=False)
+    api_calls = Column(JSON, nullable=False)
+    errors = Column(Integer, nullable=False, default=0)
+
+
+class NotionOutbox(Base):
+    __tablename__ = "notion_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    brief_id = Column(Integer, ForeignKey("processed_briefs.id"), nullable=False, index=True)
+    payload = Column(JSON, nullable=False)  # Page title, brief text and per-post statements
+    status = Column(String(20), nullable=False, default="pending", index=True)  # pending, in_progress, sent or failed
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text)
+    notion_page_id = Column(String(64))  # Set once the page exists, so a retry only appends what is missing
+    blocks_appended = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, nullable=False)
+    next_attempt_at = Column(DateTime, nullable=False, index=True)  # Lease expiry while in_progress
+    sent_at = Column(DateTime)
+
+
+class SubredditSentimentAggregate(Base):
+    __tablename__ = "subreddit_sentiment_aggregates"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    subreddit = Column(String(100), unique=True, nullable=False)
+    posts = Column(Integer, nullable=False)
+    comments = Column(Integer, nullable=False)
+    avg_compound = Column(Float, nullable=False)  # Comment-weighted mean of the posts' average compound
+    positive_comments = Column(Integer, nullable=False)
+    negative_comments = Column(Integer, nullable=False)
+    neutral_comments = Column(Integer, nullable=False)
+    dominant_sentiments = Column(JSON, nullable=False)  # Number of posts per dominant sentiment label
+    updated_at = Column(DateTime, nullable=False)
+
+
+class ReadModelVersion(Base):
+    __tablename__ = "read_model_versions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String(50), unique=True, nullable=False)  # "briefs" or "sentiment"
+    version = Column(Integer, nullable=False, default=0)  # Bumped in every transaction that changes the data
+    updated_at = Column(DateTime, nullable=False)
@@ -1,11 +1,48 @@
-from sqlalchemy.orm import sessionmaker
-from database.engine import database_engine
+from contextlib import contextmanager
+from typing import Dict, Iterator
+from sqlalchemy.orm import Session
+from database.engine import get_engine, get_session_factory, pool_metrics, _pool_metrics_lock
+from utils.logger import logger
 
 # ==============================================================================================
 # To avoid circular imports, this file contains utility functions used across multiple modules.
 # ==============================================================================================
 
-def get_session():
-    session_make = sessionmaker(bind=database_engine)
-    session = session_make()
-    return session
\ No newline at end of file
+def get_session() -> Session:
+    return get_session_factory()()
+
+
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Unit of work on the shared session factory: commits on success,
+    rolls back on error and always returns the connection to the pool.
+    """
+    session = get_session_factory()()
+    try:
+        yield session
+        session.commit()
+    except Exception:
+        session.rollback()
+        raise
+    finally:
+        session.close()
+
+
+def get_pool_metrics() -> Dict:
+    """
+    Snapshot of connection pool checkout counters plus the pool's own status line.
+    """
+    with _pool_metrics_lock:
+        metrics = dict(pool_metrics)
+    metrics["pool_status"] = get_engine().pool.status()
+    return metrics
+
+
+def log_pool_metrics() -> None:
+    metrics = get_pool_metrics()
+    logger.info(
+        f"DB pool: {metrics['checkouts']} checkout(s), {metrics['checked_out']} in use, "
+        f"peak {metrics['peak_checked_out']}, {metrics['connections_opened']} connection(s) opened. "
+        f"{metrics['pool_status']}"
+    )
@@ -0,0 +1,18 @@
+from config import settings
+
+
+def run_api():
+    settings.load_settings()
+
+    # Imported on first use so importing the entry point does not load Flask or the database.
+    from database.init_db import init_db
+    from handlers.read_api_handler import create_app
+    from services.sentiment_aggregate_service import SentimentAggregateService
+
+    init_db()
+    # Posts scored before the aggregate table existed only show up after a full rebuild.
+    SentimentAggregateService().refresh()
+    create_app().run(host=settings.READ_API_HOST, port=settings.READ_API_PORT, threaded=True)
+
+if __name__ == "__main__":
+    run_api()
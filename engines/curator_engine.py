@@ -1,4 +1,20 @@
-from pipelines.curator_pipeline import execute_curator_pipeline
+from config import settings
+
+
+def run_curator():
+    settings.load_settings()
+
+    # Imported on first use so importing the entry point does not load the Gemini SDK or the database.
+    from pipelines.curator_pipeline import execute_curator_pipeline
+
+    result = execute_curator_pipeline()
+
+    # The brief is already stored; exporting it only drains the outbox the curator filled.
+    if settings.NOTION_EXPORT_ENABLED:
+        from pipelines.notion_export_pipeline import execute_notion_export_pipeline
+        execute_notion_export_pipeline()
+
+    return result
 
 if __name__ == "__main__":
-    execute_curator_pipeline()
\ No newline at end of file
+    run_curator()
@@ -1,12 +1,23 @@
-from database.init_db import init_db
-from handlers.reddit_handler import scrape_reddit_data, store_reddit_data
-from pipelines.sentiment_pipeline import execute_sentiment_pipeline
+from config import settings
+
 
 def run_reddit_ingest():
+    settings.load_settings()
+
+    # Imported on first use so importing the entry point does not load PRAW, NLTK or the database.
+    from database.init_db import init_db
+    from handlers.reddit_handler import scrape_reddit_data, store_reddit_data, scrape_and_store_reddit_data
+    from pipelines.sentiment_pipeline import execute_sentiment_pipeline
+    from utils.instrumentation import pipeline_run
+
     init_db()
-    reddit_data = scrape_reddit_data()
-    store_reddit_data(reddit_data)
-    execute_sentiment_pipeline()
+    with pipeline_run("reddit_ingest"):
+        if settings.STREAMING_INGEST:
+            scrape_and_store_reddit_data()
+        else:
+            reddit_data = scrape_reddit_data()
+            store_reddit_data(reddit_data)
+        execute_sentiment_pipeline()
 
 if __name__ == "__main__":
-    run_reddit_ingest()
\ No newline at end of file
+    run_reddit_ingest()
@@ -0,0 +1,15 @@
+from config import settings
+
+
+def run_notion_export():
+    settings.load_settings()
+
+    # Imported on first use so importing the entry point does not load the Notion client or the database.
+    from database.init_db import init_db
+    from pipelines.notion_export_pipeline import execute_notion_export_pipeline
+
+    init_db()
+    return execute_notion_export_pipeline()
+
+if __name__ == "__main__":
+    run_notion_export()
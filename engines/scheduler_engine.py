@@ -0,0 +1,18 @@
+import signal
+from config import settings
+
+
+def run_scheduler():
+    settings.load_settings()
+
+    # Imported on first use so importing the entry point does not load any client or the database.
+    from database.init_db import init_db
+    from services.scheduler_service import SchedulerService
+
+    init_db()
+    scheduler = SchedulerService()
+    signal.signal(signal.SIGTERM, lambda signum, frame: scheduler.stop_event.set())
+    scheduler.run_forever()
+
+if __name__ == "__main__":
+    run_scheduler()
@@ -0,0 +1,70 @@
+from flask import Flask, Response, request
+from config import settings
+from services.read_model_service import CachedResponse, ReadModelService
+
+
+def _respond(cached: CachedResponse) -> Response:
+    """
+    Serve a cached body with its ETag; a matching If-None-Match gets an empty 304.
+    """
+    response = Response(cached.body, status=cached.status, mimetype="application/json")
+    response.set_etag(cached.etag)
+    # Clients may keep the body but must revalidate, which costs them a 304 while nothing changed.
+    response.cache_control.no_cache = True
+    return response.make_conditional(request)
+
+
+def _bounded_int(name: str, default: int, minimum: int, maximum: int | None = None) -> int:
+    value = request.args.get(name, default, type=int)
+    value = max(minimum, value if value is not None else default)
+    return min(value, maximum) if maximum is not None else value
+
+
+def create_app(service: ReadModelService | None = None) -> Flask:
+    """
+    Read-only JSON API over the latest brief, per-subreddit sentiment aggregates and
+    per-post sentiment.
+    """
+    app = Flask(__name__)
+    service = service or ReadModelService()
+    app.extensions["read_model_service"] = service
+
+    @app.get("/health")
+    def health():
+        return {"status": "ok"}
+
+    @app.get("/briefs/latest")
+    def latest_brief():
+        return _respond(service.cached("briefs", "latest", service.latest_brief))
+
+    @app.get("/subreddits/sentiment")
+    def subreddit_sentiment():
+        return _respond(service.cached("sentiment", "subreddits", service.subreddit_aggregates))
+
+    @app.get("/subreddits/<subreddit>/sentiment")
+    def one_subreddit_sentiment(subreddit: str):
+        def build():
+            aggregates = service.subreddit_aggregates(subreddit)["subreddits"]
+            return aggregates[0] if aggregates else None
+
+        return _respond(service.cached("sentiment", ("subreddit", subreddit), build))
+
+    @app.get("/posts/sentiment")
+    def post_sentiments():
+        subreddit = request.args.get("subreddit") or None
+        limit = _bounded_int("limit", settings.READ_API_PAGE_SIZE, 1, settings.READ_API_MAX_PAGE_SIZE)
+        after = _bounded_int("after", 0, 0)
+
+        return _respond(service.cached(
+            "sentiment",
+            ("posts", subreddit, limit, after),
+            lambda: service.post_sentiments(subreddit, limit, after),
+        ))
+
+    @app.get("/posts/<submission_id>/sentiment")
+    def post_sentiment(submission_id: str):
+        return _respond(service.cached(
+            "sentiment", ("post", submission_id), lambda: service.post_sentiment(submission_id)
+        ))
+
+    return app
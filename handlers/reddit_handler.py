@@ -2,13 +2,26 @@ from typing import Any, Dict, List
 from services.reddit_service import RedditService
 from utils.logger import logger
 
-execute = RedditService()
+_reddit_service: RedditService | None = None
+
+
+def get_reddit_service() -> RedditService:
+    """
+    Create the Reddit service (and with it the PRAW client) on first use rather than at import.
+    """
+    global _reddit_service
+
+    if _reddit_service is None:
+        _reddit_service = RedditService()
+
+    return _reddit_service
+
 
 def scrape_reddit_data() -> Dict[str, List[Any]]:
 
     try:
 
-        reddit_data = execute.run_reddit_scraper()
+        reddit_data = get_reddit_service().run_reddit_scraper()
 
     except Exception as e:
         logger.error(f"Error during Reddit scraping: {e}", exc_info=True)
@@ -21,9 +34,21 @@ def store_reddit_data(reddit_data: Dict[str, Any]) -> bool:
 
     try:
 
-        execute.run_reddit_storage(reddit_data)
+        get_reddit_service().run_reddit_storage(reddit_data)
         return True
 
     except Exception as e:
         logger.error(f"Error during Reddit data storage: {e}", exc_info=True)
         return False
+
+
+def scrape_and_store_reddit_data() -> bool:
+
+    try:
+
+        get_reddit_service().run_reddit_stream()
+        return True
+
+    except Exception as e:
+        logger.error(f"Error during Reddit streaming ingest: {e}", exc_info=True)
+        return False
@@ -1,4 +1,6 @@
 from services.curator_service import CuratorService
+from database.session import log_pool_metrics
+from utils.instrumentation import pipeline_run
 from utils.logger import logger
 
 
@@ -6,9 +8,11 @@ def execute_curator_pipeline():
     try:
         logger.info("=== Starting curator pipeline ===")
 
-        execute = CuratorService()
-        execute.execute_curator_agent()
-        execute.store_curator_response()
+        with pipeline_run("curator"):
+            execute = CuratorService()
+            execute.execute_curator_agent()
+            execute.store_curator_response()
+        log_pool_metrics()
 
         logger.info("=== Curator pipeline completed successfully ===")
         return True
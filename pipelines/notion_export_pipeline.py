@@ -0,0 +1,21 @@
+from services.notion_export_service import NotionExportService
+from database.session import log_pool_metrics
+from utils.instrumentation import pipeline_run
+from utils.logger import logger
+
+
+def execute_notion_export_pipeline():
+    try:
+        logger.info("=== Starting Notion export pipeline ===")
+
+        with pipeline_run("notion_export"):
+            exporter = NotionExportService()
+            counts = exporter.export_pending()
+        log_pool_metrics()
+
+        logger.info("=== Notion export pipeline completed successfully ===")
+        return counts
+
+    except Exception as e:
+        logger.error(f"Error in Notion export pipeline: {e}", exc_info=True)
+        return {"error": str(e)}
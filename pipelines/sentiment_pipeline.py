@@ -1,4 +1,6 @@
 from services.sentiment_service import SentimentService
+from database.session import log_pool_metrics
+from utils.instrumentation import pipeline_run
 from utils.logger import logger
 
 
@@ -6,11 +8,13 @@ def execute_sentiment_pipeline():
     try:
         logger.info("===Starting sentiment pipeline ===")
 
-        processor = SentimentService()
-        processor.query_posts_with_comments()
-        processor.analyze_post_sentiment()
-        processor.summarize_post_sentiment()
-        processor.store_sentiment_results()
+        with pipeline_run("sentiment"):
+            processor = SentimentService()
+            try:
+                processor.process_posts_in_pages()
+            finally:
+                processor.close()
+        log_pool_metrics()
 
         logger.info("=== Sentiment pipeline completed successfully ===")
         return True
@@ -1,50 +1,64 @@
+import json
 from typing import Dict, List
-from sqlalchemy.orm import sessionmaker
-from google.genai import errors
+from google.genai import errors, types
+from pydantic import BaseModel
+from sqlalchemy import select
 from config import settings
-from database.engine import database_engine
-from database.models import Post, Sentiment, ProcessedBriefs
-from database.session import get_session
+from database.models import ProcessedBriefs
+from database.session import session_scope
 from clients.gemini_client import initialize_gemini, provide_agent_tools
+from clients.gemini_async_client import AsyncGeminiCaller
+from services.notion_export_service import NotionExportService
+from services.read_model_service import bump_version
+from services.response_cache_service import ResponseCacheService
+from services.post_brief_service import PostBriefService, content_version
+from utils.helpers import iter_posts_with_sentiments, utc_now
+from utils.instrumentation import instrumented
 from utils.logger import logger
 
-Session = sessionmaker(bind=database_engine)
+
+class PostStatement(BaseModel):
+    post_number: int
+    statement: str
 
 
 class CuratorService:
     def __init__(self):
-        self.session = get_session()
         self.agent = initialize_gemini()
+        self.caller = AsyncGeminiCaller(self.agent)
+        self.response_cache = ResponseCacheService() if settings.CURATOR_CACHE_ENABLED else None
+        self.post_briefs = PostBriefService()
+        self.notion_export = NotionExportService() if settings.NOTION_EXPORT_ENABLED else None
+        self.post_with_sentiments = []
+        self.post_statements: Dict[int, str] = {}
+        self.brief_complete = True  # False when a map batch or post statement batch failed
+        self.served_from_cache = False  # True when the brief came from the response cache
+        self.curator_agent_response = None
+
+    def reset(self) -> None:
+        """
+        Forget the posts, brief and call metrics of the previous run so a long-lived
+        instance (and its Gemini client) can be reused for the next one.
+        """
         self.post_with_sentiments = []
+        self.post_statements = {}
+        self.brief_complete = True
+        self.served_from_cache = False
         self.curator_agent_response = None
+        self.caller.call_metrics = []
 
+    @instrumented(rows_out=len)
     def query_posts_with_sentiments(self) -> List[Dict]:
         """
         Call the query_posts_with_sentiments() function to obtain posts and their sentiment analysis results.
         Each record in the returned list contains a post and its sentiment score.
         Use this information to guide your next actions, generate summaries, or perform analysis as required.
         """
-        session = self.session
-        post_records = []
-
         logger.info("Querying posts with sentiments from the database...")
 
-        posts_with_sentiments = (
-            session.query(Post, Sentiment)
-            .join(Sentiment, Sentiment.post_id == Post.submission_id)
-            .all()
-        )
-
         try:
-            for post, sentiment in posts_with_sentiments:
-                post_with_sentiments = {
-                    "post_number": post.id,
-                    "subreddit": post.subreddit,
-                    "title": post.title,
-                    "body": post.body,
-                    "sentiment_score": sentiment.sentiment_results
-                }
-                post_records.append(post_with_sentiments)
+            with session_scope() as session:
+                post_records = list(iter_posts_with_sentiments(session, settings.DB_READ_PAGE_SIZE))
 
             logger.info("Successfully queried posts with sentiments.")
 
@@ -56,18 +70,272 @@ class CuratorService:
             raise SystemExit
 
 
+    def estimate_tokens(self, text: str) -> int:
+        return max(1, len(text) // settings.CURATOR_CHARS_PER_TOKEN)
+
+
+    def build_post_batches(self, post_records: List[Dict]) -> List[List[Dict]]:
+        """
+        Group posts by subreddit and split each group into batches whose estimated
+        prompt size stays within CURATOR_BATCH_TOKEN_BUDGET.
+        """
+        budget = settings.CURATOR_BATCH_TOKEN_BUDGET - self.estimate_tokens(settings.CURATOR_MAP_OBJECTIVE)
+        posts_by_subreddit: Dict[str, List[Dict]] = {}
+
+        for post in post_records:
+            posts_by_subreddit.setdefault(post["subreddit"], []).append(post)
+
+        batches = []
+        for subreddit, posts in posts_by_subreddit.items():
+            batch: List[Dict] = []
+            batch_tokens = 0
+
+            for post in posts:
+                post_tokens = self.estimate_tokens(json.dumps(post, default=str))
+                if batch and batch_tokens + post_tokens > budget:
+                    batches.append(batch)
+                    batch, batch_tokens = [], 0
+
+                if post_tokens > budget:
+                    logger.warning(
+                        f"Post {post['post_number']} from r/{subreddit} is estimated at {post_tokens} tokens, "
+                        f"above the batch budget. Sending it alone."
+                    )
+
+                batch.append(post)
+                batch_tokens += post_tokens
+
+            if batch:
+                batches.append(batch)
+
+        logger.info(f"Split {len(post_records)} post(s) into {len(batches)} batch(es).")
+        return batches
+
+
+    def _run_map_batches(self, batches: List[List[Dict]]) -> List[str | None]:
+        """
+        Brief every batch concurrently. A batch that still fails after retries yields None.
+        """
+        requests = []
+        for batch_number, batch in enumerate(batches, start=1):
+            contents = f"{settings.CURATOR_MAP_OBJECTIVE}\n\nPosts:\n{json.dumps(batch, default=str)}"
+            label = f"map {batch_number} r/{batch[0]['subreddit']}"
+            logger.info(f"[{label}] {len(batch)} post(s), estimated prompt tokens: {self.estimate_tokens(contents)}")
+            requests.append((label, contents))
+
+        partial_briefs = []
+        for (label, _), result in zip(requests, self.caller.generate_all(requests)):
+            if isinstance(result, BaseException):
+                logger.error(f"[{label}] failed: {result}")
+                partial_briefs.append(None)
+            else:
+                partial_briefs.append(result.text)
+
+        return partial_briefs
+
+
+    @instrumented()
+    def execute_map_reduce_agent(self):
+        """
+        Brief posts in token-budgeted batches concurrently, then merge the partial briefs
+        in a single reduce call.
+        """
+        logger.info("Executing Curator Agent in map-reduce mode...")
+
+        post_records = self.post_with_sentiments or self.query_posts_with_sentiments()
+        if not post_records:
+            logger.warning("No posts with sentiments found. Nothing to curate.")
+            return None
+
+        batches = self.build_post_batches(post_records)
+        partial_briefs = [brief for brief in self._run_map_batches(batches) if brief]
+
+        if not partial_briefs:
+            raise RuntimeError("Every map batch failed. No partial briefs to reduce.")
+
+        if len(partial_briefs) < len(batches):
+            self.brief_complete = False
+            logger.warning(f"{len(batches) - len(partial_briefs)} map batch(es) failed and were left out.")
+
+        if len(partial_briefs) == 1:
+            return partial_briefs[0]
+
+        contents = settings.CURATOR_REDUCE_OBJECTIVE + "".join(
+            f"\n\nPartial brief {number}:\n{brief}" for number, brief in enumerate(partial_briefs, start=1)
+        )
+        return self.caller.generate_one("reduce", contents).text
+
+
+    def _generate_post_statements(self, post_records: List[Dict]) -> Dict[int, str]:
+        """
+        Ask the model for one statement per post, in token-budgeted batches run concurrently.
+        Returns statements keyed by post number. Posts from failed batches are left out and
+        mark the brief incomplete.
+        """
+        config = types.GenerateContentConfig(
+            response_mime_type="application/json",
+            response_schema=list[PostStatement],
+        )
+
+        requests = []
+        for batch_number, batch in enumerate(self.build_post_batches(post_records), start=1):
+            contents = f"{settings.CURATOR_POST_OBJECTIVE}\n\nPosts:\n{json.dumps(batch, default=str)}"
+            requests.append((f"posts {batch_number} r/{batch[0]['subreddit']}", contents))
+
+        statements: Dict[int, str] = {}
+        for (label, _), result in zip(requests, self.caller.generate_all(requests, config)):
+            if isinstance(result, BaseException):
+                logger.error(f"[{label}] failed: {result}")
+                self.brief_complete = False
+                continue
+
+            for item in result.parsed or []:
+                statements[item.post_number] = item.statement
+
+        if any(post["post_number"] not in statements for post in post_records):
+            self.brief_complete = False
+        return statements
+
+
+    @staticmethod
+    def assemble_brief(post_records: List[Dict], statements: Dict[int, str]) -> str:
+        """
+        Build the full brief from per-post statements, grouped by subreddit in post order.
+        """
+        sections: Dict[str, List[str]] = {}
+        for post in post_records:
+            statement = statements.get(post["post_number"])
+            if statement:
+                sections.setdefault(post["subreddit"], []).append(
+                    f"Post {post['post_number']}: {post['title']}\n{statement}"
+                )
+
+        return "\n\n".join(
+            f"r/{subreddit}\n\n" + "\n\n".join(entries) for subreddit, entries in sections.items()
+        )
+
+
+    @instrumented()
+    def execute_incremental_agent(self):
+        """
+        Reuse stored statements for posts whose sentiment is unchanged and only send new
+        or changed posts to the model, then assemble the full brief from both.
+        """
+        logger.info("Executing Curator Agent in incremental mode...")
+
+        post_records = self.post_with_sentiments or self.query_posts_with_sentiments()
+        if not post_records:
+            logger.warning("No posts with sentiments found. Nothing to curate.")
+            return None
+
+        prompt_version = content_version(settings.AGENT_MODEL, settings.CURATOR_POST_OBJECTIVE)
+        stored_briefs = self.post_briefs.load_briefs([post["post_number"] for post in post_records])
+
+        statements: Dict[int, str] = {}
+        stale_posts: List[Dict] = []
+        sentiment_versions: Dict[int, str] = {}
+
+        for post in post_records:
+            post_number = post["post_number"]
+            sentiment_versions[post_number] = content_version(post["sentiment_score"])
+            stored = stored_briefs.get(post_number)
+
+            if (
+                stored
+                and stored["sentiment_version"] == sentiment_versions[post_number]
+                and stored["prompt_version"] == prompt_version
+            ):
+                statements[post_number] = stored["statement"]
+            else:
+                stale_posts.append(post)
+
+        logger.info(f"Reusing {len(statements)} stored statement(s); {len(stale_posts)} post(s) need the model.")
+
+        if stale_posts:
+            fresh_statements = self._generate_post_statements(stale_posts)
+            submission_ids = self.post_briefs.submission_ids_for(list(fresh_statements.keys()))
+
+            self.post_briefs.store_briefs([
+                {
+                    "submission_id": submission_ids[post_number],
+                    "sentiment_version": sentiment_versions[post_number],
+                    "prompt_version": prompt_version,
+                    "model": settings.AGENT_MODEL,
+                    "statement": statement,
+                }
+                for post_number, statement in fresh_statements.items()
+                if post_number in submission_ids and post_number in sentiment_versions
+            ])
+            statements.update(fresh_statements)
+
+        self.post_statements = statements
+        return self.assemble_brief(post_records, statements)
+
+
+    @instrumented()
+    def execute_single_agent(self) -> str:
+        """
+        Let the model pull every post through the query_posts_with_sentiments tool in one call.
+        """
+        logger.info("Executing Curator Agent...")
+        response = self.caller.generate_one(
+            "curator",
+            settings.SCOUT_OBJECTIVE,
+            config=provide_agent_tools(tools=[self.query_posts_with_sentiments])
+        )
+        return response.text
+
+
+    def response_cache_key(self) -> str:
+        """
+        Hash of everything that determines the brief: model, mode-specific prompt and tool payload.
+        """
+        if settings.CURATOR_MODE == "map_reduce":
+            prompt = "\n".join([
+                settings.CURATOR_MODE,
+                str(settings.CURATOR_BATCH_TOKEN_BUDGET),
+                settings.CURATOR_MAP_OBJECTIVE,
+                settings.CURATOR_REDUCE_OBJECTIVE,
+            ])
+        elif settings.CURATOR_MODE == "incremental":
+            prompt = "\n".join([settings.CURATOR_MODE, settings.CURATOR_POST_OBJECTIVE])
+        else:
+            prompt = settings.SCOUT_OBJECTIVE
+
+        payload = self.post_with_sentiments or self.query_posts_with_sentiments()
+        return ResponseCacheService.make_key(settings.AGENT_MODEL, prompt, payload)
+
+
+    @instrumented()
     def execute_curator_agent(self):
 
         try:
-            logger.info("Executing Curator Agent...")
-            response = self.agent.models.generate_content(
-                model=settings.AGENT_MODEL,
-                contents=settings.SCOUT_OBJECTIVE,
-                config=provide_agent_tools(tools=[self.query_posts_with_sentiments])
-            )
+            self.served_from_cache = False
+            cache_key = self.response_cache_key() if self.response_cache else None
+            cached_response = self.response_cache.get(cache_key) if cache_key else None
+
+            if cached_response is not None:
+                logger.info("Dataset unchanged since the cached brief. Skipping the model call.")
+                self.served_from_cache = True
+                self.curator_agent_response = cached_response
+                return cached_response
+
+            self.brief_complete = True
+            if settings.CURATOR_MODE == "map_reduce":
+                curator_response = self.execute_map_reduce_agent()
+            elif settings.CURATOR_MODE == "incremental":
+                curator_response = self.execute_incremental_agent()
+            else:
+                curator_response = self.execute_single_agent()
 
             logger.info("Curator Agent executed successfully..")
-            curator_response = response.text
+            self.caller.log_summary()
+
+            # A brief missing failed batches is not cached, so the next run retries them.
+            if cache_key and curator_response and self.brief_complete:
+                self.response_cache.put(cache_key, settings.AGENT_MODEL, curator_response)
+            elif cache_key and curator_response:
+                logger.warning("Brief is incomplete after failed batches. Not caching it.")
 
             self.curator_agent_response = curator_response
             return curator_response
@@ -87,10 +355,9 @@ class CuratorService:
             raise SystemExit("Agent terminated due to an error.")
 
 
+    @instrumented()
     def store_curator_response(self):
 
-        session = self.session
-
         if not self.curator_agent_response:
             logger.info("No curator agent response found. Running agent...")
             try:
@@ -98,17 +365,35 @@ class CuratorService:
             except Exception as e:
                 logger.error(f"Failed to run curator agent: {e}", exc_info=True)
 
+        # A cached brief was stored and exported by the run that generated it.
+        if self.served_from_cache:
+            logger.info("Brief was served from the cache and is already stored. Skipping.")
+            return
+
         try:
-            curated_brief = ProcessedBriefs(
-                curated_content = self.curator_agent_response
-            )
-            session.add(curated_brief)
-            session.commit()
+            with session_scope() as session:
+                latest_content = session.execute(
+                    select(ProcessedBriefs.curated_content).order_by(ProcessedBriefs.id.desc()).limit(1)
+                ).scalar()
+
+                if latest_content == self.curator_agent_response:
+                    logger.info("Brief is identical to the latest stored one. Skipping.")
+                    return
+
+                curated_brief = ProcessedBriefs(
+                    curated_content = self.curator_agent_response,
+                    created_at = utc_now(),
+                )
+                session.add(curated_brief)
+                bump_version(session, "briefs")
+
+                # Error responses are dicts; only real briefs go to Notion.
+                if self.notion_export and isinstance(self.curator_agent_response, str):
+                    payload = NotionExportService.build_payload(
+                        self.curator_agent_response, self.post_with_sentiments, self.post_statements
+                    )
+                    self.notion_export.enqueue(session, curated_brief, payload)
             logger.info("Curator response stored successfully in the database.")
 
         except Exception as e:
-            session.rollback()
-            logger.error(f"Failed to store curator response: {e}", exc_info=True)
-
-        finally:
-            session.close()
\ No newline at end of file
+            logger.error(f"Failed to store curator response: {e}", exc_info=True)
\ No newline at end of file
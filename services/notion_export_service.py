@@ -0,0 +1,246 @@
+import asyncio
+from datetime import timedelta
+from typing import Any, Dict, List
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from config import settings
+from clients.notion_async_client import AsyncNotionWriter
+from database.models import NotionOutbox, ProcessedBriefs
+from database.session import session_scope
+from utils.helpers import utc_now
+from utils.instrumentation import instrumented
+from utils.logger import logger
+
+# Notion rejects rich text longer than this in a single text object.
+RICH_TEXT_LIMIT = 2000
+
+
+def _rich_text(text: str) -> List[Dict]:
+    return [
+        {"type": "text", "text": {"content": text[start:start + RICH_TEXT_LIMIT]}}
+        for start in range(0, len(text), RICH_TEXT_LIMIT)
+    ]
+
+
+def _block(block_type: str, text: str) -> Dict:
+    return {"object": "block", "type": block_type, block_type: {"rich_text": _rich_text(text)}}
+
+
+class NotionExportService:
+    """
+    Outbox between the curator and Notion. The curator only adds an outbox row in the
+    transaction that stores the brief; export_pending() later pushes due rows to Notion, so a
+    slow or rate-limited Notion API never holds up curation, and failed exports are retried
+    with a growing delay until NOTION_OUTBOX_MAX_ATTEMPTS.
+    An entry being exported is in_progress under a lease of NOTION_OUTBOX_LEASE_SECONDS; if its
+    exporter dies, the entry is taken over once the lease expires and resumes on the page it
+    already created.
+    """
+
+    @staticmethod
+    def build_payload(content: str, post_records: List[Dict], statements: Dict[int, str]) -> Dict[str, Any]:
+        return {
+            "title": f"Market brief {utc_now():%Y-%m-%d %H:%M} UTC",
+            "brief": content,
+            "statements": [
+                {
+                    "post_number": post["post_number"],
+                    "subreddit": post["subreddit"],
+                    "title": post["title"],
+                    "statement": statements[post["post_number"]],
+                }
+                for post in post_records
+                if statements.get(post["post_number"])
+            ],
+        }
+
+
+    def enqueue(self, session: Session, brief: ProcessedBriefs, payload: Dict[str, Any]) -> NotionOutbox:
+        """
+        Add an outbox entry for `brief` in the caller's session, so it commits with the brief.
+        """
+        session.flush()
+        now = utc_now()
+        entry = NotionOutbox(brief_id=brief.id, payload=payload, created_at=now, next_attempt_at=now)
+        session.add(entry)
+        logger.info(f"Queued brief {brief.id} for Notion export with {len(payload['statements'])} post statement(s).")
+        return entry
+
+
+    @staticmethod
+    def build_blocks(payload: Dict[str, Any]) -> List[Dict]:
+        """
+        Page content: the brief, one paragraph per blank-line separated section, followed by
+        a heading and paragraph per post statement.
+        """
+        blocks = [_block("heading_2", "Brief")]
+        blocks.extend(
+            _block("paragraph", section.strip())
+            for section in payload["brief"].split("\n\n")
+            if section.strip()
+        )
+
+        if payload["statements"]:
+            blocks.append(_block("heading_2", "Post statements"))
+            for statement in payload["statements"]:
+                blocks.append(_block("heading_3", f"r/{statement['subreddit']}: {statement['title']}"))
+                blocks.append(_block("paragraph", statement["statement"]))
+
+        return blocks
+
+
+    def claim_due(self, limit: int) -> List[Dict]:
+        """
+        Take up to `limit` pending entries that are due, and in_progress entries whose lease
+        expired, and mark them in_progress for NOTION_OUTBOX_LEASE_SECONDS so a concurrent
+        exporter does not pick them up too.
+        """
+        now = utc_now()
+
+        with session_scope() as session:
+            # next_attempt_at is the retry time of a pending entry and the lease expiry of an in_progress one.
+            entries = session.scalars(
+                select(NotionOutbox)
+                .where(NotionOutbox.status.in_(("pending", "in_progress")), NotionOutbox.next_attempt_at <= now)
+                .order_by(NotionOutbox.next_attempt_at, NotionOutbox.id)
+                .limit(limit)
+                .with_for_update(skip_locked=True)
+            ).all()
+
+            claimed = []
+            for entry in entries:
+                if entry.status == "in_progress":
+                    logger.warning(f"Lease of Notion outbox entry {entry.id} expired. Taking it over.")
+
+                entry.status = "in_progress"
+                entry.attempts += 1
+                entry.next_attempt_at = now + timedelta(seconds=settings.NOTION_OUTBOX_LEASE_SECONDS)
+                claimed.append({
+                    "id": entry.id,
+                    "payload": entry.payload,
+                    "attempts": entry.attempts,
+                    "notion_page_id": entry.notion_page_id,
+                    "blocks_appended": entry.blocks_appended,
+                })
+
+            return claimed
+
+
+    def record_page(self, entry: Dict) -> None:
+        """
+        Store the page a claimed entry created, before its remaining blocks are appended,
+        so an export that dies midway is resumed on that page instead of creating another.
+        """
+        with session_scope() as session:
+            record = session.get(NotionOutbox, entry["id"])
+            record.notion_page_id = entry["notion_page_id"]
+            record.blocks_appended = entry["blocks_appended"]
+
+
+    def record_result(self, entry: Dict, error: BaseException | None) -> str:
+        """
+        Store the export progress of a claimed entry and mark it sent, rescheduled or failed.
+        Returns the new status.
+        """
+        now = utc_now()
+
+        with session_scope() as session:
+            record = session.get(NotionOutbox, entry["id"])
+            record.notion_page_id = entry["notion_page_id"]
+            record.blocks_appended = entry["blocks_appended"]
+
+            if error is None:
+                record.status = "sent"
+                record.sent_at = now
+                record.last_error = None
+                logger.info(f"Exported outbox entry {record.id} to Notion page {record.notion_page_id}.")
+
+            elif record.attempts >= settings.NOTION_OUTBOX_MAX_ATTEMPTS:
+                record.status = "failed"
+                record.last_error = str(error)
+                logger.error(f"Giving up on Notion export of outbox entry {record.id} after {record.attempts} attempt(s): {error}")
+
+            else:
+                delay = min(
+                    settings.NOTION_OUTBOX_RETRY_SECONDS * 2 ** (record.attempts - 1),
+                    settings.NOTION_OUTBOX_RETRY_MAX_SECONDS,
+                )
+                record.status = "pending"
+                record.last_error = str(error)
+                record.next_attempt_at = now + timedelta(seconds=delay)
+                logger.warning(f"Notion export of outbox entry {record.id} failed, retrying in {delay}s: {error}")
+
+            return record.status
+
+
+    async def _export_entry(self, writer: AsyncNotionWriter, entry: Dict) -> str:
+        """
+        Create the page with the first block batch and record it, then append the rest.
+        An entry that already has a page never creates another; it resumes after the blocks
+        it appended before.
+        """
+        blocks = self.build_blocks(entry["payload"])
+        error = None
+
+        try:
+            if entry["notion_page_id"]:
+                logger.info(
+                    f"Resuming outbox entry {entry['id']} on Notion page {entry['notion_page_id']} "
+                    f"after {entry['blocks_appended']} block(s)."
+                )
+            else:
+                entry["notion_page_id"] = await writer.create_page(entry["payload"]["title"], blocks)
+                entry["blocks_appended"] = min(len(blocks), writer.block_batch_size)
+                await asyncio.to_thread(self.record_page, entry)
+
+            await writer.append_blocks(entry["notion_page_id"], blocks[entry["blocks_appended"]:], entry)
+
+        except Exception as e:
+            error = e
+
+        # Persist progress as soon as the entry finishes, without blocking the event loop.
+        return await asyncio.to_thread(self.record_result, entry, error)
+
+
+    async def _export_entries(self, entries: List[Dict]) -> Dict[str, int]:
+        async with AsyncNotionWriter() as writer:
+            statuses = await asyncio.gather(*(self._export_entry(writer, entry) for entry in entries))
+
+        counts = {"sent": 0, "pending": 0, "failed": 0}
+        for status in statuses:
+            counts[status] += 1
+        counts["requests"] = writer.requests
+        counts["retries"] = writer.retries
+        return counts
+
+
+    @instrumented(rows_out=lambda counts: counts["sent"])
+    def export_pending(self) -> Dict[str, int]:
+        """
+        Export every due outbox entry, NOTION_OUTBOX_BATCH_SIZE at a time.
+        Returns how many entries were sent, rescheduled (pending) or failed, and the Notion
+        requests and retries it took.
+        """
+        totals = {"sent": 0, "pending": 0, "failed": 0, "requests": 0, "retries": 0}
+
+        if not settings.NOTION_EXPORT_ENABLED:
+            logger.info("Notion export is disabled (NOTION_API_KEY or NOTION_DB_ID not set).")
+            return totals
+
+        while True:
+            entries = self.claim_due(settings.NOTION_OUTBOX_BATCH_SIZE)
+            if not entries:
+                break
+
+            logger.info(f"Exporting {len(entries)} brief(s) to Notion...")
+            for key, count in asyncio.run(self._export_entries(entries)).items():
+                totals[key] += count
+
+            if len(entries) < settings.NOTION_OUTBOX_BATCH_SIZE:
+                break
+
+        logger.info(
+            f"Notion export: {totals['sent']} sent, {totals['pending']} rescheduled, {totals['failed']} failed "
+            f"in {totals['requests']} request(s) with {totals['retries']} retry(ies)."
+        )
+        return totals
@@ -0,0 +1,87 @@
+import hashlib
+import json
+from typing import Any, Dict, List
+from database.bulk_writer import bulk_upsert
+from database.models import Post, PostBrief
+from database.session import session_scope
+from utils.helpers import chunked, utc_now
+from utils.logger import logger
+
+
+def content_version(*parts: Any) -> str:
+    """
+    Short stable fingerprint of JSON-serializable content.
+    """
+    content = json.dumps(parts, sort_keys=True, default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()[:16]
+
+
+class PostBriefService:
+    def load_briefs(self, post_numbers: List[int]) -> Dict[int, Dict]:
+        """
+        Return the stored statement of each post, keyed by post number (Post.id).
+        """
+        briefs: Dict[int, Dict] = {}
+
+        try:
+            with session_scope() as session:
+                for number_chunk in chunked(post_numbers, 500):
+                    records = (
+                        session.query(Post.id, Post.submission_id, PostBrief)
+                        .join(PostBrief, PostBrief.submission_id == Post.submission_id)
+                        .filter(Post.id.in_(number_chunk))
+                    )
+                    for post_number, submission_id, brief in records:
+                        briefs[post_number] = {
+                            "submission_id": submission_id,
+                            "sentiment_version": brief.sentiment_version,
+                            "prompt_version": brief.prompt_version,
+                            "statement": brief.statement,
+                        }
+
+                return briefs
+
+        except Exception as e:
+            logger.error(f"Error loading post briefs: {e}", exc_info=True)
+            return {}
+
+
+    def submission_ids_for(self, post_numbers: List[int]) -> Dict[int, str]:
+        with session_scope() as session:
+            submission_ids: Dict[int, str] = {}
+            for number_chunk in chunked(post_numbers, 500):
+                for post_number, submission_id in (
+                    session.query(Post.id, Post.submission_id).filter(Post.id.in_(number_chunk))
+                ):
+                    submission_ids[post_number] = submission_id
+            return submission_ids
+
+
+    def store_briefs(self, briefs: List[Dict]) -> int:
+        """
+        Upsert freshly generated statements. Each brief needs submission_id, sentiment_version,
+        prompt_version, model and statement.
+        """
+        if not briefs:
+            return 0
+
+        updated_at = utc_now()
+        rows = [{**brief, "updated_at": updated_at} for brief in briefs]
+
+        try:
+            with session_scope() as session:
+                for chunk in chunked(rows, 500):
+                    bulk_upsert(
+                        session,
+                        PostBrief,
+                        chunk,
+                        conflict_columns=["submission_id"],
+                        update_columns=["sentiment_version", "prompt_version", "model", "statement", "updated_at"],
+                    )
+
+            logger.info(f"Stored {len(rows)} post brief(s).")
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Error storing post briefs: {e}", exc_info=True)
+            return 0
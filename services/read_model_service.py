@@ -0,0 +1,220 @@
+import hashlib
+import json
+import threading
+from typing import Any, Callable, Dict, Hashable, NamedTuple
+from cachetools import LRUCache, TTLCache
+from sqlalchemy import event, select, update
+from sqlalchemy.orm import Session
+from config import settings
+from database.models import Post, ProcessedBriefs, ReadModelVersion, Sentiment, SubredditSentimentAggregate
+from database.session import session_scope
+from utils.helpers import utc_now
+from utils.logger import logger
+
+# Read models the API serves, and what invalidates them:
+#   "briefs"     a new row in processed_briefs (CuratorService.store_curator_response)
+#   "sentiment"  new sentiment results and aggregates (SentimentAggregateService.refresh)
+READ_MODELS = ("briefs", "sentiment")
+
+# Every ReadModelService in this process, so a commit here invalidates them at once.
+_services: "set[ReadModelService]" = set()
+_services_lock = threading.Lock()
+
+
+def _invalidate_local(name: str) -> None:
+    with _services_lock:
+        services = list(_services)
+    for service in services:
+        service.invalidate(name)
+
+
+def bump_version(session: Session, name: str) -> None:
+    """
+    Mark read model `name` as changed in the caller's transaction. API processes notice the
+    new version within READ_API_CACHE_TTL_SECONDS; caches in this process are dropped as soon
+    as the transaction commits.
+    """
+    now = utc_now()
+    result = session.execute(
+        update(ReadModelVersion)
+        .where(ReadModelVersion.name == name)
+        .values(version=ReadModelVersion.version + 1, updated_at=now)
+    )
+    if not result.rowcount:
+        session.add(ReadModelVersion(name=name, version=1, updated_at=now))
+
+    event.listen(session, "after_commit", lambda committed: _invalidate_local(name), once=True)
+
+
+class CachedResponse(NamedTuple):
+    version: int
+    status: int
+    body: bytes
+    etag: str
+
+
+class ReadModelService:
+    """
+    Read side of the briefs and sentiment tables for the HTTP API.
+
+    Serialized responses are cached per data version: a TTL cache remembers each read
+    model's version for READ_API_CACHE_TTL_SECONDS, and an LRU cache holds response bodies
+    and their ETags under that version. Dashboards polling the API therefore cost one
+    version lookup per read model per TTL, and responses are only rebuilt after a pipeline
+    has written new rows.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.versions: TTLCache = TTLCache(maxsize=len(READ_MODELS), ttl=settings.READ_API_CACHE_TTL_SECONDS)
+        self.responses: LRUCache = LRUCache(maxsize=settings.READ_API_CACHE_SIZE)
+        self.hits = 0
+        self.misses = 0
+
+        with _services_lock:
+            _services.add(self)
+
+    def close(self) -> None:
+        with _services_lock:
+            _services.discard(self)
+
+    def invalidate(self, name: str) -> None:
+        with self.lock:
+            self.versions.pop(name, None)
+
+
+    def current_version(self, name: str) -> int:
+        with self.lock:
+            version = self.versions.get(name)
+        if version is not None:
+            return version
+
+        with session_scope() as session:
+            version = session.scalar(select(ReadModelVersion.version).where(ReadModelVersion.name == name)) or 0
+
+        with self.lock:
+            self.versions[name] = version
+        return version
+
+
+    def cached(self, name: str, key: Hashable, build: Callable[[], Any]) -> CachedResponse:
+        """
+        JSON response for `key`, rebuilt with `build` only when read model `name` changed
+        since it was cached. A build that returns None is cached as a 404.
+        """
+        version = self.current_version(name)
+        cache_key = (name, key)
+
+        with self.lock:
+            cached = self.responses.get(cache_key)
+            if cached is not None and cached.version == version:
+                self.hits += 1
+                return cached
+            self.misses += 1
+
+        payload = build()
+        status = 200 if payload is not None else 404
+        if payload is None:
+            payload = {"error": "Not found."}
+
+        body = json.dumps(payload, default=str, separators=(",", ":")).encode("utf-8")
+        response = CachedResponse(version, status, body, hashlib.sha256(body).hexdigest()[:32])
+
+        with self.lock:
+            self.responses[cache_key] = response
+        return response
+
+
+    @staticmethod
+    def latest_brief() -> Dict | None:
+        with session_scope() as session:
+            brief = session.execute(
+                select(ProcessedBriefs.id, ProcessedBriefs.created_at, ProcessedBriefs.curated_content)
+                .order_by(ProcessedBriefs.id.desc())
+                .limit(1)
+            ).first()
+
+            if brief is None:
+                return None
+            return {"id": brief.id, "created_at": brief.created_at, "content": brief.curated_content}
+
+
+    @staticmethod
+    def _aggregate(record: SubredditSentimentAggregate) -> Dict:
+        return {
+            "subreddit": record.subreddit,
+            "posts": record.posts,
+            "comments": record.comments,
+            "avg_compound": record.avg_compound,
+            "counts": {
+                "Positive": record.positive_comments,
+                "Negative": record.negative_comments,
+                "Neutral": record.neutral_comments,
+            },
+            "dominant_sentiments": record.dominant_sentiments,
+            "updated_at": record.updated_at,
+        }
+
+
+    def subreddit_aggregates(self, subreddit: str | None = None) -> Dict:
+        with session_scope() as session:
+            query = select(SubredditSentimentAggregate).order_by(SubredditSentimentAggregate.subreddit)
+            if subreddit is not None:
+                query = query.where(SubredditSentimentAggregate.subreddit == subreddit)
+            return {"subreddits": [self._aggregate(record) for record in session.scalars(query)]}
+
+
+    @staticmethod
+    def post_sentiments(subreddit: str | None, limit: int, after: int) -> Dict:
+        """
+        One keyset page of per-post sentiment, ordered by sentiment row ID.
+        Pass the returned `next_after` as `after` to get the next page.
+        """
+        with session_scope() as session:
+            query = (
+                select(Sentiment.id, Post.submission_id, Post.subreddit, Post.title, Sentiment.sentiment_results)
+                .join(Post, Post.submission_id == Sentiment.post_id)
+                .where(Sentiment.id > after)
+                .order_by(Sentiment.id)
+                .limit(limit)
+            )
+            if subreddit is not None:
+                query = query.where(Post.subreddit == subreddit)
+
+            records = session.execute(query).all()
+
+        posts = [
+            {
+                "submission_id": record.submission_id,
+                "subreddit": record.subreddit,
+                "title": record.title,
+                "sentiment": record.sentiment_results,
+            }
+            for record in records
+        ]
+        return {"posts": posts, "next_after": records[-1].id if len(records) == limit else None}
+
+
+    @staticmethod
+    def post_sentiment(submission_id: str) -> Dict | None:
+        with session_scope() as session:
+            record = session.execute(
+                select(Post.submission_id, Post.subreddit, Post.title, Sentiment.sentiment_results)
+                .join(Sentiment, Sentiment.post_id == Post.submission_id)
+                .where(Post.submission_id == submission_id)
+                .order_by(Sentiment.id)
+                .limit(1)
+            ).first()
+
+            if record is None:
+                return None
+            return {
+                "submission_id": record.submission_id,
+                "subreddit": record.subreddit,
+                "title": record.title,
+                "sentiment": record.sentiment_results,
+            }
+
+
+    def log_summary(self) -> None:
+        logger.info(f"Read API cache: {self.hits} hit(s), {self.misses} miss(es).")
@@ -1,6 +1,8 @@
 from services.scraper_service import ScraperService
 from services.storage_service import StorageService
-from typing import Dict, Any
+from services.scrape_state_service import ScrapeStateService
+from typing import Any, Dict, List
+from utils.instrumentation import instrumented
 from utils.logger import logger
 
 
@@ -8,11 +10,22 @@ class RedditService:
     def __init__(self):
         self.scraper = ScraperService()
         self.storage = StorageService()
-        
-        
+        self.scrape_state = ScrapeStateService()
+
+
+    def _load_scrape_state(self, subreddits: List[str] | None = None) -> None:
+        if not self.scraper.incremental:
+            return
+
+        logger.info("[PIPELINE] Loading incremental scrape state")
+        self.scraper.load_scrape_state(self.scrape_state.load_state(subreddits or self.scraper.subreddits))
+
+
+    @instrumented()
     def run_reddit_scraper(self) -> Dict[str, Any]:
 
         logger.info("=== Starting Reddit scraping pipeline ===")
+        self._load_scrape_state()
 
         logger.info("[PIPELINE] Step 1/3: Fetching posts")
         posts = self.scraper.fetch_reddit_posts()
@@ -44,13 +57,18 @@ class RedditService:
         }
     
     
+    @instrumented()
     def run_reddit_storage(self, reddit_data: Dict):
 
         logger.info("=== Starting Reddit storage pipeline ===")
 
         logger.info("[PIPELINE] Step 1/2: Storing posts")
         try:
-            self.storage.store_posts(reddit_data)
+            result = self.storage.store_posts(reddit_data)
+            if "error" in result:
+                self.scraper.pop_state_updates()
+                logger.warning("Posts were not stored. Scrape state left unchanged for a retry.")
+                return
 
         except Exception as e:
             logger.error(f"Unexpected error while storing posts: {e}", exc_info=True)
@@ -58,10 +76,61 @@ class RedditService:
 
         logger.info("[PIPELINE] Step 2/2: Storing comments")
         try:
-            self.storage.store_comments(reddit_data)
-            
+            result = self.storage.store_comments(reddit_data)
+            if "error" in result:
+                self.scraper.pop_state_updates()
+                logger.warning("Comments were not stored. Scrape state left unchanged for a retry.")
+                return
+
         except Exception as e:
             logger.error(f"Unexpected error while storing comments: {e}", exc_info=True)
+            return
+
+        self.scrape_state.record_state(self.scraper.pop_state_updates())
 
         logger.info("=== Reddit storage pipeline completed ===")
-    
\ No newline at end of file
+
+
+    @instrumented()
+    def run_reddit_stream(self, subreddits: List[str] | None = None) -> Dict[str, int]:
+        """
+        Scrape and store subreddit by subreddit (default: the configured ones) so memory
+        stays flat and finished work is committed even if a later fetch fails.
+        Posts are stored before their comments to satisfy the comments foreign key.
+        A failed post or comment store raises before the scrape state of that subreddit is
+        recorded, so its submissions are fetched again on the next run.
+        """
+        logger.info("=== Starting Reddit streaming ingest pipeline ===")
+        self._load_scrape_state(subreddits)
+
+        stored_posts = 0
+        stored_comments = 0
+
+        for posts in self.scraper.stream_reddit_posts(subreddits):
+            if not posts:
+                continue
+
+            subreddit = posts[0].subreddit
+            submission_ids = [post.submission_id for post in posts]
+
+            try:
+                logger.info(f"[PIPELINE] Storing {len(posts)} post(s) from r/{subreddit}")
+                stored_posts += self.storage.store_post_stream([posts])
+
+                logger.info(f"[PIPELINE] Streaming comments for {len(submission_ids)} post(s) from r/{subreddit}")
+                stored_comments += self.storage.store_comment_stream(
+                    self.scraper.stream_reddit_comments(submission_ids)
+                )
+
+            except Exception:
+                # Drop what was fetched so a later run does not record it as stored.
+                self.scraper.pop_state_updates(submission_ids)
+                raise
+
+            self.scrape_state.record_state(self.scraper.pop_state_updates(submission_ids))
+
+        logger.info(
+            f"=== Reddit streaming ingest pipeline completed: "
+            f"{stored_posts} post(s) and {stored_comments} comment(s) stored ==="
+        )
+        return {"posts_stored": stored_posts, "comments_stored": stored_comments}
@@ -0,0 +1,115 @@
+import hashlib
+import json
+from datetime import timedelta
+from typing import Any
+from sqlalchemy import func
+from config import settings
+from database.models import CuratorResponseCache
+from database.session import session_scope
+from utils.helpers import utc_now
+from utils.logger import logger
+
+
+class ResponseCacheService:
+    """
+    Content-addressed cache of curator responses keyed by model, prompt and tool payload,
+    with a TTL and eviction of least recently used entries past the size limits.
+    """
+
+    def __init__(self):
+        self.ttl = timedelta(seconds=settings.CURATOR_CACHE_TTL_SECONDS)
+        self.max_entries = settings.CURATOR_CACHE_MAX_ENTRIES
+        self.max_bytes = settings.CURATOR_CACHE_MAX_BYTES
+
+    @staticmethod
+    def make_key(model: str, prompt: str, payload: Any) -> str:
+        content = json.dumps({"model": model, "prompt": prompt, "payload": payload}, sort_keys=True, default=str)
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+
+    def get(self, cache_key: str) -> str | None:
+        """
+        Return the cached response for `cache_key`, or None on a miss or an expired entry.
+        """
+        try:
+            with session_scope() as session:
+                entry = session.query(CuratorResponseCache).filter(CuratorResponseCache.cache_key == cache_key).first()
+                if entry is None:
+                    logger.info("Curator response cache miss.")
+                    return None
+
+                now = utc_now()
+                if entry.created_at + self.ttl < now:
+                    logger.info("Curator response cache entry expired.")
+                    session.delete(entry)
+                    return None
+
+                entry.hit_count += 1
+                entry.last_accessed_at = now
+                hit_count, response = entry.hit_count, entry.response
+
+            logger.info(f"Curator response cache hit (served {hit_count} time(s)).")
+            return response
+
+        except Exception as e:
+            logger.error(f"Error reading the curator response cache: {e}", exc_info=True)
+            return None
+
+
+    def put(self, cache_key: str, model: str, response: str) -> None:
+        now = utc_now()
+
+        try:
+            with session_scope() as session:
+                entry = session.query(CuratorResponseCache).filter(CuratorResponseCache.cache_key == cache_key).first()
+                if entry is None:
+                    entry = CuratorResponseCache(cache_key=cache_key, hit_count=0)
+                    session.add(entry)
+
+                entry.model = model
+                entry.response = response
+                entry.size_bytes = len(response.encode("utf-8"))
+                entry.created_at = now
+                entry.last_accessed_at = now
+
+                self._evict(session, now)
+
+            logger.info("Curator response cached.")
+
+        except Exception as e:
+            logger.error(f"Error writing the curator response cache: {e}", exc_info=True)
+
+
+    def _evict(self, session, now) -> None:
+        """
+        Drop expired entries, then least recently used ones until both size limits hold.
+        """
+        session.flush()
+
+        expired = (
+            session.query(CuratorResponseCache)
+            .filter(CuratorResponseCache.created_at < now - self.ttl)
+            .delete(synchronize_session=False)
+        )
+
+        entries, total_bytes = session.query(
+            func.count(CuratorResponseCache.id), func.coalesce(func.sum(CuratorResponseCache.size_bytes), 0)
+        ).one()
+
+        evicted = 0
+        if entries > self.max_entries or total_bytes > self.max_bytes:
+            for entry_id, size_bytes in (
+                session.query(CuratorResponseCache.id, CuratorResponseCache.size_bytes)
+                .order_by(CuratorResponseCache.last_accessed_at, CuratorResponseCache.id)
+            ):
+                if entries <= self.max_entries and total_bytes <= self.max_bytes:
+                    break
+                session.query(CuratorResponseCache).filter(CuratorResponseCache.id == entry_id).delete(
+                    synchronize_session=False
+                )
+                entries -= 1
+                total_bytes -= size_bytes
+                evicted += 1
+
+        if expired or evicted:
+            logger.info(f"Evicted {expired} expired and {evicted} least recently used curator cache entries.")
@@ -0,0 +1,234 @@
+import heapq
+import queue
+import threading
+import time
+from typing import Dict, List, Tuple
+from config import settings
+from database.session import log_pool_metrics
+from services.reddit_service import RedditService
+from services.sentiment_service import SentimentService
+from utils.instrumentation import stage_span
+from utils.logger import logger
+
+_STOP = object()
+
+
+class SchedulerService:
+    """
+    Resident ingest -> sentiment -> curate pipeline. Each stage runs on its own thread and
+    keeps its clients, analyzer and DB pool warm between runs:
+
+    - ingest scrapes and stores one subreddit whenever its interval is due and hands the
+      batch to sentiment through a bounded queue, so it pauses when sentiment falls behind;
+    - sentiment scores every unprocessed post once per batch (queued batches are coalesced
+      into one pass) while ingest moves on to the next subreddit;
+    - curate rebuilds the brief after new sentiment, at most once per curate interval;
+    - export pushes the Notion outbox after every curate run and retries due entries every
+      NOTION_OUTBOX_RETRY_SECONDS, so Notion latency never delays curation.
+
+    Stage spans are logged as they close rather than collected into pipeline runs, since
+    the stages overlap.
+    """
+
+    def __init__(self):
+        self.intervals: Dict[str, int] = {
+            subreddit: settings.SCHEDULER_SUBREDDIT_INTERVALS.get(subreddit, settings.SCHEDULER_DEFAULT_INTERVAL_SECONDS)
+            for subreddit in settings.DEFAULT_SUBREDDITS
+        }
+        self.curate_interval = settings.SCHEDULER_CURATE_INTERVAL_SECONDS
+        self.reddit = RedditService()
+        self.sentiment = SentimentService()
+        self.curator = None
+        if settings.SCHEDULER_CURATE_ENABLED:
+            # Only load the Gemini SDK when curation is on.
+            from services.curator_service import CuratorService
+            self.curator = CuratorService()
+        self.notion_export = None
+        if self.curator and settings.NOTION_EXPORT_ENABLED:
+            from services.notion_export_service import NotionExportService
+            self.notion_export = NotionExportService()
+
+        self.sentiment_queue: queue.Queue = queue.Queue(maxsize=settings.SCHEDULER_QUEUE_SIZE)
+        self.curate_queue: queue.Queue = queue.Queue(maxsize=1)
+        self.export_queue: queue.Queue = queue.Queue(maxsize=1)
+        self.stop_event = threading.Event()
+        self.threads: List[threading.Thread] = []
+
+
+    def start(self) -> None:
+        stages = [("ingest", self._ingest_loop), ("sentiment", self._sentiment_loop)]
+        if self.curator:
+            stages.append(("curate", self._curate_loop))
+        if self.notion_export:
+            stages.append(("export", self._export_loop))
+
+        for name, target in stages:
+            thread = threading.Thread(target=target, name=f"scheduler-{name}", daemon=True)
+            thread.start()
+            self.threads.append(thread)
+
+        schedule = ", ".join(f"r/{subreddit} every {interval}s" for subreddit, interval in self.intervals.items())
+        logger.info(f"Scheduler started: {schedule}.")
+
+
+    def stop(self) -> None:
+        """
+        Let every stage finish its current run, then wait for the threads to exit.
+        """
+        logger.info("Stopping scheduler after the current runs...")
+        self.stop_event.set()
+        self._offer(self.sentiment_queue, _STOP)
+        self._offer(self.curate_queue, _STOP)
+        self._offer(self.export_queue, _STOP)
+
+        for thread in self.threads:
+            thread.join()
+        self.sentiment.close()
+        log_pool_metrics()
+        logger.info("Scheduler stopped.")
+
+
+    def run_forever(self) -> None:
+        self.start()
+        try:
+            while not self.stop_event.wait(1.0):
+                if not all(thread.is_alive() for thread in self.threads):
+                    logger.error("A scheduler stage exited unexpectedly.")
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+    @staticmethod
+    def _offer(target: queue.Queue, item) -> None:
+        try:
+            target.put_nowait(item)
+        except queue.Full:
+            pass
+
+
+    def _put(self, target: queue.Queue, item) -> bool:
+        """
+        Block until `target` has room (backpressure) or the scheduler stops.
+        """
+        while not self.stop_event.is_set():
+            try:
+                target.put(item, timeout=1.0)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+
+    def _drain(self, source: queue.Queue) -> Tuple[int, bool]:
+        """
+        Wait for the next item, then take whatever else is already queued.
+        Returns the number of items taken and whether a stop was requested.
+        """
+        taken = 0
+        while True:
+            try:
+                item = source.get(timeout=1.0)
+                break
+            except queue.Empty:
+                if self.stop_event.is_set():
+                    return taken, True
+
+        while True:
+            if item is _STOP:
+                return taken, True
+            taken += 1
+            try:
+                item = source.get_nowait()
+            except queue.Empty:
+                return taken, False
+
+
+    def _ingest_loop(self) -> None:
+        due: List[Tuple[float, str]] = [(time.monotonic(), subreddit) for subreddit in self.intervals]
+        heapq.heapify(due)
+
+        while not self.stop_event.is_set():
+            due_at, subreddit = due[0]
+            if self.stop_event.wait(max(0.0, due_at - time.monotonic())):
+                break
+
+            heapq.heapreplace(due, (time.monotonic() + self.intervals[subreddit], subreddit))
+
+            try:
+                with stage_span(f"scheduler.ingest r/{subreddit}"):
+                    stored = self.reddit.run_reddit_stream([subreddit])
+
+            except Exception as e:
+                logger.error(f"Scheduled ingest of r/{subreddit} failed: {e}", exc_info=True)
+                continue
+
+            if stored["posts_stored"] or stored["comments_stored"]:
+                self._put(self.sentiment_queue, subreddit)
+            else:
+                logger.info(f"No new posts or comments in r/{subreddit}. Sentiment not scheduled.")
+
+
+    def _sentiment_loop(self) -> None:
+        while True:
+            batches, stopping = self._drain(self.sentiment_queue)
+
+            if batches:
+                try:
+                    with stage_span("scheduler.sentiment"):
+                        processed = self.sentiment.process_posts_in_pages()
+                    log_pool_metrics()
+
+                    if processed:
+                        self._offer(self.curate_queue, processed)
+
+                except Exception as e:
+                    logger.error(f"Scheduled sentiment run failed: {e}", exc_info=True)
+
+            if stopping:
+                return
+
+
+    def _curate_loop(self) -> None:
+        last_run = None
+
+        while True:
+            _, stopping = self._drain(self.curate_queue)
+            if stopping:
+                return
+
+            if last_run is not None:
+                if self.stop_event.wait(max(0.0, last_run + self.curate_interval - time.monotonic())):
+                    return
+
+            last_run = time.monotonic()
+            try:
+                with stage_span("scheduler.curate"):
+                    self.curator.reset()
+                    self.curator.execute_curator_agent()
+                    self.curator.store_curator_response()
+                self._offer(self.export_queue, last_run)
+
+            # The curator raises SystemExit on unexpected errors; the daemon outlives one bad run.
+            except (Exception, SystemExit) as e:
+                logger.error(f"Scheduled curator run failed: {e}", exc_info=True)
+
+
+    def _export_loop(self) -> None:
+        while True:
+            try:
+                item = self.export_queue.get(timeout=settings.NOTION_OUTBOX_RETRY_SECONDS)
+            except queue.Empty:
+                item = None
+
+            if item is _STOP or self.stop_event.is_set():
+                return
+
+            try:
+                with stage_span("scheduler.notion_export"):
+                    self.notion_export.export_pending()
+
+            except Exception as e:
+                logger.error(f"Scheduled Notion export failed: {e}", exc_info=True)
@@ -0,0 +1,120 @@
+import hashlib
+from typing import Dict, List
+from cachetools import LRUCache
+from database.bulk_writer import bulk_upsert
+from database.models import CommentScoreCache
+from database.session import session_scope
+from utils.helpers import chunked
+from utils.logger import logger
+
+
+def normalize_comment_text(text: str | None) -> str:
+    """
+    Collapse whitespace runs. VADER tokenizes on whitespace, so this never changes a score.
+    """
+    return " ".join((text or "").split())
+
+
+def lexicon_version(lexicon: Dict[str, float]) -> str:
+    """
+    Short fingerprint of a VADER lexicon, so cached scores are dropped when the lexicon changes.
+    """
+    digest = hashlib.sha256()
+    for word, measure in sorted(lexicon.items()):
+        digest.update(f"{word}\t{measure!r}\n".encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+class SentimentScoreCache:
+    """
+    Two-level cache of compound scores keyed by normalized comment text and lexicon version:
+    an in-memory LRU in front of the comment_score_cache table.
+    """
+
+    def __init__(self, version: str, memory_size: int):
+        self.version = version
+        self.memory = LRUCache(maxsize=memory_size)
+        # Totals over the lifetime of the cache; score() logs the counts of each call.
+        self.memory_hits = 0
+        self.stored_hits = 0
+        self.misses = 0
+        self.duplicates = 0  # Repeats of a text earlier in the same call; not cache hits
+
+    def cache_key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.version}\x00{normalize_comment_text(text)}".encode("utf-8")).hexdigest()
+
+    def _load_stored(self, keys: List[str]) -> Dict[str, float]:
+        stored: Dict[str, float] = {}
+
+        try:
+            with session_scope() as session:
+                for key_chunk in chunked(keys, 500):
+                    for cache_key, compound in (
+                        session.query(CommentScoreCache.cache_key, CommentScoreCache.compound)
+                        .filter(CommentScoreCache.cache_key.in_(key_chunk))
+                    ):
+                        stored[cache_key] = compound
+
+        except Exception as e:
+            logger.error(f"Error reading the sentiment score cache: {e}", exc_info=True)
+
+        return stored
+
+    def _store(self, scores: Dict[str, float]) -> None:
+        rows = [
+            {"cache_key": cache_key, "lexicon_version": self.version, "compound": compound}
+            for cache_key, compound in scores.items()
+        ]
+
+        try:
+            with session_scope() as session:
+                for chunk in chunked(rows, 500):
+                    bulk_upsert(session, CommentScoreCache, chunk, conflict_columns=["cache_key"])
+
+        except Exception as e:
+            logger.error(f"Error writing the sentiment score cache: {e}", exc_info=True)
+
+
+    def score(self, texts: List[str], scorer) -> List[float]:
+        """
+        Return the compound score of every text, in input order.
+        Only texts missing from both cache levels are passed to `scorer`, once per distinct key.
+        """
+        keys = [self.cache_key(text) for text in texts]
+        scores: Dict[str, float] = {}
+        unresolved: Dict[str, str] = {}
+        memory_hits = 0
+        duplicates = 0
+
+        for key, text in zip(keys, texts):
+            if key in scores or key in unresolved:
+                duplicates += 1
+                continue
+            if key in self.memory:
+                scores[key] = self.memory[key]
+                memory_hits += 1
+            else:
+                unresolved[key] = text
+
+        stored = self._load_stored(list(unresolved.keys())) if unresolved else {}
+        scores.update(stored)
+
+        missing = {key: text for key, text in unresolved.items() if key not in stored}
+
+        if missing:
+            fresh = dict(zip(missing.keys(), scorer.score(list(missing.values()))))
+            self._store(fresh)
+            scores.update(fresh)
+
+        for key in unresolved:
+            self.memory[key] = scores[key]
+
+        self.memory_hits += memory_hits
+        self.stored_hits += len(stored)
+        self.misses += len(missing)
+        self.duplicates += duplicates
+        logger.info(
+            f"Score cache: {memory_hits} memory hit(s), {len(stored)} stored hit(s), "
+            f"{len(missing)} miss(es) and {duplicates} repeated text(s) across {len(texts)} comment(s)."
+        )
+        return [scores[key] for key in keys]
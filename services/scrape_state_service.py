@@ -0,0 +1,71 @@
+from typing import Dict, List
+from database.models import ScrapeState
+from database.session import session_scope
+from utils.helpers import utc_now
+from utils.instrumentation import instrumented
+from utils.logger import logger
+
+
+class ScrapeStateService:
+    @instrumented(rows_out=len)
+    def load_state(self, subreddits: List[str]) -> Dict[str, Dict]:
+        """
+        Return the last recorded state of every submission seen in `subreddits`,
+        keyed by submission_id.
+        """
+        try:
+            with session_scope() as session:
+                records = (
+                    session.query(ScrapeState.submission_id, ScrapeState.num_comments, ScrapeState.last_comment_utc)
+                    .filter(ScrapeState.subreddit.in_(subreddits))
+                    .all()
+                )
+
+                state = {
+                    submission_id: {"num_comments": num_comments, "last_comment_utc": last_comment_utc}
+                    for submission_id, num_comments, last_comment_utc in records
+                }
+                logger.info(f"Loaded scrape state for {len(state)} submission(s).")
+                return state
+
+        except Exception as e:
+            logger.error(f"Error loading scrape state: {e}", exc_info=True)
+            return {}
+
+
+    @instrumented(rows_out=int)
+    def record_state(self, updates: Dict[str, Dict]) -> int:
+        """
+        Upsert the comment count and newest comment timestamp of each scraped submission.
+        Returns the number of submissions recorded.
+        """
+        if not updates:
+            return 0
+
+        seen_at = utc_now()
+
+        try:
+            with session_scope() as session:
+                existing = {
+                    record.submission_id: record
+                    for record in session.query(ScrapeState)
+                    .filter(ScrapeState.submission_id.in_(list(updates.keys())))
+                    .all()
+                }
+
+                for submission_id, update in updates.items():
+                    record = existing.get(submission_id)
+                    if record is None:
+                        record = ScrapeState(submission_id=submission_id, subreddit=update["subreddit"])
+                        session.add(record)
+
+                    record.num_comments = update["num_comments"]
+                    record.last_comment_utc = max(record.last_comment_utc or 0.0, update["last_comment_utc"])
+                    record.last_seen_at = seen_at
+
+            logger.info(f"Recorded scrape state for {len(updates)} submission(s).")
+            return len(updates)
+
+        except Exception as e:
+            logger.error(f"Error recording scrape state: {e}", exc_info=True)
+            return 0
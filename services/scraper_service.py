@@ -1,61 +1,210 @@
-from typing import Dict, List, Any
+import math
+import queue
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Tuple
 from config import settings
+from utils.instrumentation import current_span, instrumented, record_api_calls
 from utils.logger import logger
-from clients.reddit_client import get_reddit_client
+from utils.records import CommentRecord, PostRecord
+from clients.reddit_client import create_worker_reddit_client, get_reddit_client, get_reddit_rate_limiter
 
 
 class ScraperService:
     def __init__(self):
 
         self.reddit = get_reddit_client()
+        # Clients not in use by a fetch. Every concurrent fetch checks one out, so no two
+        # threads share a PRAW instance; the pool grows to the number of workers and is reused.
+        self.idle_clients: queue.SimpleQueue = queue.SimpleQueue()
+        if self.reddit:
+            self.idle_clients.put(self.reddit)
+        self.rate_limiter = get_reddit_rate_limiter()
+        self.max_workers = settings.SCRAPER_MAX_WORKERS
+        self.comment_workers = settings.COMMENT_FETCH_WORKERS
         self.subreddits = settings.DEFAULT_SUBREDDITS
         self.post_limit = settings.DEFAULT_POST_LIMIT
         self.comment_limit = settings.DEFAULT_COMMENT_LIMIT
         self.min_comments =  settings.MIN_COMMENTS
         self.min_score = settings.MIN_SCORE
         self.min_upvote_ratio = settings.MIN_UPVOTE_RATIO
+        self.incremental = settings.INCREMENTAL_SCRAPING
+        self.scrape_state: Dict[str, Dict] = {}
+        self.state_updates: Dict[str, Dict] = {}
         self.posts = []
         self.submission_ids = []
         self.comments = []
 
-    def fetch_reddit_posts(self) -> List[Dict[str, Any]]:
+    def load_scrape_state(self, scrape_state: Dict[str, Dict]) -> None:
+        """
+        Provide the previously recorded per-submission state used to skip unchanged submissions.
+        """
+        self.scrape_state = scrape_state or {}
 
-        if not self.reddit:
-            logger.warning("Reddit client not found. Reconnecting...")
-            self.reddit = get_reddit_client()
+    def pop_state_updates(self, submission_ids: List[str] | None = None) -> Dict[str, Dict]:
+        """
+        Return and clear the state collected while fetching comments,
+        optionally limited to `submission_ids`.
+        """
+        if submission_ids is None:
+            updates, self.state_updates = self.state_updates, {}
+            return updates
 
-        posts: List[Dict[str, Any]] = []
+        return {
+            submission_id: self.state_updates.pop(submission_id)
+            for submission_id in submission_ids
+            if submission_id in self.state_updates
+        }
 
-        for subreddit_name in self.subreddits:
-            logger.info(f"Fetching posts from r/{subreddit_name} (limit={self.post_limit})...")
-            try:
-                subreddit_posts = list(self.reddit.subreddit(subreddit_name).hot(limit=self.post_limit))
-                logger.info(f"Retrieved {len(subreddit_posts)} posts from r/{subreddit_name}.")
+    @contextmanager
+    def _reddit_client(self) -> Iterator[Any]:
+        """
+        Check out a Reddit client for exclusive use by the calling thread.
+        """
+        try:
+            client = self.idle_clients.get_nowait()
+        except queue.Empty:
+            client = create_worker_reddit_client()
+
+        try:
+            yield client
+        finally:
+            if client is not None:
+                self.idle_clients.put(client)
+
+    def _is_unchanged(self, submission) -> bool:
+        previous = self.scrape_state.get(submission.id)
+        return bool(previous) and previous["num_comments"] == submission.num_comments
+
+    def _listing_pages(self) -> int:
+        return max(1, math.ceil(self.post_limit / settings.REDDIT_LISTING_PAGE_SIZE))
 
-                for submission in subreddit_posts:
+    def _fetch_subreddit_posts(self, subreddit_name: str) -> Tuple[List[PostRecord], int, int]:
+        """
+        Fetch and filter the hot listing of a single subreddit.
+        Draws one token per listing page from the shared Reddit rate limiter.
+        Returns the qualifying posts, the number of posts retrieved and the number of
+        listing requests of a successful fetch (0 when it failed).
+        """
+        logger.info(f"Fetching posts from r/{subreddit_name} (limit={self.post_limit})...")
+        started_at = time.perf_counter()
+
+        pages = self._listing_pages()
+        waited = self.rate_limiter.acquire(pages)
+
+        posts: List[PostRecord] = []
+        retrieved = 0
+        unchanged = 0
+        api_calls = 0
+
+        try:
+            with self._reddit_client() as reddit:
+                for submission in reddit.subreddit(subreddit_name).hot(limit=self.post_limit):
+                    retrieved += 1
                     if (
                         submission.upvote_ratio >= self.min_upvote_ratio
                         and submission.score >= self.min_score
                         and submission.num_comments >= self.min_comments
                         and not submission.stickied
                     ):
-                        post_data: Dict[str, Any] = {
-                            "subreddit": subreddit_name,
-                            "submission_id": submission.id,
-                            "title": submission.title,
-                            "body": submission.selftext,
-                            "upvote_ratio": submission.upvote_ratio,
-                            "score": submission.score,
-                            "number_of_comments": submission.num_comments,
-                            "post_url": submission.url
-                        }
-                        posts.append(post_data)
+                        if self.incremental and self._is_unchanged(submission):
+                            unchanged += 1
+                            continue
+
+                        posts.append(PostRecord(
+                            subreddit=subreddit_name,
+                            submission_id=submission.id,
+                            title=submission.title,
+                            body=submission.selftext,
+                            upvote_ratio=submission.upvote_ratio,
+                            score=submission.score,
+                            number_of_comments=submission.num_comments,
+                            post_url=submission.url,
+                        ))
+            api_calls = pages
+
+        except Exception as e:
+            logger.error(f"Error fetching posts from r/{subreddit_name}: {e}", exc_info=True)
+
+        elapsed = time.perf_counter() - started_at
+        logger.info(
+            f"Retrieved {retrieved} posts from r/{subreddit_name}, {len(posts)} qualified with new activity, "
+            f"{unchanged} qualified but unchanged, in {elapsed:.2f}s (rate limit wait {waited:.2f}s)."
+        )
+        return posts, retrieved, api_calls
+
+
+    def _map_bounded(self, fn: Callable[[Any], Any], items: List[Any], workers: int, name: str) -> Iterator[Any]:
+        """
+        Apply `fn` to every item on a thread pool and yield results in input order.
+        At most `workers * 2` calls are in flight, so results never pile up in memory
+        faster than the caller consumes them. Runs inline when concurrency is disabled.
+        """
+        if not settings.CONCURRENT_FETCH or workers <= 1 or len(items) <= 1:
+            for item in items:
+                yield fn(item)
+            return
+
+        workers = min(workers, len(items))
+        logger.info(f"Processing {len(items)} {name} with {workers} worker(s).")
+
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix=f"reddit-{name}") as executor:
+            pending = deque()
+            for item in items:
+                pending.append(executor.submit(fn, item))
+                if len(pending) >= workers * 2:
+                    yield pending.popleft().result()
+
+            while pending:
+                yield pending.popleft().result()
+
+
+    def _fetch_posts_by_subreddit(self, subreddits: List[str] | None) -> Iterator[Tuple[List[PostRecord], int]]:
+        """
+        Yield the posts and retrieved count of each subreddit as soon as it is fetched.
+        Workers have no span of their own, so API calls are recorded here, on the consuming
+        thread, against the stage that drives the fetch.
+        """
+        if not self.reddit:
+            logger.warning("Reddit client not found. Reconnecting...")
+            self.reddit = get_reddit_client()
+            if self.reddit:
+                self.idle_clients.put(self.reddit)
+
+        for posts, retrieved, api_calls in self._map_bounded(
+            self._fetch_subreddit_posts, subreddits or self.subreddits, self.max_workers, "subreddits"
+        ):
+            if api_calls:
+                record_api_calls("reddit", api_calls)
+            yield posts, retrieved
+
+
+    def stream_reddit_posts(self, subreddits: List[str] | None = None) -> Iterator[List[PostRecord]]:
+        """
+        Yield the qualifying posts of each subreddit (default: the configured ones)
+        as soon as its listing is fetched.
+        """
+        for posts, _ in self._fetch_posts_by_subreddit(subreddits):
+            yield posts
 
-            except Exception as e:
-                logger.error(f"Error fetching posts from r/{subreddit_name}: {e}", exc_info=True)
+
+    @instrumented(rows_out=len)
+    def fetch_reddit_posts(self) -> List[PostRecord]:
+
+        posts: List[PostRecord] = []
+        started_at = time.perf_counter()
+
+        for subreddit_posts, retrieved in self._fetch_posts_by_subreddit(None):
+            posts.extend(subreddit_posts)
+            current_span().add_rows_in(retrieved)
 
         self.posts = posts
-        logger.info(f"Completed fetching posts. Total collected: {len(posts)}")
+        logger.info(
+            f"Completed fetching posts. Total collected: {len(posts)} "
+            f"in {time.perf_counter() - started_at:.2f}s"
+        )
         return posts
     
 
@@ -65,53 +214,134 @@ class ScraperService:
             logger.warning("No posts available. Running fetch_reddit_posts() first...")
             self.fetch_reddit_posts()
 
-        submission_ids: List[str] = []
-
-        for post in self.posts:
-            if "submission_id" in post:
-                submission_id = post["submission_id"]
-                submission_ids.append(submission_id)
+        submission_ids: List[str] = [post.submission_id for post in self.posts]
 
         self.submission_ids = submission_ids
         logger.info(f"Extracted {len(submission_ids)} submission IDs.")
         return submission_ids
     
 
-    def fetch_reddit_comments(self) -> List[Dict[str, Any]]:
+    def _sync_rate_limit(self, reddit) -> None:
+        """
+        Feed the quota headers PRAW tracks for `reddit` back into the shared token bucket.
+        """
+        try:
+            limits = reddit.auth.limits
+        except Exception:
+            return
 
-        if not self.submission_ids:
-            logger.warning("No submission IDs available. Running fetch_post_ids()...")
-            self.fetch_post_ids()
+        remaining = limits.get("remaining")
+        reset_timestamp = limits.get("reset_timestamp")
+        reset_in = reset_timestamp - time.time() if reset_timestamp else None
+        self.rate_limiter.apply_quota(remaining, reset_in)
 
-        comments_collected: List[Dict[str, Any]] = []
-        logger.info(f"Fetching comments from {len(self.submission_ids)} submissions...")
 
-        for submission_id in self.submission_ids:
+    def _fetch_submission_comments(self, submission_id: str) -> Tuple[List[CommentRecord], int, int]:
+        """
+        Fetch the flattened comment tree of a single submission.
+        Errors are logged and isolated to this submission.
+        Returns the collected comments, the number of comments retrieved and the number of
+        requests of a successful fetch (0 when it failed).
+        """
+        comments_collected: List[CommentRecord] = []
+        retrieved = 0
+        api_calls = 0
+        self.rate_limiter.acquire()
+
+        with self._reddit_client() as reddit:
             try:
-                submission = self.reddit.submission(id=submission_id)
+                submission = reddit.submission(id=submission_id)
                 submission.comments.replace_more(limit=0)
 
                 comments = submission.comments.list()
-                if self.comment_limit:
+                retrieved = len(comments)
+                watermark = self.scrape_state.get(submission_id, {}).get("last_comment_utc", 0.0)
+                newest_comment_utc = watermark
+
+                if self.incremental and watermark:
+                    comments = [comment for comment in comments if comment.created_utc > watermark]
+
+                truncated = bool(self.comment_limit) and len(comments) > self.comment_limit
+                if truncated:
+                    if self.incremental:
+                        # Keep the oldest new comments so the watermark only passes what was stored;
+                        # the newer ones are fetched on the next run.
+                        comments = sorted(comments, key=lambda comment: comment.created_utc or 0.0)
                     comments = comments[:self.comment_limit]
 
                 for comment in comments:
                     if not comment.body or comment.body in ("[deleted]", "[removed]"):
                         continue
 
-                    comment_data: Dict[str, Any] = {
-                        "submission_id": submission.id,
-                        "title": submission.title,
-                        "subreddit": submission.subreddit.display_name,
-                        "author": str(comment.author) if comment.author else "Unknown",
-                        "body": comment.body,
-                        "score": comment.score
-                    }
-                    comments_collected.append(comment_data)
+                    comments_collected.append(CommentRecord(
+                        comment_id=comment.id,
+                        submission_id=submission.id,
+                        title=submission.title,
+                        subreddit=submission.subreddit.display_name,
+                        author=str(comment.author) if comment.author else "Unknown",
+                        body=comment.body,
+                        score=comment.score,
+                    ))
+                    newest_comment_utc = max(newest_comment_utc, comment.created_utc or 0.0)
+
+                # A truncated fetch keeps the previous comment count, so the submission is not
+                # seen as unchanged next run and the comments beyond the limit are fetched then.
+                previous_count = self.scrape_state.get(submission_id, {}).get("num_comments", 0)
+                self.state_updates[submission_id] = {
+                    "subreddit": submission.subreddit.display_name,
+                    "num_comments": previous_count if truncated else submission.num_comments,
+                    "last_comment_utc": newest_comment_utc,
+                }
+                api_calls = 1
 
             except Exception as e:
                 logger.error(f"Error fetching comments for submission {submission_id}: {e}", exc_info=True)
 
+            finally:
+                self._sync_rate_limit(reddit)
+
+        return comments_collected, retrieved, api_calls
+
+
+    def _fetch_comments_by_submission(self, submission_ids: List[str]) -> Iterator[Tuple[List[CommentRecord], int]]:
+        """
+        Yield the comments and retrieved count of each submission, in input order,
+        recording the API calls on the consuming thread.
+        """
+        for comments, retrieved, api_calls in self._map_bounded(
+            self._fetch_submission_comments, submission_ids, self.comment_workers, "submissions"
+        ):
+            if api_calls:
+                record_api_calls("reddit", api_calls)
+            yield comments, retrieved
+
+
+    def stream_reddit_comments(self, submission_ids: List[str]) -> Iterator[List[CommentRecord]]:
+        """
+        Yield the comments of each submission as a batch, in the order of `submission_ids`.
+        """
+        for comments, _ in self._fetch_comments_by_submission(submission_ids):
+            yield comments
+
+
+    @instrumented(rows_out=len)
+    def fetch_reddit_comments(self) -> List[CommentRecord]:
+
+        if not self.submission_ids:
+            logger.warning("No submission IDs available. Running fetch_post_ids()...")
+            self.fetch_post_ids()
+
+        comments_collected: List[CommentRecord] = []
+        started_at = time.perf_counter()
+        logger.info(f"Fetching comments from {len(self.submission_ids)} submissions...")
+
+        for submission_comments, retrieved in self._fetch_comments_by_submission(self.submission_ids):
+            comments_collected.extend(submission_comments)
+            current_span().add_rows_in(retrieved)
+
         self.comments = comments_collected
-        logger.info(f"Completed. Total comments collected: {len(comments_collected)}")
+        logger.info(
+            f"Completed. Total comments collected: {len(comments_collected)} "
+            f"in {time.perf_counter() - started_at:.2f}s"
+        )
         return comments_collected
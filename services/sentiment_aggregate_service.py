@@ -0,0 +1,114 @@
+from typing import Dict, List
+from sqlalchemy import select
+from config import settings
+from database.bulk_writer import bulk_upsert
+from database.models import Post, Sentiment, SubredditSentimentAggregate
+from database.session import session_scope
+from services.read_model_service import bump_version
+from services.sentiment_columns import LABELS
+from utils.helpers import chunked, utc_now
+from utils.instrumentation import instrumented
+from utils.logger import logger
+
+
+class SentimentAggregateService:
+    """
+    Maintains subreddit_sentiment_aggregates, the per-subreddit rollup of the post sentiment
+    summaries that the read API serves without scanning the sentiments table.
+    """
+
+    @staticmethod
+    def _empty_aggregate(subreddit: str) -> Dict:
+        return {
+            "subreddit": subreddit,
+            "posts": 0,
+            "comments": 0,
+            "compound_total": 0.0,
+            "label_counts": dict.fromkeys(LABELS, 0),
+            "dominant_sentiments": {},
+        }
+
+
+    def compute(self, session, subreddits: List[str]) -> List[Dict]:
+        """
+        Roll up every stored post summary of `subreddits` into one aggregate row per subreddit.
+        """
+        aggregates: Dict[str, Dict] = {}
+
+        for subreddit_chunk in chunked(subreddits, 500):
+            records = session.execute(
+                select(Post.subreddit, Sentiment.sentiment_results)
+                .join(Sentiment, Sentiment.post_id == Post.submission_id)
+                .where(Post.subreddit.in_(subreddit_chunk))
+                .execution_options(yield_per=settings.DB_READ_PAGE_SIZE)
+            )
+
+            for subreddit, summary in records:
+                aggregate = aggregates.setdefault(subreddit, self._empty_aggregate(subreddit))
+                counts = summary.get("counts", {})
+                comments = sum(counts.values())
+
+                aggregate["posts"] += 1
+                aggregate["comments"] += comments
+                aggregate["compound_total"] += summary.get("avg_compound", 0.0) * comments
+                for label, count in counts.items():
+                    aggregate["label_counts"][label] = aggregate["label_counts"].get(label, 0) + count
+
+                dominant = summary.get("dominant_sentiment")
+                if dominant:
+                    aggregate["dominant_sentiments"][dominant] = aggregate["dominant_sentiments"].get(dominant, 0) + 1
+
+        updated_at = utc_now()
+        return [
+            {
+                "subreddit": aggregate["subreddit"],
+                "posts": aggregate["posts"],
+                "comments": aggregate["comments"],
+                "avg_compound": aggregate["compound_total"] / aggregate["comments"] if aggregate["comments"] else 0.0,
+                "positive_comments": aggregate["label_counts"]["Positive"],
+                "negative_comments": aggregate["label_counts"]["Negative"],
+                "neutral_comments": aggregate["label_counts"]["Neutral"],
+                "dominant_sentiments": aggregate["dominant_sentiments"],
+                "updated_at": updated_at,
+            }
+            for aggregate in aggregates.values()
+        ]
+
+
+    @instrumented(rows_out=int)
+    def refresh(self, subreddits: List[str] | None = None) -> int:
+        """
+        Recompute the aggregates of `subreddits` (every subreddit with posts when None) and
+        bump the "sentiment" read model version in the same transaction.
+        Returns the number of aggregates written.
+        """
+        try:
+            with session_scope() as session:
+                if subreddits is None:
+                    subreddits = list(session.scalars(select(Post.subreddit).distinct()))
+
+                rows = self.compute(session, sorted(subreddits))
+                for chunk in chunked(rows, 500):
+                    bulk_upsert(
+                        session,
+                        SubredditSentimentAggregate,
+                        chunk,
+                        conflict_columns=["subreddit"],
+                        update_columns=[
+                            "posts", "comments", "avg_compound", "positive_comments", "negative_comments",
+                            "neutral_comments", "dominant_sentiments", "updated_at",
+                        ],
+                    )
+                bump_version(session, "sentiment")
+
+            logger.info(f"Refreshed sentiment aggregates of {len(rows)} subreddit(s).")
+            return len(rows)
+
+        except Exception as e:
+            logger.error(f"Error refreshing sentiment aggregates: {e}", exc_info=True)
+            return 0
+
+
+if __name__ == "__main__":
+    settings.load_settings()
+    SentimentAggregateService().refresh()
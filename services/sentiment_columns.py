@@ -0,0 +1,104 @@
+from typing import Dict, List, Sequence
+import numpy as np
+
+# Label codes used in the columnar arrays, in the order of the label_codes() encoding.
+LABELS = ("Positive", "Negative", "Neutral")
+LABEL_THRESHOLD = 0.05
+
+
+class SentimentColumns:
+    """
+    Per-comment compound scores for a batch of posts, stored column-wise:
+    one flat compound array plus offsets where post i owns compounds[offsets[i]:offsets[i + 1]].
+    """
+
+    def __init__(self, post_keys: List[str], offsets: np.ndarray, compounds: np.ndarray):
+        self.post_keys = post_keys
+        self.offsets = offsets
+        self.compounds = compounds
+
+    @classmethod
+    def from_scores(cls, post_keys: List[str], comment_counts: Sequence[int], compounds: Sequence[float]):
+        offsets = np.zeros(len(post_keys) + 1, dtype=np.int64)
+        np.cumsum(np.asarray(comment_counts, dtype=np.int64), out=offsets[1:])
+        return cls(post_keys, offsets, np.asarray(compounds, dtype=np.float64))
+
+    def __len__(self) -> int:
+        return len(self.post_keys)
+
+    def label_codes(self) -> np.ndarray:
+        return np.where(
+            self.compounds > LABEL_THRESHOLD, 0, np.where(self.compounds < -LABEL_THRESHOLD, 1, 2)
+        ).astype(np.int8)
+
+    def summarize(self, extended: bool = False, percentiles: Sequence[float] = (25, 50, 75)) -> List[Dict]:
+        """
+        Summarize every post with comments using grouped reductions over the whole batch.
+        The dominant label breaks ties by first appearance, like Counter.most_common.
+        With `extended`, the population stddev and linear-interpolated percentiles of the
+        compound score are included.
+        """
+        lengths = np.diff(self.offsets)
+        scored = np.flatnonzero(lengths)
+        if scored.size == 0:
+            return []
+
+        total = self.compounds.size
+        post_index = np.repeat(np.arange(len(self.post_keys)), lengths)
+        codes = self.label_codes()
+
+        group_keys = post_index * len(LABELS) + codes
+        label_counts = np.bincount(group_keys, minlength=len(self.post_keys) * len(LABELS))
+        label_counts = label_counts.reshape(-1, len(LABELS))
+
+        first_seen = np.full(len(self.post_keys) * len(LABELS), total, dtype=np.int64)
+        unique_keys, first_positions = np.unique(group_keys, return_index=True)
+        first_seen[unique_keys] = first_positions
+        first_seen = first_seen.reshape(-1, len(LABELS))
+
+        # Highest count wins; among equal counts the label seen first wins.
+        ranking = label_counts * (total + 1) + (total - first_seen)
+        dominant = np.argmax(ranking, axis=1)
+        appearance_order = np.argsort(first_seen, axis=1, kind="stable")
+
+        starts = self.offsets[:-1][scored]
+        scored_lengths = lengths[scored]
+        means = np.add.reduceat(self.compounds, starts) / scored_lengths
+
+        if extended:
+            deviations = self.compounds - np.repeat(means, scored_lengths)
+            stddevs = np.sqrt(np.add.reduceat(deviations * deviations, starts) / scored_lengths)
+
+            sorted_compounds = self.compounds[np.lexsort((self.compounds, post_index))]
+            percentile_values = {}
+            for percentile in percentiles:
+                position = starts + (percentile / 100.0) * (scored_lengths - 1)
+                lower = np.floor(position).astype(np.int64)
+                upper = np.ceil(position).astype(np.int64)
+                weight = position - lower
+                percentile_values[f"p{percentile:g}"] = (
+                    sorted_compounds[lower] * (1 - weight) + sorted_compounds[upper] * weight
+                )
+
+        summaries = []
+        for row, post in enumerate(scored):
+            counts = {
+                LABELS[code]: int(label_counts[post, code])
+                for code in appearance_order[post]
+                if label_counts[post, code]
+            }
+            sentiment_summary = {
+                "dominant_sentiment": LABELS[dominant[post]],
+                "avg_compound": float(means[row]),
+                "counts": counts,
+            }
+
+            if extended:
+                sentiment_summary["compound_stddev"] = float(stddevs[row])
+                sentiment_summary["compound_percentiles"] = {
+                    name: float(values[row]) for name, values in percentile_values.items()
+                }
+
+            summaries.append({"post_key": self.post_keys[post], "sentiment_summary": sentiment_summary})
+
+        return summaries
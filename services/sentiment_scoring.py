@@ -0,0 +1,80 @@
+import atexit
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List
+from nltk.sentiment import SentimentIntensityAnalyzer
+from services.vader_snapshot import analyzer_from_lexicon
+from utils.helpers import chunked
+from utils.logger import logger
+
+# Each worker process builds its analyzer once, in the pool initializer, from the parent's
+# already parsed lexicon rather than from vader_lexicon.zip.
+_worker_analyzer: SentimentIntensityAnalyzer | None = None
+
+
+def _init_worker(lexicon: Dict[str, float]) -> None:
+    global _worker_analyzer
+    _worker_analyzer = analyzer_from_lexicon(lexicon)
+
+
+def _score_chunk(texts: List[str]) -> List[float]:
+    return [_worker_analyzer.polarity_scores(text)["compound"] for text in texts]
+
+
+class SentimentScorer:
+    """
+    Compute VADER compound scores either in-process or on a pool of worker processes.
+    Both paths call the same polarity_scores(), so results are identical.
+    The pool is started on the first parallel call and reused by every later one (pages,
+    scheduler cycles) until close(), so workers are spawned and sent the lexicon only once.
+    """
+
+    def __init__(self, analyzer: SentimentIntensityAnalyzer, workers: int, chunk_size: int, parallel_threshold: int):
+        self.analyzer = analyzer
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.parallel_threshold = parallel_threshold
+        self.executor: ProcessPoolExecutor | None = None
+        self.lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                logger.info(f"Starting {self.workers} sentiment worker process(es).")
+                self.executor = ProcessPoolExecutor(
+                    max_workers=self.workers, initializer=_init_worker, initargs=(self.analyzer.lexicon,)
+                )
+                atexit.register(self.close)
+            return self.executor
+
+    def close(self) -> None:
+        """
+        Shut the worker pool down. A later parallel call starts a new one.
+        """
+        with self.lock:
+            executor, self.executor = self.executor, None
+        if executor is not None:
+            executor.shutdown()
+            atexit.unregister(self.close)
+
+    def score(self, texts: List[str]) -> List[float]:
+        """
+        Return the compound score of every text, in input order.
+        """
+        if self.workers <= 1 or len(texts) < self.parallel_threshold:
+            return [self.analyzer.polarity_scores(text)["compound"] for text in texts]
+
+        logger.info(f"Scoring {len(texts)} comment(s) on {self.workers} worker process(es).")
+
+        compounds: List[float] = []
+        try:
+            for chunk_scores in self._get_executor().map(_score_chunk, chunked(texts, self.chunk_size)):
+                compounds.extend(chunk_scores)
+
+        except BrokenProcessPool:
+            # A worker died; drop the pool so the next call starts a fresh one.
+            self.close()
+            raise
+
+        return compounds
@@ -1,57 +1,58 @@
-import nltk
-from sqlalchemy.orm import sessionmaker
-from database.engine import database_engine
-from database.models import Post, Sentiment
-from typing import Dict, List
-from utils.helpers import serialize_post, get_comments_for_post
-from nltk.sentiment import SentimentIntensityAnalyzer
-from database.session import get_session
-from collections import Counter
+from config import settings
+from sqlalchemy import bindparam, func, select, update
+from database.models import Comment, Post, Sentiment
+from typing import Dict, List, Tuple
+from utils.records import PostRecord
+from utils.helpers import serialize_post, get_comments_for_posts, chunked, iter_post_pages
+from services.sentiment_scoring import SentimentScorer
+from services.score_cache import SentimentScoreCache
+from services.sentiment_columns import SentimentColumns
+from services.sentiment_aggregate_service import SentimentAggregateService
+from services.vader_snapshot import load_analyzer
+from database.session import session_scope
+from utils.instrumentation import current_span, instrumented
 from utils.logger import logger
 
-Session = sessionmaker(bind=database_engine)
-
 
 class SentimentService:
     def __init__(self):
 
-        self.ensure_nltk_resources()
-        self.session = get_session()
-        self.sia = SentimentIntensityAnalyzer()
-        self.query_results: List[Dict] = []
-        self.post_sentiment_scores: List[List[Dict]] = []
-        self.post_sentiment_summaries: List[List[Dict]] = []
-
-    @staticmethod
-    def ensure_nltk_resources() -> None:
-
-        try:
-            nltk.data.find("sentiment/vader_lexicon.zip")
-        except LookupError:
-            logger.info("Downloading VADER lexicon...")
-            nltk.download("vader_lexicon")
-
+        self.sia, self.lexicon_version = load_analyzer()
+        self.incremental = settings.SENTIMENT_INCREMENTAL
+        self.page_size = settings.DB_READ_PAGE_SIZE
+        self.scorer = SentimentScorer(
+            analyzer=self.sia,
+            workers=settings.SENTIMENT_WORKERS,
+            chunk_size=settings.SENTIMENT_CHUNK_SIZE,
+            parallel_threshold=settings.SENTIMENT_PARALLEL_MIN_COMMENTS,
+        )
+        self.score_cache = (
+            SentimentScoreCache(self.lexicon_version, settings.SENTIMENT_CACHE_MEMORY_SIZE)
+            if settings.SENTIMENT_SCORE_CACHE
+            else None
+        )
+        self.aggregates = SentimentAggregateService()
+        self.query_results: List[PostRecord] = []
+        # None until the step has run for the current posts, and after it failed.
+        self.post_sentiment_scores: SentimentColumns | None = None
+        self.post_sentiment_summaries: List[Dict] | None = None
+
+    def close(self) -> None:
+        """
+        Stop the sentiment worker processes, if any were started.
+        """
+        self.scorer.close()
+
+    @instrumented(rows_out=len)
+    def query_posts_with_comments(self) -> List[PostRecord]:
 
-    def query_posts_with_comments(self) -> List[Dict]:
-
-        session = self.session
         post_records = []
 
         logger.info("Querying posts with comments from the database...")
 
         try:
-            posts = session.query(Post).all()
-            total_comments = 0
-
-            for post in posts:
-                comment_records, comment_count = get_comments_for_post(session, post.submission_id)
-                total_comments += comment_count
-
-                post_records.append(serialize_post(post, comment_records))
-
-            logger.info(
-                f"Query complete. Retrieved {len(posts)} posts and {total_comments} comments in total."
-            )
+            with session_scope() as session:
+                post_records = self._query_post_records(session)
 
             self.query_results = post_records
             return post_records
@@ -61,13 +62,79 @@ class SentimentService:
             self.query_results = []
             return []
 
-        finally:
-            session.close()
 
+    def _query_post_records(self, session) -> List[PostRecord]:
+
+        post_records = []
+        if self.incremental:
+            logger.info("Incremental mode: selecting only unprocessed posts.")
+
+        for page in iter_post_pages(session, self.page_size, unprocessed_only=self.incremental):
+            post_records.extend(self._serialize_page(session, page))
+
+        total_comments = sum(len(post.comments) for post in post_records)
+        logger.info(
+            f"Query complete. Retrieved {len(post_records)} posts and {total_comments} comments in total."
+        )
+        return post_records
+
+
+    @staticmethod
+    def _serialize_page(session, page) -> List[PostRecord]:
+        comments_by_post = get_comments_for_posts(session, [post.submission_id for post in page])
+        return [serialize_post(post, comments_by_post[post.submission_id]) for post in page]
+
+
+    @instrumented(rows_out=int)
+    def process_posts_in_pages(self) -> int:
+        """
+        Query, analyze, summarize and store one page of posts at a time, so memory stays
+        bounded by DB_READ_PAGE_SIZE posts and their comments however large the tables grow.
+        A page that fails at any step is left unprocessed for the next run.
+        Returns the number of posts processed.
+        """
+        processed = 0
+        subreddits = set()
+        if self.incremental:
+            logger.info("Incremental mode: selecting only unprocessed posts.")
+
+        try:
+            with session_scope() as session:
+                for page_number, page in enumerate(
+                    iter_post_pages(session, self.page_size, unprocessed_only=self.incremental), start=1
+                ):
+                    self.query_results = self._serialize_page(session, page)
+                    self.post_sentiment_scores = None
+                    self.post_sentiment_summaries = None
+
+                    total_comments = sum(len(post.comments) for post in self.query_results)
+                    logger.info(f"Page {page_number}: {len(page)} post(s) and {total_comments} comment(s).")
+
+                    scores = self.analyze_post_sentiment()
+                    summaries = self.summarize_post_sentiment(scores) if scores is not None else None
+                    if summaries is None or not self.store_sentiment_results(summaries):
+                        logger.warning(f"Page {page_number} failed. Its posts stay unprocessed.")
+                        continue
+
+                    processed += len(page)
+                    subreddits.update(post.subreddit for post in self.query_results)
+
+        except Exception as e:
+            logger.error(f"Error processing posts in pages: {e}", exc_info=True)
+
+        logger.info(f"Paged sentiment processing complete. {processed} post(s) processed.")
+
+        # Keep the read API's per-subreddit rollups in step with the summaries just stored.
+        if subreddits:
+            self.aggregates.refresh(sorted(subreddits))
+        return processed
 
-    def analyze_post_sentiment(self):
 
-        post_sentiment_scores = []
+    @instrumented()
+    def analyze_post_sentiment(self) -> SentimentColumns | None:
+        """
+        Score every comment of the queried posts. Returns None if scoring failed.
+        """
 
         if not self.query_results:
             logger.info("No extracted post with comments where found, calling query_posts_with_comments()...")
@@ -76,124 +143,170 @@ class SentimentService:
         logger.info(f"Starting sentiment analysis on {len(self.query_results)} post(s).")
 
         try:
-            for posts in self.query_results:
-                comments = posts.get("comments", [])
-                comment_sentiment_scores = []
-
-                for comment in comments:
-                    comment_text = comment.get("body", "")
-                    post_key = posts.get("post_key", "")
-                    score = self.sia.polarity_scores(comment_text)
-
-                    if score["compound"] > 0.05:
-                        label = "Positive"
-                    elif score["compound"] < -0.05:
-                        label = "Negative"
-                    else:
-                        label = "Neutral"
-
-                    comment_sentiment_scores.append(
-                        {"post_key":post_key, "compound": score["compound"], "label": label}
-                    )
-                post_sentiment_scores.append(comment_sentiment_scores)
+            comment_texts = [
+                comment.body
+                for post in self.query_results
+                for comment in post.comments
+            ]
+            current_span().add_rows_in(len(comment_texts))
+
+            if self.score_cache:
+                compounds = self.score_cache.score(comment_texts, self.scorer)
+            else:
+                compounds = self.scorer.score(comment_texts)
+            current_span().add_rows_out(len(compounds))
+
+            post_sentiment_scores = SentimentColumns.from_scores(
+                post_keys=[post.submission_id for post in self.query_results],
+                comment_counts=[len(post.comments) for post in self.query_results],
+                compounds=compounds,
+            )
 
         except Exception as e:
             logger.error(f"Error during sentiment analysis: {e}", exc_info=True)
-            return []
+            self.post_sentiment_scores = None
+            return None
 
         self.post_sentiment_scores = post_sentiment_scores
         logger.info("Sentiment analysis complete.")
         return post_sentiment_scores
 
 
-    def summarize_post_sentiment(self) -> List[Dict]:
-
+    @instrumented(rows_out=len)
+    def summarize_post_sentiment(self, post_sentiment_scores: SentimentColumns | None = None) -> List[Dict] | None:
+        """
+        Summarize `post_sentiment_scores` (default: the last analysis, run if it has not been).
+        Returns None if there are no scores to summarize or summarizing failed.
+        """
         logger.info("Starting sentiment summarization...")
-        
-        if not self.post_sentiment_scores:
+
+        if post_sentiment_scores is None:
+            post_sentiment_scores = self.post_sentiment_scores
+        if post_sentiment_scores is None:
             logger.info("No sentiment scores where found, calling analyze_post_sentiment()...")
-            self.analyze_post_sentiment()
-        
-        summaries = []
-        
+            post_sentiment_scores = self.analyze_post_sentiment()
+        if post_sentiment_scores is None:
+            logger.warning("Sentiment analysis failed. Nothing to summarize.")
+            self.post_sentiment_summaries = None
+            return None
+
         try:
-            for post_comment in self.post_sentiment_scores:
-                
-                if not post_comment:
-                    continue
-                
-                sentiment_labels = []
-                compound_scores = []
-                post_key = None
-                
-                for comments in post_comment:
-                    if "label" in comments and "compound" in comments:
-                        sentiment_labels.append(comments["label"])
-                        compound_scores.append(comments["compound"])
-                        if not post_key and "post_key" in comments:
-                            post_key = comments["post_key"]
-                        
-                label_counts = Counter(sentiment_labels)
-                    
-                if label_counts:
-                    dominant_sentiment = label_counts.most_common(1)[0][0]
-                else:
-                    dominant_sentiment = "Neutral"
-                    
-                if compound_scores:
-                    average_compound = sum(compound_scores) / len(compound_scores)
-                else:
-                    average_compound = 0.0
-                    
-                summary = {
-                    "post_key": post_key,
-                    "sentiment_summary":{
-                    "dominant_sentiment": dominant_sentiment,
-                    "avg_compound": average_compound,
-                    "counts": dict(label_counts)}
-                }
-                summaries.append(summary)
-            
+            summaries = post_sentiment_scores.summarize(
+                extended=settings.SENTIMENT_SUMMARY_EXTENDED_STATS,
+                percentiles=settings.SENTIMENT_SUMMARY_PERCENTILES,
+            )
+
         except Exception as e:
             logger.error(f"Error summarizing post sentiment: {e}", exc_info=True)
             summaries = None
 
         logger.info("Sentiment Summarization Complete.")
-        
+
         self.post_sentiment_summaries = summaries
-        return summaries      
-            
-
-    def store_sentiment_results(self):
-        
-        session = self.session
-        sentiments = self.post_sentiment_summaries
-        
-        if not sentiments:
-            self.summarize_post_sentiment()
+        return summaries
+
+
+    @instrumented()
+    def store_sentiment_results(self, sentiments: List[Dict] | None = None) -> bool:
+        """
+        Store `sentiments` (default: the last summaries, computed if they have not been) and
+        mark processed the posts they cover and the queried posts without comments.
+        Returns False, leaving every post unprocessed, if there is nothing valid to store or
+        storing failed.
+        """
+        if sentiments is None:
             sentiments = self.post_sentiment_summaries
-            
-        if not sentiments:
+        if sentiments is None:
+            sentiments = self.summarize_post_sentiment()
+        if sentiments is None:
+            logger.warning("No sentiment summaries to store. Posts left unprocessed.")
+            return False
+
+        # Only posts whose summary is written here, or that have nothing to score, are done.
+        processed_post_keys = [summary["post_key"] for summary in sentiments]
+        processed_post_keys.extend(post.submission_id for post in self.query_results if not post.comments)
+        scored_comments = {post.submission_id: len(post.comments) for post in self.query_results}
+
+        if not processed_post_keys:
             logger.warning("No sentiment data to store.")
-            return
-        
+            return True
+
         try:
             logger.info("Storing post(s) sentiments in the database...")
-            
-            for post_sentiment_summary in sentiments:
-                post_key = post_sentiment_summary.get("post_key")
-                post_sentiment = post_sentiment_summary.get("sentiment_summary")
-                
-                results = Sentiment(
-                    post_id = post_key,
-                    sentiment_results = post_sentiment
+
+            with session_scope() as session:
+                current_span().add_rows_in(len(sentiments))
+                existing_sentiments: Dict[str, List[Sentiment]] = {}
+                for post_key_chunk in chunked([summary.get("post_key") for summary in sentiments], 500):
+                    for sentiment in (
+                        session.query(Sentiment)
+                        .filter(Sentiment.post_id.in_(post_key_chunk))
+                        .order_by(Sentiment.id)
+                    ):
+                        existing_sentiments.setdefault(sentiment.post_id, []).append(sentiment)
+
+                inserted = 0
+                updated = 0
+
+                for post_sentiment_summary in sentiments:
+                    post_key = post_sentiment_summary.get("post_key")
+                    post_sentiment = post_sentiment_summary.get("sentiment_summary")
+                    previous = existing_sentiments.get(post_key, [])
+
+                    if previous:
+                        previous[0].sentiment_results = post_sentiment
+                        for duplicate in previous[1:]:
+                            session.delete(duplicate)
+                        updated += 1
+                    else:
+                        session.add(Sentiment(post_id = post_key, sentiment_results = post_sentiment))
+                        inserted += 1
+
+                marked = self._mark_posts_processed(
+                    session, [(post_key, scored_comments[post_key]) for post_key in processed_post_keys]
+                )
+
+            logger.info(
+                f"Sentiment Storage Complete. {inserted} inserted, {updated} updated, "
+                f"{marked} post(s) marked processed."
+            )
+            if marked < len(processed_post_keys):
+                logger.info(
+                    f"{len(processed_post_keys) - marked} post(s) received comments while being scored. "
+                    f"Left unprocessed for the next run."
                 )
-                
-                session.add(results)
-            session.commit()
-                
-            logger.info("Sentiment Storage Complete.")
-                
+            current_span().add_rows_out(inserted + updated)
+            return True
+
         except Exception as e:
             logger.error(f"Error storing post sentiment(s) {e}", exc_info=True)
-            session.rollback()
\ No newline at end of file
+            return False
+
+
+    @staticmethod
+    def _mark_posts_processed(session, scored_posts: List[Tuple[str, int]]) -> int:
+        """
+        Mark processed each (post_key, comment_count) post that still has the number of comments
+        it was scored with. Ingest may store comments for a post while it is being scored and
+        flag it unprocessed; the count check keeps this pass from clearing that flag with its
+        stale read. Returns the number of posts marked.
+        """
+        if not scored_posts:
+            return 0
+
+        comment_count = (
+            select(func.count(Comment.id)).where(Comment.submission_id == Post.submission_id).scalar_subquery()
+        )
+        statement = (
+            update(Post.__table__)
+            .where(Post.submission_id == bindparam("post_key"), comment_count == bindparam("comment_count"))
+            .values(is_processed=True)
+        )
+
+        marked = 0
+        for chunk in chunked(scored_posts, 500):
+            result = session.execute(
+                statement, [{"post_key": post_key, "comment_count": count} for post_key, count in chunk]
+            )
+            marked += result.rowcount
+        return marked
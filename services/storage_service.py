@@ -1,75 +1,211 @@
-from sqlalchemy.orm import sessionmaker
+from typing import Dict, Iterable, List
+from sqlalchemy import update
+from config import settings
 from database.models import Post, Comment
-from database.engine import database_engine
-from utils.helpers import ensure_data_integrity
+from database.bulk_writer import bulk_upsert, bulk_insert_missing
+from database.session import session_scope
+from utils.helpers import chunked
+from utils.instrumentation import current_span, instrumented
 from utils.logger import logger
+from utils.records import CommentRecord, PostRecord
+
+POST_UPDATE_COLUMNS = ["title", "body", "upvote_ratio", "score", "number_of_comments", "post_url"]
+
+# Comments without a Reddit comment ID (rows stored before it was captured) are identified
+# by where they were posted, who wrote them and what they say.
+COMMENT_IDENTITY_COLUMNS = ["submission_id", "author", "body"]
+COMMENT_UPDATE_COLUMNS = ["score"]
 
 
 class StorageService:
     def __init__(self):
-        self.SessionLocal = sessionmaker(bind=database_engine)
+        self.chunk_size = settings.STORAGE_CHUNK_SIZE
         
+    @staticmethod
+    def _merge_counts(totals: Dict[str, int], counts: Dict[str, int]) -> None:
+        for key, value in counts.items():
+            totals[key] = totals.get(key, 0) + value
+
+
     def store_posts(self, reddit_data):
 
-        session = self.SessionLocal()
-        stored_posts = 0
-        
-        validated_posts = ensure_data_integrity(session, reddit_data)
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        rows = [post.to_row() for post in reddit_data.get("posts", [])]
+        current_span().add_rows_in(len(rows))
 
         try:
-            for post_data in reddit_data.get("posts", []):
-                if post_data["submission_id"] in validated_posts:
-                    post = Post(
-                        submission_id = post_data["submission_id"],
-                        subreddit = post_data.get("subreddit", ""),
-                        title = post_data.get("title", ""),
-                        body = post_data.get("body", ""),
-                        upvote_ratio = post_data.get("upvote_ratio", 0.0),
-                        score = post_data.get("score", 0),
-                        number_of_comments = post_data.get("number_of_comments", 0),
-                        post_url = post_data.get("post_url","")
+            with session_scope() as session:
+                for chunk in chunked(rows, self.chunk_size):
+                    counts = bulk_upsert(
+                        session,
+                        Post,
+                        chunk,
+                        conflict_columns=["submission_id"],
+                        update_columns=POST_UPDATE_COLUMNS,
                     )
-                    session.add(post)
-                    stored_posts += 1
+                    self._merge_counts(totals, counts)
 
-            session.commit()
-            logger.info(f"Stored {stored_posts} posts.")
-            return {"posts_stored": stored_posts}
+            logger.info(
+                f"Stored {totals['inserted']} new posts, updated {totals['updated']}, skipped {totals['skipped']}."
+            )
+            current_span().add_rows_out(totals["inserted"] + totals["updated"])
+            return {
+                "posts_stored": totals["inserted"],
+                "posts_updated": totals["updated"],
+                "posts_skipped": totals["skipped"],
+            }
 
         except Exception as e:
-            session.rollback()
             logger.error(f"Error storing Reddit posts: {e}", exc_info=True)
+            return {"error": str(e)}
+
 
-        finally:
-            session.close()
-            
-        
     def store_comments(self, reddit_data: dict):
 
-        session = self.SessionLocal()
-        stored_comments = 0
-        
+        totals = {"inserted": 0, "updated": 0, "skipped": 0}
+
+        rows = [comment.to_row() for comment in reddit_data.get("comments", [])]
+        current_span().add_rows_in(len(rows))
+
         try:
-            for comment_data in reddit_data.get("comments", []):
-                comment = Comment(
-                    submission_id = comment_data["submission_id"],
-                    title = comment_data.get("title", ""),
-                    subreddit = comment_data.get("subreddit", ""),
-                    author = comment_data.get("author", ""),
-                    body = comment_data.get("body", ""),
-                    score = comment_data.get("score", 0)
-                )
-                session.add(comment)
-                stored_comments += 1
-                    
-            session.commit()
-            logger.info(f"Stored {stored_comments} comments.")
-            return {"comments_stored": stored_comments}
+            with session_scope() as session:
+                for chunk in chunked(rows, self.chunk_size):
+                    inserted_rows = []
+                    identified = [row for row in chunk if row["comment_id"]]
+                    anonymous = [row for row in chunk if not row["comment_id"]]
+
+                    if identified:
+                        self._adopt_legacy_comments(session, identified)
+                        counts = bulk_upsert(
+                            session,
+                            Comment,
+                            identified,
+                            conflict_columns=["comment_id"],
+                            update_columns=COMMENT_UPDATE_COLUMNS,
+                            inserted_rows=inserted_rows,
+                        )
+                        self._merge_counts(totals, counts)
+
+                    if anonymous:
+                        counts = bulk_insert_missing(
+                            session, Comment, anonymous, key_columns=COMMENT_IDENTITY_COLUMNS, inserted_rows=inserted_rows
+                        )
+                        self._merge_counts(totals, counts)
+
+                    self._mark_posts_unprocessed(session, {row["submission_id"] for row in inserted_rows})
+
+            logger.info(
+                f"Stored {totals['inserted']} new comments, updated {totals['updated']}, "
+                f"skipped {totals['skipped']} duplicates."
+            )
+            current_span().add_rows_out(totals["inserted"] + totals["updated"])
+            return {
+                "comments_stored": totals["inserted"],
+                "comments_updated": totals["updated"],
+                "comments_skipped": totals["skipped"],
+            }
         
         except Exception as e:
-            session.rollback()
             logger.error(f"Error storing Reddit comments: {e}", exc_info=True)
             return {"error": str(e)}
 
-        finally:
-            session.close()
\ No newline at end of file
+
+    @staticmethod
+    def _adopt_legacy_comments(session, rows: List[Dict]) -> None:
+        """
+        Backfill the Reddit comment ID of stored comments that predate it, matching them by
+        COMMENT_IDENTITY_COLUMNS, so the upsert on comment_id updates them instead of duplicating them.
+        """
+        ids_by_identity = {tuple(row[column] for column in COMMENT_IDENTITY_COLUMNS): row["comment_id"] for row in rows}
+        submission_ids = list({row["submission_id"] for row in rows})
+
+        # An ID that is already stored (e.g. the comment was edited since) must not be assigned twice.
+        stored_ids = {
+            comment_id
+            for (comment_id,) in session.query(Comment.comment_id).filter(
+                Comment.comment_id.in_(list(ids_by_identity.values()))
+            )
+        }
+
+        legacy_comments = (
+            session.query(Comment.id, Comment.submission_id, Comment.author, Comment.body)
+            .filter(Comment.submission_id.in_(submission_ids), Comment.comment_id.is_(None))
+        )
+
+        adopted = []
+        for comment in legacy_comments:
+            comment_id = ids_by_identity.pop((comment.submission_id, comment.author, comment.body), None)
+            if comment_id and comment_id not in stored_ids:
+                stored_ids.add(comment_id)
+                adopted.append({"id": comment.id, "comment_id": comment_id})
+
+        if adopted:
+            session.execute(update(Comment), adopted)
+            logger.info(f"Backfilled the Reddit comment ID of {len(adopted)} stored comment(s).")
+
+
+    @staticmethod
+    def _mark_posts_unprocessed(session, submission_ids) -> None:
+        """
+        Flag posts that received new comments so the incremental sentiment pipeline rescores them.
+        """
+        if not submission_ids:
+            return
+
+        (
+            session.query(Post)
+            .filter(Post.submission_id.in_(list(submission_ids)))
+            .update({Post.is_processed: False}, synchronize_session=False)
+        )
+
+
+    @instrumented()
+    def store_post_stream(self, post_batches: Iterable[List[PostRecord]]) -> int:
+        """
+        Store posts as they arrive, committing every `chunk_size` posts.
+        Returns the number of posts stored.
+        """
+        stored_posts = 0
+
+        for posts in post_batches:
+            for chunk in chunked(posts, self.chunk_size):
+                stored_posts += self._store_post_chunk(chunk)
+
+        return stored_posts
+
+
+    @instrumented()
+    def store_comment_stream(self, comment_batches: Iterable[List[CommentRecord]]) -> int:
+        """
+        Buffer incoming comment batches and commit them once `chunk_size` comments are waiting.
+        Returns the number of comments stored.
+        """
+        stored_comments = 0
+        buffer: List[CommentRecord] = []
+
+        for comments in comment_batches:
+            buffer.extend(comments)
+
+            if len(buffer) >= self.chunk_size:
+                stored_comments += self._store_comment_chunk(buffer)
+                buffer = []
+
+        if buffer:
+            stored_comments += self._store_comment_chunk(buffer)
+
+        return stored_comments
+
+
+    def _store_post_chunk(self, posts: List[PostRecord]) -> int:
+        result = self.store_posts({"posts": posts})
+        if "error" in result:
+            raise RuntimeError(f"Failed to store post chunk: {result['error']}")
+        return result.get("posts_stored", 0)
+
+
+    def _store_comment_chunk(self, comments: List[CommentRecord]) -> int:
+        result = self.store_comments({"comments": comments})
+        if "error" in result:
+            raise RuntimeError(f"Failed to store comment chunk: {result['error']}")
+        return result.get("comments_stored", 0)
@@ -0,0 +1,167 @@
+import os
+import pickle
+import tempfile
+from typing import Any, Dict, Tuple
+import nltk
+from nltk.sentiment import SentimentIntensityAnalyzer
+from nltk.sentiment.vader import VaderConstants
+from config import settings
+from services.score_cache import lexicon_version
+from utils.logger import logger
+
+# Pickled copy of the parsed VADER lexicon. Loading it skips reading and parsing
+# vader_lexicon.zip and hashing the lexicon for its version, which every process and every
+# sentiment worker otherwise repeats. The snapshot is rebuilt whenever the NLTK version or
+# the lexicon file it was built from changes, and is only written once its scores have been
+# checked against the stock analyzer.
+
+SNAPSHOT_FORMAT = 1
+LEXICON_RESOURCE = "sentiment/vader_lexicon.zip"
+
+# Exercise the rules around the lexicon: negation, boosters, caps, "but", punctuation, emoticons.
+VALIDATION_SENTENCES = (
+    "",
+    "This business idea is great.",
+    "This business idea is not great.",
+    "This business idea is VERY GREAT!!!",
+    "The product is good but the price is terrible.",
+    "Never been so happy with a supplier :)",
+    "Kind of bad, sort of useless :(",
+    "Without a doubt the worst service ever?!",
+    "I don't really love it, I hate it",
+    "Least amount of trouble, no problems at all.",
+)
+
+
+def ensure_vader_lexicon() -> None:
+    try:
+        nltk.data.find(LEXICON_RESOURCE)
+    except LookupError:
+        logger.info("Downloading VADER lexicon...")
+        nltk.download("vader_lexicon")
+
+
+def _lexicon_source() -> Dict[str, Any]:
+    """
+    What the stock lexicon is loaded from: NLTK version and the lexicon file's path, size and mtime.
+    """
+    ensure_vader_lexicon()
+    pointer = nltk.data.find(LEXICON_RESOURCE)
+    path = getattr(getattr(pointer, "zipfile", None), "filename", None) or getattr(pointer, "path", str(pointer))
+    stat = os.stat(path)
+    return {"nltk_version": nltk.__version__, "path": path, "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def analyzer_from_lexicon(lexicon: Dict[str, float]) -> SentimentIntensityAnalyzer:
+    """
+    Analyzer over an already parsed lexicon. Mirrors SentimentIntensityAnalyzer.__init__
+    without loading the lexicon file.
+    """
+    analyzer = SentimentIntensityAnalyzer.__new__(SentimentIntensityAnalyzer)
+    analyzer.lexicon_file = None
+    analyzer.lexicon = lexicon
+    analyzer.constants = VaderConstants()
+    return analyzer
+
+
+def validate_snapshot(stock: SentimentIntensityAnalyzer, snapshot: SentimentIntensityAnalyzer) -> None:
+    """
+    Raise ValueError unless the snapshot analyzer has the stock lexicon and scores every
+    validation sentence, and every lexicon word alone, negated and boosted, identically.
+    """
+    if snapshot.lexicon != stock.lexicon:
+        raise ValueError("Snapshot lexicon differs from the stock VADER lexicon.")
+
+    texts = list(VALIDATION_SENTENCES)
+    for word in stock.lexicon:
+        texts.extend((word, f"not {word}", f"very {word.upper()}!"))
+
+    for text in texts:
+        if snapshot.polarity_scores(text) != stock.polarity_scores(text):
+            raise ValueError(f"Snapshot analyzer scores {text!r} differently from the stock analyzer.")
+
+
+def _write_atomically(path: str, payload: bytes) -> None:
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=directory, delete=False) as temporary:
+        temporary.write(payload)
+    os.replace(temporary.name, path)
+
+
+def build_snapshot(path: str, source: Dict[str, Any] | None = None) -> Tuple[SentimentIntensityAnalyzer, str]:
+    """
+    Parse the stock lexicon, check that its pickled round trip scores identically and write it to `path`.
+    Returns the snapshot analyzer and the lexicon version. A snapshot that fails validation is not written.
+    """
+    source = source or _lexicon_source()
+    stock = SentimentIntensityAnalyzer()
+    version = lexicon_version(stock.lexicon)
+
+    payload = pickle.dumps(
+        {"format": SNAPSHOT_FORMAT, "lexicon_version": version, "source": source, "lexicon": stock.lexicon},
+        protocol=pickle.HIGHEST_PROTOCOL,
+    )
+    snapshot = analyzer_from_lexicon(pickle.loads(payload)["lexicon"])
+    validate_snapshot(stock, snapshot)
+
+    try:
+        _write_atomically(path, payload)
+        logger.info(f"Wrote VADER lexicon snapshot {version} ({len(stock.lexicon)} entries) to {path}.")
+    except OSError as e:
+        logger.warning(f"Could not write the VADER lexicon snapshot to {path}: {e}")
+
+    return snapshot, version
+
+
+def _read_snapshot(path: str, source: Dict[str, Any]) -> Dict[str, Any] | None:
+    try:
+        with open(path, "rb") as snapshot_file:
+            snapshot = pickle.load(snapshot_file)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable VADER lexicon snapshot {path}: {e}")
+        return None
+
+    if not isinstance(snapshot, dict) or snapshot.get("format") != SNAPSHOT_FORMAT:
+        logger.info("VADER lexicon snapshot has an old format. Rebuilding it.")
+        return None
+
+    if snapshot.get("source") != source:
+        logger.info("NLTK or its VADER lexicon changed since the snapshot was built. Rebuilding it.")
+        return None
+
+    return snapshot
+
+
+def load_analyzer(path: str | None = None) -> Tuple[SentimentIntensityAnalyzer, str]:
+    """
+    VADER analyzer and its lexicon version (as used by the score cache), loaded from the
+    snapshot when it is current and built (then snapshotted) from the stock lexicon otherwise.
+    """
+    if not settings.SENTIMENT_LEXICON_SNAPSHOT:
+        ensure_vader_lexicon()
+        analyzer = SentimentIntensityAnalyzer()
+        return analyzer, lexicon_version(analyzer.lexicon)
+
+    path = path or settings.SENTIMENT_LEXICON_SNAPSHOT_PATH
+    source = _lexicon_source()
+    snapshot = _read_snapshot(path, source)
+
+    if snapshot is not None:
+        return analyzer_from_lexicon(snapshot["lexicon"]), snapshot["lexicon_version"]
+
+    try:
+        return build_snapshot(path, source)
+
+    except ValueError as e:
+        logger.error(f"VADER lexicon snapshot failed validation, using the stock analyzer: {e}")
+        analyzer = SentimentIntensityAnalyzer()
+        return analyzer, lexicon_version(analyzer.lexicon)
+
+
+if __name__ == "__main__":
+    settings.load_settings()
+    _, version = build_snapshot(settings.SENTIMENT_LEXICON_SNAPSHOT_PATH)
+    print(f"VADER lexicon snapshot {version} written to {settings.SENTIMENT_LEXICON_SNAPSHOT_PATH}")
@@ -1,67 +1,129 @@
-from sqlalchemy.orm import Session
-from typing import List, Dict, Tuple
-from database.models import Comment, Post
-
-
-def serialize_comment(comment: Comment) -> Dict:
-    return {
-        "comment_id": comment.id,
-        "post_key": comment.submission_id,
-        "body": comment.body,
-        "author": comment.author,
-        "score": comment.score,
-    }
-
-
-def serialize_post(post: Post, comments: List[Dict]) -> Dict:
-    return {
-        "post_number": post.id,
-        "post_key":post.submission_id,
-        "subreddit": post.subreddit,
-        "title": post.title,
-        "body": post.body,
-        "comments": comments,
-    }
-
-
-def get_comments_for_post(session, post_id: str) -> Tuple[List[Dict], int]:
-    comments = (
-        session.query(Comment)
-        .filter(Comment.submission_id == post_id)
-        .all()
+from datetime import datetime, timezone
+from itertools import islice
+from sqlalchemy import or_, select, tuple_
+from typing import Any, Iterable, Iterator, List, Dict, Sequence
+from database.models import Comment, Post, Sentiment
+from utils.records import CommentRecord, PostRecord
+
+# Post columns needed to serialize a post, read as plain rows instead of ORM objects.
+POST_COLUMNS = (Post.id, Post.submission_id, Post.subreddit, Post.title, Post.body)
+
+
+def utc_now() -> datetime:
+    """
+    Current UTC time as a naive datetime, matching how DateTime columns are stored.
+    """
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def chunked(records: Iterable[Any], size: int) -> Iterator[List[Any]]:
+    """
+    Split any iterable into lists of at most `size` items without materializing it.
+    """
+    iterator = iter(records)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def serialize_comment(comment: Comment) -> CommentRecord:
+    return CommentRecord(
+        comment_id=comment.comment_id,
+        submission_id=comment.submission_id,
+        body=comment.body,
+        author=comment.author,
+        score=comment.score,
+    )
+
+
+def serialize_post(post: Post, comments: List[CommentRecord]) -> PostRecord:
+    return PostRecord(
+        post_number=post.id,
+        submission_id=post.submission_id,
+        subreddit=post.subreddit,
+        title=post.title,
+        body=post.body,
+        comments=comments,
     )
 
-    comment_records = []
-    count = 0
-    for comment in comments:
-        comment_records.append(serialize_comment(comment))
-        count += 1
 
-    return comment_records, count
+def get_comments_for_posts(session, post_ids: List[str], chunk_size: int = 500) -> Dict[str, List[CommentRecord]]:
+    """
+    Fetch the comments of many posts with one query per `chunk_size` post ids
+    instead of one query per post. Returns serialized comments grouped by submission_id.
+    """
+    comments_by_post: Dict[str, List[CommentRecord]] = {post_id: [] for post_id in post_ids}
+
+    for post_id_chunk in chunked(post_ids, chunk_size):
+        comments = (
+            session.query(Comment.comment_id, Comment.submission_id, Comment.body, Comment.author, Comment.score)
+            .filter(Comment.submission_id.in_(post_id_chunk))
+            .order_by(Comment.submission_id, Comment.id)
+        )
+
+        for comment in comments:
+            comments_by_post[comment.submission_id].append(serialize_comment(comment))
+
+    return comments_by_post
 
 
-def ensure_data_integrity(session: Session, reddit_data) -> list:
+def iter_keyset_pages(session, statement, key_columns: Sequence, page_size: int = 1000) -> Iterator[List]:
     """
-    Returns a list of submission_ids that do NOT exist in the database.
+    Page through `statement` in `key_columns` order, `page_size` rows at a time.
+    Each page is a separate query resuming after the last key seen (keyset pagination),
+    so no cursor stays open and memory is bounded by one page of plain rows.
+    The key columns must be the leading columns selected by `statement`, in order,
+    and unique together.
     """
-    posts_list = reddit_data.get("posts", [])
-    submission_ids_from_posts = []
+    last_key = None
 
-    for post in posts_list:
-        submission_ids_from_posts.append(post["submission_id"])
+    while True:
+        page_statement = statement
+        if last_key is not None:
+            if len(key_columns) == 1:
+                page_statement = page_statement.where(key_columns[0] > last_key[0])
+            else:
+                page_statement = page_statement.where(tuple_(*key_columns) > tuple_(*last_key))
 
-    if len(submission_ids_from_posts) == 0:
-        return []
+        rows = session.execute(page_statement.order_by(*key_columns).limit(page_size)).all()
+        if not rows:
+            return
 
-    query_results = session.query(Post.submission_id).filter(Post.submission_id.in_(submission_ids_from_posts)).all()
+        yield rows
 
-    existing_submission_ids = set()
-    for record in query_results:
-        existing_submission_ids.add(record[0])
+        if len(rows) < page_size:
+            return
+        last_key = tuple(rows[-1][:len(key_columns)])
 
-    new_submission_ids = []
-    for submission_id in submission_ids_from_posts:
-        if submission_id not in existing_submission_ids:
-            new_submission_ids.append(submission_id)
 
-    return new_submission_ids
\ No newline at end of file
+def iter_post_pages(session, page_size: int = 1000, unprocessed_only: bool = False) -> Iterator[List]:
+    """
+    Yield pages of POST_COLUMNS rows ordered by Post.id, optionally only posts not yet processed.
+    """
+    statement = select(*POST_COLUMNS)
+    if unprocessed_only:
+        statement = statement.where(or_(Post.is_processed.is_(False), Post.is_processed.is_(None)))
+
+    yield from iter_keyset_pages(session, statement, [Post.id], page_size)
+
+
+def iter_posts_with_sentiments(session, page_size: int = 1000) -> Iterator[Dict]:
+    """
+    Yield every post joined with its sentiment summary as a dict, ordered by Post.id.
+    """
+    statement = (
+        select(Post.id, Sentiment.id, Post.subreddit, Post.title, Post.body, Sentiment.sentiment_results)
+        .join(Sentiment, Sentiment.post_id == Post.submission_id)
+    )
+
+    for page in iter_keyset_pages(session, statement, [Post.id, Sentiment.id], page_size):
+        for row in page:
+            yield {
+                "post_number": row[0],
+                "subreddit": row.subreddit,
+                "title": row.title,
+                "body": row.body,
+                "sentiment_score": row.sentiment_results,
+            }
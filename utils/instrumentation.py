@@ -0,0 +1,284 @@
+import json
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from functools import wraps
+from typing import Any, Callable, Dict, Iterator, List
+from config import settings
+from utils.helpers import utc_now
+from utils.logger import logger, metrics_logger
+
+
+class StageSpan:
+    """
+    Timing and throughput of one pipeline step: wall time, process CPU time (which includes
+    worker threads but not worker processes), rows in and out, and external API calls by service.
+    """
+
+    __slots__ = ("stage", "started_at", "wall_seconds", "cpu_seconds", "rows_in", "rows_out", "api_calls", "error")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started_at = utc_now()
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.rows_in = 0
+        self.rows_out = 0
+        self.api_calls: Dict[str, int] = {}
+        self.error: str | None = None
+
+    def add_rows_in(self, count: int) -> None:
+        self.rows_in += count
+
+    def add_rows_out(self, count: int) -> None:
+        self.rows_out += count
+
+    def add_api_calls(self, service: str, count: int = 1) -> None:
+        self.api_calls[service] = self.api_calls.get(service, 0) + count
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "wall_seconds": round(self.wall_seconds, 4),
+            "cpu_seconds": round(self.cpu_seconds, 4),
+            "rows_in": self.rows_in,
+            "rows_out": self.rows_out,
+            "api_calls": self.api_calls,
+            "status": "error" if self.error else "ok",
+            "error": self.error,
+        }
+
+
+class _NullSpan(StageSpan):
+    """
+    Stand-in returned when no span is open, so callers can record counters unconditionally.
+    """
+
+    def add_rows_in(self, count: int) -> None:
+        pass
+
+    def add_rows_out(self, count: int) -> None:
+        pass
+
+    def add_api_calls(self, service: str, count: int = 1) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan("none")
+
+
+class PipelineRun:
+    """
+    Spans closed while a pipeline runs, aggregated per stage into the run summary.
+    """
+
+    def __init__(self, pipeline: str):
+        self.run_id = uuid.uuid4().hex
+        self.pipeline = pipeline
+        self.started_at = utc_now()
+        self.spans: List[StageSpan] = []
+        self._lock = threading.Lock()
+
+    def add(self, span: StageSpan) -> None:
+        with self._lock:
+            self.spans.append(span)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        """
+        One row per stage in order of first completion. Stages that ran several times
+        (per chunk, per subreddit...) are summed; wall time of concurrent calls adds up.
+        """
+        stages: Dict[str, Dict[str, Any]] = {}
+
+        with self._lock:
+            spans = list(self.spans)
+
+        for span in spans:
+            stage = stages.setdefault(span.stage, {
+                "stage": span.stage,
+                "calls": 0,
+                "wall_seconds": 0.0,
+                "cpu_seconds": 0.0,
+                "rows_in": 0,
+                "rows_out": 0,
+                "api_calls": {},
+                "errors": 0,
+            })
+            stage["calls"] += 1
+            stage["wall_seconds"] += span.wall_seconds
+            stage["cpu_seconds"] += span.cpu_seconds
+            stage["rows_in"] += span.rows_in
+            stage["rows_out"] += span.rows_out
+            stage["errors"] += 1 if span.error else 0
+            for service, count in span.api_calls.items():
+                stage["api_calls"][service] = stage["api_calls"].get(service, 0) + count
+
+        return list(stages.values())
+
+
+# Open spans are tracked per thread, so counters recorded from a worker thread go to the
+# span that worker opened. The pipeline run is shared by every thread.
+_local = threading.local()
+_run_lock = threading.Lock()
+_current_run: PipelineRun | None = None
+
+
+def _span_stack() -> List[StageSpan]:
+    stack = getattr(_local, "spans", None)
+    if stack is None:
+        stack = _local.spans = []
+    return stack
+
+
+def current_span() -> StageSpan:
+    """
+    Innermost span open on the calling thread, or a no-op span.
+    """
+    stack = _span_stack()
+    return stack[-1] if stack else NULL_SPAN
+
+
+def record_api_calls(service: str, count: int = 1) -> None:
+    current_span().add_api_calls(service, count)
+
+
+@contextmanager
+def stage_span(stage: str) -> Iterator[StageSpan]:
+    """
+    Time the enclosed block as one pipeline stage. Inside a pipeline_run the span joins the
+    run summary; otherwise it is logged on its own as soon as it closes.
+    """
+    if not settings.INSTRUMENTATION_ENABLED:
+        yield NULL_SPAN
+        return
+
+    span = StageSpan(stage)
+    stack = _span_stack()
+    stack.append(span)
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+
+    try:
+        yield span
+
+    except BaseException as e:
+        span.error = f"{type(e).__name__}: {e}"
+        raise
+
+    finally:
+        span.wall_seconds = time.perf_counter() - wall_start
+        span.cpu_seconds = time.process_time() - cpu_start
+        stack.pop()
+
+        run = _current_run
+        if run is not None:
+            run.add(span)
+        else:
+            metrics_logger.info(json.dumps({"event": "stage", **span.as_dict()}, default=str))
+
+
+def instrumented(stage: str | None = None, rows_out: Callable[[Any], int] | None = None):
+    """
+    Run the decorated function inside a stage_span named `stage` (default: its qualified name).
+    `rows_out` maps the return value to the number of rows produced.
+    """
+
+    def decorator(func):
+        stage_name = stage or func.__qualname__
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage_span(stage_name) as span:
+                result = func(*args, **kwargs)
+                if rows_out is not None and result is not None:
+                    try:
+                        span.add_rows_out(rows_out(result))
+                    except TypeError:
+                        pass
+                return result
+
+        return wrapper
+
+    return decorator
+
+
+@contextmanager
+def pipeline_run(pipeline: str) -> Iterator[StageSpan]:
+    """
+    Collect every span closed until the block exits into one run, then log the per-stage
+    summary as JSON lines and a table and store it in pipeline_stage_metrics.
+    A pipeline started inside another one is recorded as a stage of the outer run.
+    """
+    global _current_run
+
+    with _run_lock:
+        outer_run = _current_run
+        if outer_run is None and settings.INSTRUMENTATION_ENABLED:
+            run = _current_run = PipelineRun(pipeline)
+        else:
+            run = None
+
+    if run is None:
+        with stage_span(pipeline) as span:
+            yield span
+        return
+
+    try:
+        with stage_span(pipeline) as span:
+            yield span
+
+    finally:
+        with _run_lock:
+            _current_run = None
+        _report_run(run)
+
+
+def _report_run(run: PipelineRun) -> None:
+    summary = run.summary()
+
+    for stage in summary:
+        metrics_logger.info(json.dumps(
+            {
+                "event": "stage_summary",
+                "run_id": run.run_id,
+                "pipeline": run.pipeline,
+                **stage,
+                "wall_seconds": round(stage["wall_seconds"], 4),
+                "cpu_seconds": round(stage["cpu_seconds"], 4),
+            },
+            default=str,
+        ))
+
+    lines = [f"{'stage':<48} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'rows in':>9} {'rows out':>9} {'api':>6}"]
+    for stage in summary:
+        lines.append(
+            f"{stage['stage'][:48]:<48} {stage['calls']:>6} {stage['wall_seconds']:>9.3f} "
+            f"{stage['cpu_seconds']:>9.3f} {stage['rows_in']:>9} {stage['rows_out']:>9} "
+            f"{sum(stage['api_calls'].values()):>6}"
+        )
+    logger.info(f"Pipeline '{run.pipeline}' run {run.run_id} stage summary:\n" + "\n".join(lines))
+
+    if settings.METRICS_STORE_ENABLED:
+        _store_summary(run, summary)
+
+
+def _store_summary(run: PipelineRun, summary: List[Dict[str, Any]]) -> None:
+    # Imported here so importing the instrumentation never pulls in the database engine.
+    from database.models import PipelineStageMetric
+    from database.session import session_scope
+
+    try:
+        with session_scope() as session:
+            session.add_all(
+                PipelineStageMetric(
+                    run_id=run.run_id,
+                    pipeline=run.pipeline,
+                    run_started_at=run.started_at,
+                    **stage,
+                )
+                for stage in summary
+            )
+
+    except Exception as e:
+        logger.warning(f"Could not store pipeline metrics for run {run.run_id}: {e}")
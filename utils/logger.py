@@ -10,4 +10,15 @@ ch.setLevel(logging.INFO)
 formatter = logging.Formatter("[%(asctime)s] %(levelname)s :: %(message)s", "%H:%M:%S")
 ch.setFormatter(formatter)
 
-logger.addHandler(ch)
\ No newline at end of file
+logger.addHandler(ch)
+
+# Structured metrics: one JSON object per line, without the human-readable prefix.
+metrics_logger = logging.getLogger("metrics")
+metrics_logger.setLevel(logging.INFO)
+metrics_logger.propagate = False
+
+metrics_handler = logging.StreamHandler()
+metrics_handler.setLevel(logging.INFO)
+metrics_handler.setFormatter(logging.Formatter("%(message)s"))
+
+metrics_logger.addHandler(metrics_handler)
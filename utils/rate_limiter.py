@@ -0,0 +1,67 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket used to share one request budget between workers.
+    Tokens refill continuously at `rate_per_minute / 60` per second up to `capacity`.
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: float | None = None):
+        if rate_per_minute <= 0:
+            raise ValueError("rate_per_minute must be greater than zero.")
+
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        elapsed = max(0.0, now - max(self.updated_at, self.blocked_until))
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.rate_per_second)
+        self.updated_at = now
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """
+        Block until `tokens` are available and consume them.
+        Returns the number of seconds spent waiting.
+        """
+        tokens = min(float(tokens), self.capacity)
+        waited = 0.0
+
+        while True:
+            with self.lock:
+                self._refill()
+                now = time.monotonic()
+
+                if now < self.blocked_until:
+                    wait_time = self.blocked_until - now
+                elif self.tokens >= tokens:
+                    self.tokens -= tokens
+                    return waited
+                else:
+                    wait_time = (tokens - self.tokens) / self.rate_per_second
+
+            time.sleep(wait_time)
+            waited += wait_time
+
+    def apply_quota(self, remaining: float | None, reset_in: float | None) -> None:
+        """
+        Align the bucket with a quota reported by the server.
+        Never holds more tokens than the server says are left, and pauses every
+        caller until the quota window resets once it is exhausted.
+        """
+        if remaining is None:
+            return
+
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.tokens, max(0.0, float(remaining)))
+
+            if remaining <= 0 and reset_in:
+                self.blocked_until = max(self.blocked_until, time.monotonic() + float(reset_in))
+                self.tokens = 0.0
@@ -0,0 +1,59 @@
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, NamedTuple
+
+# Slotted records carried through scrape, store and sentiment instead of one dict per row.
+# A slotted instance has no per-instance __dict__, so it costs a fraction of an equivalent dict.
+
+
+@dataclass(slots=True)
+class CommentRecord:
+    submission_id: str
+    body: str
+    author: str = ""
+    score: int = 0
+    comment_id: str | None = None  # Reddit comment ID; None for comments stored before it was captured
+    subreddit: str = ""
+    title: str = ""
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "comment_id": self.comment_id,
+            "submission_id": self.submission_id,
+            "title": self.title,
+            "subreddit": self.subreddit,
+            "author": self.author,
+            "body": self.body,
+            "score": self.score,
+        }
+
+
+@dataclass(slots=True)
+class PostRecord:
+    submission_id: str
+    subreddit: str
+    title: str
+    body: str
+    upvote_ratio: float = 0.0
+    score: int = 0
+    number_of_comments: int = 0
+    post_url: str = ""
+    post_number: int | None = None  # Post.id once stored
+    comments: List[CommentRecord] = field(default_factory=list)
+
+    def to_row(self) -> Dict[str, Any]:
+        return {
+            "submission_id": self.submission_id,
+            "subreddit": self.subreddit,
+            "title": self.title,
+            "body": self.body,
+            "upvote_ratio": self.upvote_ratio,
+            "score": self.score,
+            "number_of_comments": self.number_of_comments,
+            "post_url": self.post_url,
+        }
+
+
+class CommentScore(NamedTuple):
+    post_key: str
+    compound: float
+    label: str